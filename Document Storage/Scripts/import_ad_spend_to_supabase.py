@@ -21,18 +21,21 @@ from pathlib import Path
 from typing import List, Dict, Any, Tuple
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('ad_spend_import.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
 
+def setup_logging():
+    """Log to the console and ad_spend_import.log (set up by main, not on import)"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('ad_spend_import.log'),
+            logging.StreamHandler()
+        ]
+    )
+
+
 class AdSpendImporter:
     """Handle importing ad spend data from Excel to Supabase"""
 
@@ -407,6 +410,7 @@ def main():
     """Main entry point"""
     import argparse
 
+    setup_logging()
     parser = argparse.ArgumentParser(
         description='Import Google & Bing Ads Product Spend data to Supabase'
     )
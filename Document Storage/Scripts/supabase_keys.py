@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Fetch every distinct value of a key column from a Supabase table, fast.
+
+The sync scripts need the keys already in the database (invoice numbers,
+Asana task IDs) to find the new rows of a CSV. Paging with
+.range(offset, ...) makes the database skip `offset` rows for every page,
+so each page is slower than the last, and one page at a time leaves the
+connection idle while the database works.
+
+fetch_existing_keys() uses keyset pagination instead: every page asks for
+the next `page_size` keys greater than the last one seen
+(`WHERE key > last ORDER BY key LIMIT n`), which the index on the key column
+answers directly however deep into the table the page is. Repeated keys
+(one invoice, many lines) are collected into a set, so the result is
+exactly the distinct keys.
+
+The key column MUST be indexed. Without an index every page and every
+slice boundary lookup scans and sorts the whole table, which is slower
+than the offset paging this replaces. all_quotes.task_id is UNIQUE;
+all_time_sales.invoice_number has idx_all_time_sales_invoice_number
+(Reporting/All Time Sales Files/add_invoice_number_index.sql adds it to
+an existing database).
+
+To run pages concurrently, the key range is first split into slices at
+evenly spaced keys (one single-row lookup per boundary), then every slice
+is paged through on its own, with at most `max_workers` requests in flight.
+
+Any request that still fails after its retries raises KeyFetchError. It
+never returns a partial or empty set, which would make every CSV row look
+new and upload the whole file again.
+"""
+
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PAGE_SIZE = 1000
+MAX_WORKERS = 8
+SLICES_PER_WORKER = 4
+RETRIES = 3
+RETRY_DELAY = 1.0
+
+
+class KeyFetchError(RuntimeError):
+    """Existing keys could not be read completely"""
+
+
+def with_retries(request, description, retries=RETRIES):
+    """Run request(); retry with a growing pause, then raise KeyFetchError"""
+    for attempt in range(retries + 1):
+        try:
+            return request()
+        except Exception as e:
+            if attempt == retries:
+                raise KeyFetchError(f"{description} failed after {retries + 1} attempts: {e}") from e
+            time.sleep(RETRY_DELAY * 2 ** attempt)
+
+
+def key_query(client, table, column):
+    """Rows with a non-null key, in key order"""
+    return client.table(table).select(column).not_.is_(column, 'null').order(column)
+
+
+def count_keyed_rows(client, table, column):
+    """Number of rows with a non-null key"""
+    response = with_retries(
+        lambda: client.table(table).select(column, count='exact').not_.is_(column, 'null').limit(1).execute(),
+        f"Counting {table}.{column}")
+    return response.count or 0
+
+
+def slice_boundaries(client, table, column, total, slices, pool):
+    """Keys at evenly spaced row positions, splitting the table into slices"""
+    positions = [total * i // slices for i in range(1, slices)]
+
+    def key_at(position):
+        response = with_retries(
+            lambda: key_query(client, table, column).range(position, position).execute(),
+            f"Reading {table}.{column} at row {position}")
+        return response.data[0][column] if response.data else None
+
+    boundaries = [key for key in pool.map(key_at, positions) if key is not None]
+    # Repeated keys (one invoice, many lines) would give empty slices
+    return sorted(set(boundaries))
+
+
+def page_query(client, table, column, low, high, last, page_size):
+    """One keyset page: the next page_size keys after `last` (or from `low`), below `high`"""
+    query = key_query(client, table, column)
+    if last is not None:
+        query = query.gt(column, last)
+    elif low is not None:
+        query = query.gte(column, low)
+    if high is not None:
+        query = query.lt(column, high)
+    return query.limit(page_size)
+
+
+def fetch_slice(client, table, column, low, high, page_size):
+    """
+    Keyset-paginate the keys in [low, high) (None = unbounded).
+
+    Returns:
+        (set of keys, number of requests)
+    """
+    keys = set()
+    last = None
+    requests = 0
+    while True:
+        # Query builders change as they are used, so every attempt builds its own
+        response = with_retries(
+            lambda: page_query(client, table, column, low, high, last, page_size).execute(),
+            f"Reading {table}.{column} after {last if last is not None else low}")
+        requests += 1
+        page = [row[column] for row in response.data]
+        # Stop on an empty page, not a short one: the server may cap page size
+        if not page:
+            return keys, requests
+        keys.update(page)
+        last = page[-1]
+
+
+def fetch_existing_keys(client, table, column, page_size=PAGE_SIZE, max_workers=MAX_WORKERS):
+    """
+    Every distinct non-null value of table.column.
+
+    Args:
+        client: Supabase client
+        table / column: Key column to read; it must be indexed
+        page_size: Keys per request
+        max_workers: Most requests in flight at once
+
+    Returns:
+        Set of keys
+
+    Raises:
+        KeyFetchError: a request kept failing; no partial result is returned
+    """
+    start = time.perf_counter()
+    total = count_keyed_rows(client, table, column)
+    if total == 0:
+        print(f"  {table} has no {column} values yet")
+        return set()
+
+    slices = max(1, min(max_workers * SLICES_PER_WORKER, math.ceil(total / page_size)))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        boundaries = slice_boundaries(client, table, column, total, slices, pool) if slices > 1 else []
+        edges = [None] + boundaries + [None]
+        results = list(pool.map(lambda i: fetch_slice(client, table, column, edges[i], edges[i + 1], page_size),
+                                range(len(edges) - 1)))
+
+    keys = set().union(*(slice_keys for slice_keys, _ in results))
+    requests = sum(slice_requests for _, slice_requests in results) + len(boundaries) + 1
+    print(f"  Read {len(keys):,} distinct keys from {total:,} rows in {time.perf_counter() - start:.1f}s "
+          f"({requests} requests, {len(edges) - 1} slices, up to {max_workers} at a time)")
+    return keys
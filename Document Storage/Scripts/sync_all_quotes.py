@@ -8,61 +8,67 @@ Uses task_id as unique identifier to prevent duplicates
 import os
 import sys
 import pandas as pd
-from supabase import create_client, Client
-from dotenv import load_dotenv
 import time
 from datetime import datetime
-import math
+from pathlib import Path
+
+from supabase_keys import fetch_existing_keys, KeyFetchError
+
+# Shared parsing helpers (s4 package) live at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from s4.parsing import parse_money, parse_integer, to_json_records
 
 # Load environment variables from parent directory
 parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 env_path = os.path.join(parent_dir, '.env')
-load_dotenv(env_path)
-
-SUPABASE_URL = os.getenv('SUPABASE_URL')
-SUPABASE_KEY = os.getenv('SUPABASE_KEY')
-
-if not SUPABASE_URL or not SUPABASE_KEY:
-    print("ERROR: SUPABASE_URL and SUPABASE_KEY not found in .env")
-    print(f"Tried loading from: {env_path}")
-    sys.exit(1)
 
-# Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+_supabase = None
 
-def get_existing_task_ids():
-    """Fetch all existing task IDs from Supabase"""
-    print("\nFetching existing task IDs from Supabase...")
+def get_supabase():
+    """
+    Supabase client, created on first use. supabase and python-dotenv are
+    imported here, so loading this module stays cheap.
+    """
+    global _supabase
+    if _supabase is not None:
+        return _supabase
 
-    all_tasks = set()
-    page_size = 1000
-    offset = 0
-
-    while True:
-        try:
-            response = supabase.table('all_quotes')\
-                .select('task_id')\
-                .range(offset, offset + page_size - 1)\
-                .execute()
+    try:
+        from dotenv import load_dotenv
+        from supabase import create_client
+    except ImportError as e:
+        print(f"ERROR: {e.name} is not installed. Install with: pip install supabase python-dotenv")
+        sys.exit(1)
 
-            if not response.data:
-                break
+    load_dotenv(env_path)
+    supabase_url = os.getenv('SUPABASE_URL')
+    supabase_key = os.getenv('SUPABASE_KEY')
 
-            for record in response.data:
-                if record.get('task_id'):
-                    all_tasks.add(str(record['task_id']))
+    if not supabase_url or not supabase_key:
+        print("ERROR: SUPABASE_URL and SUPABASE_KEY not found in .env")
+        print(f"Tried loading from: {env_path}")
+        sys.exit(1)
 
-            print(f"  Loaded {len(all_tasks)} unique task IDs so far...")
+    _supabase = create_client(supabase_url, supabase_key)
+    return _supabase
 
-            if len(response.data) < page_size:
-                break
+def get_existing_task_ids():
+    """
+    Fetch all existing task IDs from Supabase.
 
-            offset += page_size
+    Exits instead of returning an empty set when they cannot all be read:
+    every CSV row would then look new and be uploaded again.
+    """
+    print("\nFetching existing task IDs from Supabase...")
 
-        except Exception as e:
-            print(f"ERROR fetching existing data: {str(e)}")
-            return set()
+    try:
+        keys = fetch_existing_keys(get_supabase(), 'all_quotes', 'task_id')
+    except KeyFetchError as e:
+        print(f"ERROR fetching existing data: {e}")
+        print("Nothing was uploaded")
+        sys.exit(1)
 
+    all_tasks = {str(key) for key in keys}
     print(f"Found {len(all_tasks)} unique task IDs in database")
     return all_tasks
 
@@ -80,37 +86,6 @@ def clean_date(value):
     except:
         return None
 
-def clean_numeric(value):
-    """Clean numeric values (currency and numbers)"""
-    if pd.isna(value) or value is None:
-        return None
-
-    if isinstance(value, str):
-        # Remove $, commas, quotes, and whitespace
-        value = value.replace('$', '').replace(',', '').replace('"', '').strip()
-        if value == '' or value == '#N/A' or value.lower() == 'nan':
-            return None
-
-    try:
-        result = float(value)
-        # Check for NaN or infinity
-        if math.isnan(result) or math.isinf(result):
-            return None
-        return result
-    except:
-        return None
-
-def clean_integer(value):
-    """Clean integer values"""
-    if pd.isna(value) or value is None:
-        return None
-
-    try:
-        result = int(float(value))
-        return result
-    except:
-        return None
-
 def prepare_data(df):
     """Prepare dataframe for database insertion"""
     # Column mapping from CSV to database schema
@@ -173,13 +148,13 @@ def prepare_data(df):
         if col in df.columns:
             df[col] = df[col].apply(lambda x: clean_date(x).split('T')[0] if clean_date(x) else None)
 
-    # Clean numeric column
+    # Clean numeric column ("$1,234.00"; blanks and "#N/A" -> None)
     if 'amount' in df.columns:
-        df['amount'] = df['amount'].apply(clean_numeric)
+        df['amount'] = parse_money(df['amount'], missing=None)
 
     # Clean integer column
     if 'created_at_year' in df.columns:
-        df['created_at_year'] = df['created_at_year'].apply(clean_integer)
+        df['created_at_year'] = parse_integer(df['created_at_year'], missing=None)
 
     # Convert task_id to string and ensure it's not null
     if 'task_id' in df.columns:
@@ -208,24 +183,12 @@ def upload_to_supabase(df, batch_size=500):
         batch_num = (i // batch_size) + 1
         total_batches = (total_records + batch_size - 1) // batch_size
 
-        # Convert batch to list of dictionaries and clean NaN values
-        records = batch.to_dict('records')
-
-        # Clean NaN/infinity values from each record
-        cleaned_records = []
-        for record in records:
-            cleaned_record = {}
-            for key, value in record.items():
-                # Check for NaN or infinity
-                if isinstance(value, float) and (math.isnan(value) or math.isinf(value)):
-                    cleaned_record[key] = None
-                else:
-                    cleaned_record[key] = value
-            cleaned_records.append(cleaned_record)
+        # Records with NaN/infinity values as None
+        cleaned_records = to_json_records(batch)
 
         try:
             # Insert batch
-            response = supabase.table('all_quotes').insert(cleaned_records).execute()
+            response = get_supabase().table('all_quotes').insert(cleaned_records).execute()
             successful += len(cleaned_records)
             print(f"[{batch_num}/{total_batches}] Uploaded {len(cleaned_records)} records (Total: {successful}/{total_records})")
 
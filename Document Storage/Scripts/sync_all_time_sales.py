@@ -2,65 +2,84 @@
 """
 Sync All Time Sales Data to Supabase
 Compares CSV file with existing Supabase data and uploads only missing records
+
+Usage:
+    python sync_all_time_sales.py                  Download the existing invoice
+                                                   numbers, upload the new rows
+    python sync_all_time_sales.py --server-side    Copy the whole CSV into a
+                                                   temporary table and let the
+                                                   database insert the new rows
+
+--server-side talks to Postgres directly (DATABASE_URL in .env, psycopg2).
+Nothing is downloaded but the counts, so it stays quick however many
+invoices the table already holds.
 """
 
+import io
 import os
 import sys
 import pandas as pd
-from supabase import create_client, Client
-from dotenv import load_dotenv
 import time
 from datetime import datetime
+from pathlib import Path
+
+from supabase_keys import fetch_existing_keys, KeyFetchError
+
+# Shared parsing helpers (s4 package) live at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from s4.parsing import parse_money, parse_number, to_json_records
 
 # Load environment variables from parent directory
 parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 env_path = os.path.join(parent_dir, '.env')
-load_dotenv(env_path)
-
-SUPABASE_URL = os.getenv('SUPABASE_URL')
-SUPABASE_KEY = os.getenv('SUPABASE_KEY')
-
-if not SUPABASE_URL or not SUPABASE_KEY:
-    print("ERROR: SUPABASE_URL and SUPABASE_KEY not found in .env")
-    print(f"Tried loading from: {env_path}")
-    sys.exit(1)
 
-# Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-
-def get_existing_invoice_numbers():
-    """Fetch all existing invoice numbers from Supabase"""
-    print("\nFetching existing invoice numbers from Supabase...")
-
-    all_invoices = set()
-    page_size = 1000
-    offset = 0
-
-    while True:
-        try:
-            response = supabase.table('all_time_sales')\
-                .select('invoice_number')\
-                .range(offset, offset + page_size - 1)\
-                .execute()
+_supabase = None
+
+def get_supabase():
+    """
+    Supabase client, created on first use. supabase and python-dotenv are
+    imported here, so loading this module stays cheap.
+    """
+    global _supabase
+    if _supabase is not None:
+        return _supabase
+
+    try:
+        from dotenv import load_dotenv
+        from supabase import create_client
+    except ImportError as e:
+        print(f"ERROR: {e.name} is not installed. Install with: pip install supabase python-dotenv")
+        sys.exit(1)
 
-            if not response.data:
-                break
+    load_dotenv(env_path)
+    supabase_url = os.getenv('SUPABASE_URL')
+    supabase_key = os.getenv('SUPABASE_KEY')
 
-            for record in response.data:
-                if record.get('invoice_number'):
-                    all_invoices.add(record['invoice_number'])
+    if not supabase_url or not supabase_key:
+        print("ERROR: SUPABASE_URL and SUPABASE_KEY not found in .env")
+        print(f"Tried loading from: {env_path}")
+        sys.exit(1)
 
-            print(f"  Loaded {len(all_invoices)} unique invoices so far...")
+    _supabase = create_client(supabase_url, supabase_key)
+    return _supabase
 
-            if len(response.data) < page_size:
-                break
+def get_existing_invoice_numbers():
+    """
+    Fetch all existing invoice numbers from Supabase.
 
-            offset += page_size
+    Exits instead of returning an empty set when they cannot all be read:
+    every CSV row would then look new and be uploaded again.
+    """
+    print("\nFetching existing invoice numbers from Supabase...")
 
-        except Exception as e:
-            print(f"ERROR fetching existing data: {str(e)}")
-            return set()
+    try:
+        keys = fetch_existing_keys(get_supabase(), 'all_time_sales', 'invoice_number')
+    except KeyFetchError as e:
+        print(f"ERROR fetching existing data: {e}")
+        print("Nothing was uploaded")
+        sys.exit(1)
 
+    all_invoices = keys
     print(f"Found {len(all_invoices)} unique invoice numbers in database")
     return all_invoices
 
@@ -110,27 +129,13 @@ def prepare_data(df):
     if 'date' in df.columns:
         df['date'] = pd.to_datetime(df['date'], errors='coerce').dt.strftime('%Y-%m-%dT%H:%M:%S')
 
-    # Helper function to clean currency strings
-    def clean_currency(value):
-        if pd.isna(value) or value is None:
-            return None
-        if isinstance(value, str):
-            # Remove $, commas, quotes
-            value = value.replace('$', '').replace(',', '').replace('"', '').strip()
-            if value == '' or value == '#N/A':
-                return None
-        try:
-            return float(value)
-        except:
-            return None
-
-    # Clean currency and numeric columns
+    # Clean currency columns ("$1,234.56", "(12.00)"; blanks and "#N/A" -> None)
     currency_columns = ['sales_each', 'sales_total', 'cost_each', 'cost_total',
                        'shipping', 'discount', 'refunds', 'invoice_total', 'profit_total', 'ad_spend']
 
     for col in currency_columns:
         if col in df.columns:
-            df[col] = df[col].apply(clean_currency)
+            df[col] = parse_money(df[col], missing=None)
 
     # Clean other numeric columns
     for col in ['order_quantity', 'orders', 'route']:
@@ -139,15 +144,9 @@ def prepare_data(df):
 
     # Clean ROI (remove %) and cap at database limit
     if 'roi' in df.columns:
-        def clean_roi(x):
-            if pd.isna(x):
-                return None
-            value = clean_currency(str(x).replace('%', ''))
-            # Cap ROI to fit numeric(8,4) - max value is 9999.9999
-            if value is not None and abs(value) >= 10000:
-                return None  # Set extreme values to None
-            return value
-        df['roi'] = df['roi'].apply(clean_roi)
+        roi = parse_number(df['roi'], missing=None)
+        # Cap ROI to fit numeric(8,4) - max value is 9999.9999; extreme values -> None
+        df['roi'] = roi.where(roi.abs() < 10000)
 
     # Convert year to integer
     df['year'] = pd.to_numeric(df['year'], errors='coerce').astype('Int64')
@@ -162,10 +161,139 @@ def prepare_data(df):
 
     return df
 
+# ============================================================================
+# SERVER-SIDE SYNC
+# ============================================================================
+
+STAGING_TABLE = 'all_time_sales_staging'
+
+def get_database_connection():
+    """Direct Postgres connection (DATABASE_URL in .env); psycopg2 is imported here"""
+    try:
+        from dotenv import load_dotenv
+        import psycopg2
+    except ImportError as e:
+        print(f"ERROR: {e.name} is not installed. Install with: pip install psycopg2-binary python-dotenv")
+        sys.exit(1)
+
+    load_dotenv(env_path)
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        print("ERROR: DATABASE_URL not found in .env (needed for --server-side)")
+        print(f"Tried loading from: {env_path}")
+        sys.exit(1)
+
+    return psycopg2.connect(database_url)
+
+def staging_csv(df):
+    """
+    Prepared rows as CSV text for COPY. Missing values are written as \\N,
+    so they load as NULL while empty strings stay empty strings.
+    """
+    df = df.copy()
+    # Whole numbers read as floats ("3.0") would not load into integer columns
+    for col in ['order_quantity', 'orders', 'route']:
+        if col in df.columns:
+            values = pd.to_numeric(df[col], errors='coerce')
+            if (values.dropna() % 1 == 0).all():
+                df[col] = values.astype('Int64')
+    return df.to_csv(index=False, header=False, na_rep='\\N')
+
+def sync_server_side(df):
+    """
+    Insert the CSV rows whose invoice number is not in all_time_sales yet,
+    letting the database do the comparison.
+
+    The prepared rows are copied into a temporary staging table (dropped at
+    commit), then one INSERT ... SELECT ... WHERE NOT EXISTS adds the rows of
+    invoices the table does not have. invoice_number is not unique (one row
+    per invoice line), so this is an anti-join rather than ON CONFLICT. The
+    table is locked against other writers for the transaction, so two syncs
+    running at once cannot both insert the same invoice.
+
+    Returns:
+        (rows inserted, new invoices)
+    """
+    columns = list(df.columns)
+    column_list = ', '.join(columns)
+    csv_text = staging_csv(df)
+
+    conn = get_database_connection()
+    try:
+        with conn.cursor() as cursor:
+            # Same column types as the target table, no rows, no defaults
+            cursor.execute(f"""
+                CREATE TEMP TABLE {STAGING_TABLE} ON COMMIT DROP AS
+                SELECT {column_list} FROM all_time_sales WITH NO DATA
+            """)
+
+            print(f"\nCopying {len(df)} rows into {STAGING_TABLE}...")
+            start = time.perf_counter()
+            cursor.copy_expert(
+                f"COPY {STAGING_TABLE} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                io.StringIO(csv_text))
+            print(f"  Copied in {time.perf_counter() - start:.1f}s")
+
+            print("Inserting rows for invoices not in the database yet...")
+            start = time.perf_counter()
+            cursor.execute("LOCK TABLE all_time_sales IN SHARE ROW EXCLUSIVE MODE")
+            cursor.execute(f"""
+                WITH inserted AS (
+                    INSERT INTO all_time_sales ({column_list})
+                    SELECT {', '.join('s.' + col for col in columns)}
+                    FROM {STAGING_TABLE} s
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM all_time_sales t
+                        WHERE t.invoice_number = s.invoice_number
+                    )
+                    RETURNING invoice_number
+                )
+                SELECT count(*), count(DISTINCT invoice_number) FROM inserted
+            """)
+            inserted, new_invoices = cursor.fetchone()
+            print(f"  Inserted in {time.perf_counter() - start:.1f}s")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    return inserted, new_invoices
+
+def main_server_side(df):
+    """--server-side: prepare every CSV row, let the database pick the new ones"""
+    original_count = len(df)
+
+    print("\nPreparing data for upload...")
+    df = prepare_data(df)
+
+    try:
+        inserted, new_invoices = sync_server_side(df)
+    except Exception as e:
+        print(f"\nERROR: {e}")
+        print("Rolled back; nothing was uploaded")
+        sys.exit(1)
+
+    print("\n" + "=" * 80)
+    print("SYNC SUMMARY (server-side)")
+    print("=" * 80)
+    print(f"CSV records: {original_count}")
+    print(f"Already in database: {original_count - inserted}")
+    print(f"New records uploaded: {inserted} ({new_invoices} invoices)")
+    print(f"Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+    if inserted == 0:
+        print("\n[SUCCESS] Database is already up to date! No new records to import.")
+    else:
+        print("\n[SUCCESS] All new records uploaded successfully!")
+
+# ============================================================================
+# REST SYNC
+# ============================================================================
+
 def upload_to_supabase(df, batch_size=500):
     """Upload data to Supabase in batches"""
-    import math
-
     total_records = len(df)
     successful = 0
     failed = 0
@@ -179,24 +307,12 @@ def upload_to_supabase(df, batch_size=500):
         batch_num = (i // batch_size) + 1
         total_batches = (total_records + batch_size - 1) // batch_size
 
-        # Convert batch to list of dictionaries and clean NaN values
-        records = batch.to_dict('records')
-
-        # Clean NaN/infinity values from each record
-        cleaned_records = []
-        for record in records:
-            cleaned_record = {}
-            for key, value in record.items():
-                # Check for NaN or infinity
-                if isinstance(value, float) and (math.isnan(value) or math.isinf(value)):
-                    cleaned_record[key] = None
-                else:
-                    cleaned_record[key] = value
-            cleaned_records.append(cleaned_record)
+        # Records with NaN/infinity values as None
+        cleaned_records = to_json_records(batch)
 
         try:
             # Insert batch
-            response = supabase.table('all_time_sales').insert(cleaned_records).execute()
+            response = get_supabase().table('all_time_sales').insert(cleaned_records).execute()
             successful += len(cleaned_records)
             print(f"[{batch_num}/{total_batches}] Uploaded {len(cleaned_records)} records (Total: {successful}/{total_records})")
 
@@ -226,6 +342,10 @@ def main():
     df = pd.read_csv(csv_file)
     print(f"Loaded {len(df)} records from CSV")
 
+    if '--server-side' in sys.argv[1:]:
+        main_server_side(df)
+        return
+
     # Get existing invoice numbers from Supabase
     existing_invoices = get_existing_invoice_numbers()
 
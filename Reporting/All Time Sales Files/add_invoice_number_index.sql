@@ -0,0 +1,8 @@
+-- This script should be run in Supabase SQL Editor on databases created before
+-- idx_all_time_sales_invoice_number was added to all_time_sales_schema.sql
+
+-- sync_all_time_sales.py reads the existing invoice numbers in key order
+-- (WHERE invoice_number > last ORDER BY invoice_number LIMIT n), and
+-- --server-side matches new rows with NOT EXISTS on invoice_number.
+-- Without this index every page is a full scan and sort of the table.
+CREATE INDEX IF NOT EXISTS idx_all_time_sales_invoice_number ON all_time_sales(invoice_number);
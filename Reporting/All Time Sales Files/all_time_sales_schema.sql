@@ -70,6 +70,8 @@ CREATE INDEX IF NOT EXISTS idx_all_time_sales_vendor ON all_time_sales(vendor);
 CREATE INDEX IF NOT EXISTS idx_all_time_sales_category ON all_time_sales(product_category);
 CREATE INDEX IF NOT EXISTS idx_all_time_sales_rep ON all_time_sales(rep);
 CREATE INDEX IF NOT EXISTS idx_all_time_sales_customer ON all_time_sales(customer);
+-- Sync scripts page through invoice numbers in order and match new rows on them
+CREATE INDEX IF NOT EXISTS idx_all_time_sales_invoice_number ON all_time_sales(invoice_number);
 CREATE INDEX IF NOT EXISTS idx_all_time_sales_month_vendor ON all_time_sales(month, vendor);
 CREATE INDEX IF NOT EXISTS idx_all_time_sales_month_category ON all_time_sales(month, product_category);
 
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Backfill: re-run the monthly pipeline for a range of months at once.
+
+Use it after a change that affects history, e.g. new MASTER SKU categories
+or keyword rules: every month from 2022-11 on (see validation_queries.sql)
+is re-processed with the current lookups.
+
+1. The export folders are searched (recursively) for Google and Bing
+   exports. Each export's month and platform come from its report header
+   (ad_exports.probe_export), so file names do not matter. When a month has
+   several exports for one platform, the most recently modified one is used.
+2. The SKU lookup files (ID to SKU, MASTER SKU and the SKU index) are loaded
+   once and handed to every worker process.
+3. Months run concurrently in a process pool. Each worker runs the same
+   stages as master_workflow.py for its month: upload (CSVs and history
+   store), metrics, Excel report and PDF report. Its output is written to
+   "{month} Backfill Log.txt" in the month's output folder.
+
+A month that fails, or has no export for one of the platforms, is reported
+and the other months carry on.
+
+Usage:
+    python backfill.py START_MONTH [END_MONTH] [options]
+
+    python backfill.py 2022-11 2025-10
+    python backfill.py 2024-01 2024-12 --input-dir "../Old Exports" --workers 4
+    python backfill.py 2025-10 --upload-only
+
+Options:
+    --input-dir DIR   Folder to search for exports (repeatable; default: the
+                      config's input_dir)
+    --workers N       Worker processes (default: one per CPU, at most one per month)
+    --upload-only     Only write the upload CSVs and the history store, no reports
+"""
+
+import contextlib
+import copy
+import io
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from workflow_config import load_config, get_output_dir, get_history_dir
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+# Export format detection lives in Skills & Automations
+sys.path.insert(0, str(SCRIPT_DIR.parents[2] / 'Skills & Automations'))
+from ad_exports import probe_export
+
+EXPORT_EXTENSIONS = ('.csv', '.tsv', '.xlsx', '.xlsm', '.xls')
+PLATFORM_KEYS = {'Google Ads': 'google', 'Bing Ads': 'bing'}
+
+
+# ============================================================================
+# MONTHS AND INPUT DISCOVERY
+# ============================================================================
+
+def month_range(start, end):
+    """Every YYYY-MM month from start to end, inclusive"""
+    year, month = (int(part) for part in start.split('-'))
+    end_year, end_month = (int(part) for part in end.split('-'))
+    months = []
+    while (year, month) <= (end_year, end_month):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def find_export_files(input_dirs, skip_dirs=()):
+    """CSV/Excel files under the input folders (hidden folders and skip_dirs left out)"""
+    skip = {os.path.abspath(path) for path in skip_dirs}
+    found = []
+    for input_dir in input_dirs:
+        for root, dirs, files in os.walk(input_dir):
+            dirs[:] = sorted(d for d in dirs
+                             if not d.startswith('.') and os.path.abspath(os.path.join(root, d)) not in skip)
+            found.extend(os.path.join(root, name) for name in sorted(files)
+                         if name.lower().endswith(EXPORT_EXTENSIONS))
+    return found
+
+
+def safe_probe(path):
+    """probe_export(), or None for files that are not readable exports"""
+    try:
+        return probe_export(path)
+    except Exception:
+        return None
+
+
+def discover_inputs(probes, months):
+    """
+    Pick each month's Google and Bing export from the probed files.
+
+    Returns:
+        (inputs, ignored): inputs maps month -> {'google': path, 'bing': path}
+        (a platform is missing when no export was found), ignored lists the
+        older duplicate exports that were passed over
+    """
+    wanted = set(months)
+    candidates = {}
+    for probe in probes:
+        if probe and probe['month'] in wanted and probe['platform'] in PLATFORM_KEYS:
+            key = (probe['month'], PLATFORM_KEYS[probe['platform']])
+            candidates.setdefault(key, []).append(probe['path'])
+
+    inputs = {month: {} for month in months}
+    ignored = []
+    for (month, platform), paths in candidates.items():
+        newest_first = sorted(paths, key=os.path.getmtime, reverse=True)
+        inputs[month][platform] = newest_first[0]
+        ignored.extend(newest_first[1:])
+    return inputs, ignored
+
+
+def month_config(config, month, files):
+    """Copy of config set up for one month, with absolute export paths"""
+    month_cfg = copy.deepcopy(config)
+    month_cfg['month'] = month
+    month_cfg['input_files'] = {platform: os.path.abspath(path) for platform, path in files.items()}
+    return month_cfg
+
+
+# ============================================================================
+# WORKER
+# ============================================================================
+# Each worker process receives the SKU lookup data once, when it starts, and
+# then runs any number of months with it.
+
+_reference = None
+
+
+def init_worker(reference):
+    global _reference
+    _reference = reference
+
+
+def run_month(config, upload_only):
+    """
+    Upload, metrics, Excel and PDF for one month (output goes to its log file).
+
+    Returns:
+        Dict with month, status ('ok' or the error), products, spend,
+        missing_categories, seconds and log path
+    """
+    import process_upload
+
+    start = time.perf_counter()
+    month = config['month']
+    output_dir = get_output_dir(config)
+    os.makedirs(output_dir, exist_ok=True)
+    log_file = os.path.join(output_dir, f"{month} Backfill Log.txt")
+    summary = {'month': month, 'log': log_file}
+
+    with open(log_file, 'w', encoding='utf-8') as log, contextlib.redirect_stdout(log):
+        try:
+            result = process_upload.run(config, _reference)
+            summary['products'] = len(result['combined'])
+            summary['missing_categories'] = len(result['missing_categories'])
+
+            if not upload_only:
+                from report_metrics import compute_report_metrics
+                from create_excel_report import create_excel_report
+                from create_pdf_report import create_pdf_report
+
+                # Reports read the upload sheet as exported, like master_workflow.py
+                upload, missing_cats = process_upload.read_upload_files(config)
+                metrics = compute_report_metrics(upload)
+                summary['spend'] = metrics['totals']['total_spend']
+                create_excel_report(config, upload, missing_cats, metrics)
+                create_pdf_report(config, metrics)
+            summary['status'] = 'ok'
+        except Exception as e:
+            traceback.print_exc(file=log)
+            summary['status'] = f"error: {type(e).__name__}: {e}"
+
+    summary['seconds'] = time.perf_counter() - start
+    return summary
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def parse_args(args):
+    months, input_dirs, workers, upload_only = [], [], None, False
+    i = 0
+    while i < len(args):
+        if args[i] == '--input-dir':
+            input_dirs.append(args[i + 1])
+            i += 1
+        elif args[i] == '--workers':
+            workers = int(args[i + 1])
+            i += 1
+        elif args[i] == '--upload-only':
+            upload_only = True
+        elif args[i] in ('-h', '--help'):
+            print(__doc__)
+            sys.exit(0)
+        else:
+            months.append(args[i])
+        i += 1
+
+    if len(months) not in (1, 2):
+        print(__doc__)
+        sys.exit(1)
+    return months[0], months[-1], input_dirs, workers, upload_only
+
+
+def print_month(summary):
+    if summary['status'] != 'ok':
+        print(f"  {summary['month']}  FAILED after {summary['seconds']:.1f}s: {summary['status']}")
+        print(f"           see {summary['log']}")
+        return
+    spend = f"${summary['spend']:>12,.2f}" if 'spend' in summary else ' ' * 13
+    print(f"  {summary['month']}  {summary['seconds']:>6.1f}s  {summary['products']:>8,} products  "
+          f"{spend}  {summary['missing_categories']:>5,} missing categories")
+
+
+def main():
+    start_month, end_month, input_dirs, workers, upload_only = parse_args(sys.argv[1:])
+    config = load_config()
+    months = month_range(start_month, end_month)
+    if not months:
+        print(f"ERROR: {start_month} is after {end_month}")
+        sys.exit(1)
+
+    input_dirs = input_dirs or [config['paths']['input_dir']]
+    workers = workers or min(len(months), os.cpu_count() or 1)
+    context = multiprocessing.get_context('spawn')
+    started = time.perf_counter()
+
+    print("=" * 100)
+    print(f"BACKFILL {months[0]} TO {months[-1]} ({len(months)} months, {workers} worker processes"
+          + (", upload only)" if upload_only else ")"))
+    print("=" * 100)
+
+    print(f"\n1. FINDING EXPORTS in {', '.join(input_dirs)}")
+    paths = find_export_files(input_dirs, skip_dirs=[get_history_dir(config)])
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        probes = list(pool.map(safe_probe, paths, chunksize=8))
+    inputs, ignored = discover_inputs(probes, months)
+
+    runnable = [month for month in months if len(inputs[month]) == len(PLATFORM_KEYS)]
+    print(f"   Probed {len(paths)} files: {len(runnable)} of {len(months)} months have both exports")
+    for path in ignored:
+        print(f"   Older duplicate export ignored: {path}")
+    for month in months:
+        missing = [platform for platform in PLATFORM_KEYS.values() if platform not in inputs[month]]
+        if missing:
+            print(f"   {month}: no {' or '.join(missing)} export found, skipped")
+    if not runnable:
+        sys.exit(1)
+
+    print("\n2. LOADING SKU LOOKUPS (once for all months)")
+    import process_upload
+    with contextlib.redirect_stdout(io.StringIO()):
+        reference = process_upload.load_reference(config)
+    print(f"   {len(reference['master_sku']):,} SKU records, {len(reference['id_to_sku']):,} ID-to-SKU mappings")
+
+    print(f"\n3. PROCESSING {len(runnable)} MONTHS")
+    results = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(runnable)), mp_context=context,
+                             initializer=init_worker, initargs=(reference,)) as pool:
+        futures = [pool.submit(run_month, month_config(config, month, inputs[month]), upload_only)
+                   for month in runnable]
+        for future in as_completed(futures):
+            summary = future.result()
+            print_month(summary)
+            results.append(summary)
+
+    failed = sorted(summary['month'] for summary in results if summary['status'] != 'ok')
+    skipped = [month for month in months if month not in runnable]
+    print("\n" + "=" * 100)
+    print(f"BACKFILL COMPLETE in {time.perf_counter() - started:.1f}s: "
+          f"{len(results) - len(failed)} months processed, {len(failed)} failed, {len(skipped)} skipped")
+    if failed:
+        print(f"Failed: {', '.join(failed)}")
+    if skipped:
+        print(f"Skipped (missing exports): {', '.join(skipped)}")
+    print("=" * 100)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark the PDF report: vector charts against the matplotlib PNG charts.
+
+Builds {month} Ad Spend Performance Report.pdf from this month's upload sheet
+(config.json) into a temporary folder, once per chart mode:
+
+- png, cold: every chart rendered by matplotlib (empty chart cache)
+- png, cached: the PNGs come from the chart cache
+- vector: charts drawn by reportlab as vector graphics (the default)
+
+and prints the best build time and the file size of each. The report metrics
+are computed once up front and are not part of the timings.
+
+Usage:
+    python bench_pdf_report.py [repeat]
+"""
+
+import contextlib
+import copy
+import io
+import os
+import sys
+import tempfile
+import time
+
+from workflow_config import load_config
+from process_upload import read_upload_files
+from report_metrics import compute_report_metrics
+from create_pdf_report import create_pdf_report
+
+
+def build(config, metrics):
+    """Build the PDF quietly: (seconds, bytes)"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        pdf_file = create_pdf_report(config, metrics)
+    elapsed = time.perf_counter() - start
+    return elapsed, os.path.getsize(pdf_file)
+
+
+def bench_mode(config, metrics, work_dir, charts, chart_cache, repeat):
+    """Best of `repeat` builds: (seconds, bytes)"""
+    mode_config = copy.deepcopy(config)
+    mode_config['pdf_charts'] = charts
+    mode_config['paths']['output_dir'] = work_dir
+
+    best, size = None, None
+    for run in range(repeat):
+        if chart_cache == 'cold':
+            # A fresh cache folder every run, so every chart is rendered
+            mode_config['paths']['chart_cache'] = os.path.join(work_dir, f"chart_cache_{run}")
+        else:
+            mode_config['paths']['chart_cache'] = os.path.join(work_dir, "chart_cache_warm")
+            if run == 0:
+                build(mode_config, metrics)  # fill the cache first
+        elapsed, size = build(mode_config, metrics)
+        best = elapsed if best is None else min(best, elapsed)
+    return best, size
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    config = load_config()
+    with contextlib.redirect_stdout(io.StringIO()):
+        upload_df, _ = read_upload_files(config)
+        metrics = compute_report_metrics(upload_df)
+
+    print(f"PDF report benchmark: {config['month']}, {len(upload_df):,} products, best of {repeat}")
+    print("=" * 80)
+    print(f"{'Charts':<32} {'Build time':>12} {'File size':>14} {'vs png, cold':>16}")
+    print("-" * 80)
+
+    cases = [
+        ('png, cold (matplotlib)', 'png', 'cold'),
+        ('png, cached', 'png', 'warm'),
+        ('vector (reportlab)', 'vector', 'cold'),
+    ]
+    with tempfile.TemporaryDirectory() as work_dir:
+        baseline = None
+        for label, charts, chart_cache in cases:
+            seconds, size = bench_mode(config, metrics, work_dir, charts, chart_cache, repeat)
+            baseline = baseline or (seconds, size)
+            print(f"{label:<32} {seconds:>11.3f}s {size / 1024:>11.1f} KB "
+                  f"{baseline[0] / seconds:>6.1f}x, {size / baseline[1]:>5.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Scale benchmark: the monthly pipeline on 1x, 10x and 100x synthetic months.
+
+For every scale a synthetic month is generated (synthetic_data.py, kept in
+.scale_bench/data/<scale>x and reused) and the stages are run one after the
+other, each in a fresh process:
+
+- upload:     process_upload.run (load exports, SKU lookups, CSVs, history)
+- categorize: categorize_blanks_for_review on the Missing Categories rows
+- metrics:    report_metrics.compute_report_metrics
+- excel:      create_excel_report (the 4-sheet workbook)
+- pdf:        create_pdf_report
+
+Each stage reads what the upload stage wrote, like the standalone scripts
+do. Time covers only the stage itself (imports and reading its inputs are
+done first). Memory is the process's peak RSS, and "added" is how far the
+stage pushed it above where it stood before the stage ran. A stage that
+takes longer than --timeout is stopped and reported as such; when the
+upload stage does not finish, the other stages are skipped.
+
+Results are appended to .scale_bench/results.csv (one row per scale and
+stage, with the date and git commit), and each run is printed next to the
+previous run of the same scale and stage.
+
+Usage:
+    python bench_scale.py [scales...] [--timeout SECONDS] [--regenerate]
+
+    python bench_scale.py                 # 1x, 10x and 100x
+    python bench_scale.py 1 10 --timeout 120
+"""
+
+import contextlib
+import csv
+import io
+import json
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+
+from synthetic_data import generate_dataset
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+BENCH_DIR = SCRIPT_DIR / '.scale_bench'
+RESULTS_FILE = BENCH_DIR / 'results.csv'
+RESULT_COLUMNS = ['run', 'commit', 'scale', 'stage', 'status', 'rows', 'seconds', 'peak_mb', 'added_mb']
+
+DEFAULT_SCALES = [1, 10, 100]
+DEFAULT_TIMEOUT = 1800
+SEED = 0
+
+
+# ============================================================================
+# STAGES (run inside the child process)
+# ============================================================================
+
+def prepare_upload(config):
+    from process_upload import run
+    return lambda: len(run(config)['combined'])
+
+
+def prepare_categorize(config):
+    sys.path.insert(0, str(SCRIPT_DIR.parents[2] / 'Skills & Automations'))
+    from categorize_vendors_final import categorize_blanks_for_review
+    from process_upload import read_upload_files
+    from s4.master_sku import read_master
+
+    _, missing_cats = read_upload_files(config)
+    master = read_master(config['paths']['sku_documents'])
+    return lambda: len(categorize_blanks_for_review(missing_cats, master_sku_df=master))
+
+
+def prepare_metrics(config):
+    from process_upload import read_upload_files
+    from report_metrics import compute_report_metrics
+
+    upload_df, _ = read_upload_files(config)
+    return lambda: compute_report_metrics(upload_df)['totals']['total_products']
+
+
+def prepare_excel(config):
+    from process_upload import read_upload_files
+    from report_metrics import compute_report_metrics
+    from create_excel_report import create_excel_report
+
+    upload_df, missing_cats = read_upload_files(config)
+    metrics = compute_report_metrics(upload_df)
+    return lambda: create_excel_report(config, upload_df, missing_cats, metrics) and len(upload_df)
+
+
+def prepare_pdf(config):
+    from process_upload import read_upload_files
+    from report_metrics import compute_report_metrics
+    from create_pdf_report import create_pdf_report
+
+    upload_df, _ = read_upload_files(config)
+    metrics = compute_report_metrics(upload_df)
+    return lambda: create_pdf_report(config, metrics) and len(upload_df)
+
+
+STAGES = {
+    'upload': prepare_upload,
+    'categorize': prepare_categorize,
+    'metrics': prepare_metrics,
+    'excel': prepare_excel,
+    'pdf': prepare_pdf,
+}
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB (None if it cannot be read)"""
+    try:
+        import resource
+    except ImportError:
+        # Windows: psutil reports the peak working set
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return psutil.Process().memory_info().peak_wset / 2**20
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, kilobytes on Linux
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 1024
+
+
+def stage_worker(stage, config, connection):
+    """Child process: prepare, then time one stage and send back its numbers"""
+    os.chdir(SCRIPT_DIR)
+    sys.path.insert(0, str(SCRIPT_DIR))
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            run = STAGES[stage](config)
+            before = peak_rss_mb()
+            start = time.perf_counter()
+            rows = run()
+            seconds = time.perf_counter() - start
+        peak = peak_rss_mb()
+        connection.send({
+            'status': 'ok',
+            'rows': rows,
+            'seconds': seconds,
+            'peak_mb': peak,
+            'added_mb': peak - before if peak is not None else None,
+        })
+    except Exception as e:
+        traceback.print_exc()
+        connection.send({'status': f"error: {type(e).__name__}: {e}"})
+    finally:
+        connection.close()
+
+
+# ============================================================================
+# HARNESS
+# ============================================================================
+
+def run_stage(stage, config, timeout):
+    """Run one stage in a fresh process; returns its result dict"""
+    context = multiprocessing.get_context('spawn')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=stage_worker, args=(stage, config, sender))
+    process.start()
+    sender.close()
+
+    try:
+        if receiver.poll(timeout):
+            result = receiver.recv()
+        else:
+            result = {'status': f"timeout after {timeout}s"}
+    except EOFError:
+        # The child died without reporting (e.g. killed for running out of memory)
+        result = {'status': 'crashed'}
+    finally:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+    return result
+
+
+def dataset(scale, regenerate):
+    """Config of the synthetic month for `scale`, generating it when needed"""
+    data_dir = BENCH_DIR / 'data' / f"{scale:g}x"
+    config_file = data_dir / 'config.json'
+    if config_file.exists() and not regenerate:
+        with open(config_file) as f:
+            config = json.load(f)
+        if config['synthetic'].get('seed') == SEED:
+            return config, None
+
+    shutil.rmtree(data_dir, ignore_errors=True)
+    start = time.perf_counter()
+    config = generate_dataset(data_dir, scale, SEED)
+    return config, time.perf_counter() - start
+
+
+def git_commit():
+    try:
+        output = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPT_DIR,
+                                capture_output=True, text=True, timeout=10)
+        return output.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ''
+
+
+def read_results():
+    if not RESULTS_FILE.exists():
+        return []
+    with open(RESULTS_FILE, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def append_results(rows):
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    new_file = not RESULTS_FILE.exists()
+    with open(RESULTS_FILE, 'a', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_COLUMNS)
+        if new_file:
+            writer.writeheader()
+        writer.writerows(rows)
+
+
+def previous_result(history, scale, stage):
+    """Last successful earlier result for this scale and stage"""
+    for row in reversed(history):
+        if row['scale'] == f"{scale:g}" and row['stage'] == stage and row['status'] == 'ok':
+            return row
+    return None
+
+
+def format_mb(value):
+    return f"{float(value):,.0f} MB" if value not in (None, '') else "n/a"
+
+
+def print_result(stage, result, previous):
+    if result['status'] != 'ok':
+        print(f"  {stage:<11} {result['status']}")
+        return
+    line = (f"  {stage:<11} {result['seconds']:>9.2f}s {result['rows']:>10,} rows "
+            f"{format_mb(result['peak_mb']):>10} peak {format_mb(result['added_mb']):>10} added")
+    if previous:
+        change = result['seconds'] / float(previous['seconds']) - 1 if float(previous['seconds']) else 0
+        line += f"   (last {float(previous['seconds']):.2f}s on {previous['commit'] or '?'}, {change:+.0%})"
+    print(line)
+
+
+def parse_args(args):
+    scales, timeout, regenerate = [], DEFAULT_TIMEOUT, False
+    i = 0
+    while i < len(args):
+        if args[i] == '--timeout':
+            timeout = float(args[i + 1])
+            i += 1
+        elif args[i] == '--regenerate':
+            regenerate = True
+        elif args[i] in ('-h', '--help'):
+            print(__doc__)
+            sys.exit(0)
+        else:
+            scales.append(float(args[i]))
+        i += 1
+    return scales or DEFAULT_SCALES, timeout, regenerate
+
+
+def main():
+    scales, timeout, regenerate = parse_args(sys.argv[1:])
+    history = read_results()
+    run_id = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    commit = git_commit()
+
+    print(f"Scale benchmark {run_id} (commit {commit or 'unknown'}), stage timeout {timeout:g}s")
+    print("=" * 110)
+
+    for scale in scales:
+        config, generated = dataset(scale, regenerate)
+        sizes = config['synthetic']
+        print(f"\n{scale:g}x: {sizes['google_rows']:,} Google rows, {sizes['bing_rows']:,} Bing rows, "
+              f"{sizes['catalog_skus']:,} catalog SKUs"
+              + (f" (generated in {generated:.1f}s)" if generated is not None else ""))
+        print("-" * 110)
+
+        rows, upload_ok = [], True
+        for stage in STAGES:
+            if upload_ok:
+                result = run_stage(stage, config, timeout)
+            else:
+                result = {'status': "skipped (upload did not finish)"}
+            if stage == 'upload':
+                upload_ok = result['status'] == 'ok'
+            print_result(stage, result, previous_result(history, scale, stage))
+            rows.append({
+                'run': run_id,
+                'commit': commit,
+                'scale': f"{scale:g}",
+                'stage': stage,
+                'status': result['status'],
+                'rows': result.get('rows', ''),
+                'seconds': f"{result['seconds']:.3f}" if 'seconds' in result else '',
+                'peak_mb': f"{result['peak_mb']:.1f}" if result.get('peak_mb') is not None else '',
+                'added_mb': f"{result['added_mb']:.1f}" if result.get('added_mb') is not None else '',
+            })
+        append_results(rows)
+
+    print(f"\nResults appended to {RESULTS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Content-addressed build cache for the master workflow stages.
+
+Every stage declares what its outputs depend on (see STAGE_INPUTS in
+master_workflow.py):
+
+- files: input files, hashed by content (exports, ID-to-SKU, MASTER SKU)
+- config: config.json keys, e.g. 'month' or 'paths.sku_documents'
+- code: the scripts that produce the outputs, hashed by content
+- outputs: the files the stage writes
+
+plus the stages it runs after. Those are hashed into a stage key. When a
+stage finishes, its output files and return value are stored under that key;
+when the same key comes up again the stage is skipped and its outputs are
+copied back instead.
+
+An upstream stage counts by the content of the files it wrote, so when the
+upload stage re-runs (say after a MASTER SKU edit) and writes the same CSVs
+as before, the report stages behind it are still restored from the cache.
+
+Layout (default folder .build_cache, or paths.build_cache in config.json):
+
+    .build_cache/
+        objects/ab/ab12...      file contents and pickled results, by SHA-256
+        stages/upload/<key>.json
+        stages/upload/latest.json
+
+Usage:
+    python build_cache.py list
+    python build_cache.py clear
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import sys
+from datetime import datetime
+
+from workflow_config import load_config
+
+# Bump to invalidate every cached stage (e.g. when the key recipe changes)
+CACHE_FORMAT = 1
+
+
+def get_build_cache_dir(config):
+    return config['paths'].get('build_cache', '.build_cache')
+
+
+def config_value(config, dotted_key):
+    """config['paths']['sku_documents'] for 'paths.sku_documents' (None if absent)"""
+    value = config
+    for part in dotted_key.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+class BuildCache:
+    """Stage outputs stored under a hash of everything the stage depends on"""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.objects_dir = os.path.join(cache_dir, 'objects')
+        self.stages_dir = os.path.join(cache_dir, 'stages')
+        self._file_hashes = {}  # (path, size, mtime) -> sha256
+
+    # ------------------------------------------------------------------
+    # Hashing
+    # ------------------------------------------------------------------
+
+    def file_hash(self, path):
+        """SHA-256 of a file's content (None if it does not exist)"""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        if memo_key not in self._file_hashes:
+            digest = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+            self._file_hashes[memo_key] = digest.hexdigest()
+        return self._file_hashes[memo_key]
+
+    def stage_inputs(self, config, spec, upstream):
+        """
+        Everything a stage depends on, as {label: fingerprint}.
+
+        upstream maps each dependency stage to its fingerprint (see
+        output_fingerprint).
+        """
+        inputs = {'format': str(CACHE_FORMAT)}
+        for key in spec.get('config', []):
+            inputs[f"config {key}"] = json.dumps(config_value(config, key), sort_keys=True)
+        for path in spec['files'](config) if 'files' in spec else []:
+            inputs[f"file {os.path.basename(path)}"] = self.file_hash(path) or 'missing'
+        for path in spec.get('code', []):
+            inputs[f"code {os.path.basename(path)}"] = self.file_hash(path) or 'missing'
+        for name, fingerprint in upstream.items():
+            inputs[f"stage {name}"] = fingerprint
+        return inputs
+
+    @staticmethod
+    def stage_key(inputs):
+        payload = json.dumps(inputs, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def output_fingerprint(key, manifest):
+        """
+        What downstream stages see of a finished stage: the content of its
+        output files if it writes any, else its own key.
+        """
+        if manifest and manifest['outputs']:
+            payload = json.dumps(manifest['outputs'], sort_keys=True)
+            return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        return key
+
+    # ------------------------------------------------------------------
+    # Objects
+    # ------------------------------------------------------------------
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def put_object(self, data=None, source_path=None):
+        """Store bytes or a file's content; returns its SHA-256"""
+        digest = hashlib.sha256(data).hexdigest() if data is not None else self.file_hash(source_path)
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Temp name first so a crashed run never leaves a partial object
+            if data is not None:
+                with open(path + '.tmp', 'wb') as f:
+                    f.write(data)
+            else:
+                shutil.copyfile(source_path, path + '.tmp')
+            os.replace(path + '.tmp', path)
+        return digest
+
+    # ------------------------------------------------------------------
+    # Stage entries
+    # ------------------------------------------------------------------
+
+    def manifest_path(self, stage, key):
+        return os.path.join(self.stages_dir, stage, f"{key}.json")
+
+    def read_manifest(self, stage, key):
+        path = self.manifest_path(stage, key)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+        objects = list(manifest['outputs'].values()) + [manifest['result']]
+        if not all(os.path.exists(self.object_path(digest)) for digest in objects):
+            return None
+        return manifest
+
+    def write_json(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(path + '.tmp', path)
+
+    def store(self, stage, key, inputs, output_paths, result, started):
+        """
+        Remember a finished stage. Only output files written since `started`
+        (a time.time() value) are stored, so a stale file from an older run
+        is never mistaken for this run's output.
+
+        Returns:
+            The manifest written
+        """
+        outputs = {}
+        for path in output_paths:
+            if os.path.exists(path) and os.path.getmtime(path) >= started - 1:
+                outputs[os.path.basename(path)] = self.put_object(source_path=path)
+
+        manifest = {
+            'stage': stage,
+            'key': key,
+            'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'inputs': inputs,
+            'outputs': outputs,
+            'result': self.put_object(data=pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)),
+        }
+        self.write_json(self.manifest_path(stage, key), manifest)
+        self.write_json(self.manifest_path(stage, 'latest'), manifest)
+        return manifest
+
+    def restore(self, manifest, output_dir):
+        """Copy a cached stage's files back into output_dir and return its result"""
+        os.makedirs(output_dir, exist_ok=True)
+        for name, digest in manifest['outputs'].items():
+            target = os.path.join(output_dir, name)
+            shutil.copyfile(self.object_path(digest), target + '.tmp')
+            os.replace(target + '.tmp', target)
+        with open(self.object_path(manifest['result']), 'rb') as f:
+            return pickle.load(f)
+
+    def changed_inputs(self, stage, inputs):
+        """Labels of the inputs that differ from the stage's last stored run"""
+        latest = self.read_manifest(stage, 'latest')
+        if latest is None:
+            return None
+        labels = set(inputs) | set(latest['inputs'])
+        return sorted(label for label in labels if inputs.get(label) != latest['inputs'].get(label))
+
+
+def describe_miss(changed):
+    """Why a stage has to run, for the workflow log"""
+    if changed is None:
+        return "not cached yet"
+    if not changed:
+        return "cached outputs missing"
+    shown = ', '.join(changed[:4])
+    more = f" (+{len(changed) - 4} more)" if len(changed) > 4 else ""
+    return f"changed: {shown}{more}"
+
+
+def main():
+    config = load_config()
+    cache = BuildCache(get_build_cache_dir(config))
+    command = sys.argv[1] if len(sys.argv) > 1 else 'list'
+
+    if command == 'clear':
+        shutil.rmtree(cache.cache_dir, ignore_errors=True)
+        print(f"Cleared {cache.cache_dir}")
+    elif command == 'list':
+        print(f"Build cache: {cache.cache_dir}")
+        if not os.path.isdir(cache.stages_dir):
+            print("  (empty)")
+            return
+        for stage in sorted(os.listdir(cache.stages_dir)):
+            entries = [name for name in os.listdir(os.path.join(cache.stages_dir, stage))
+                       if name.endswith('.json') and name != 'latest.json']
+            latest = cache.read_manifest(stage, 'latest')
+            when = f", last stored {latest['created']}" if latest else ""
+            print(f"  {stage:<14} {len(entries)} entr{'y' if len(entries) == 1 else 'ies'}{when}")
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Bar chart rendering for the Ad Spend Performance Report PDF.
+
+Each chart is described by a plain dict (labels, values, colors, text) so it
+can be hashed and sent to worker processes. Rendered PNGs are cached on disk
+under a hash of the chart data and style, so re-running a month only redraws
+the charts whose data actually changed.
+
+matplotlib is imported only when a chart is actually drawn or hashed, so the
+PDF report (vector charts by default) does not pay for it, and worker
+processes import nothing else.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+# Anything that changes how a chart looks must be part of the cache key
+CHART_STYLE = {
+    'style': 'seaborn-v0_8-whitegrid',
+    'figsize': (6.5, 2.2),
+    'dpi': 100,
+    'edgecolor': '#000000',
+    'linewidth': 0.5,
+    'tick_fontsize': 7.5,
+    'label_fontsize': 8,
+    'title_fontsize': 9,
+    'value_fontsize': 6.5,
+    'renderer_version': 1,
+}
+
+
+def bar_chart_spec(labels, values, color, xlabel, title, value_format):
+    """
+    Describe a horizontal bar chart.
+
+    value_format is a format string applied to each bar value, e.g. '${:,.0f}'.
+    """
+    return {
+        'labels': [str(label) for label in labels],
+        'values': [float(value) for value in values],
+        'color': color,
+        'xlabel': xlabel,
+        'title': title,
+        'value_format': value_format,
+    }
+
+
+def pyplot():
+    """matplotlib.pyplot on the non-interactive Agg backend"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def chart_cache_key(spec):
+    """Hash of the chart data, the chart style and the matplotlib version"""
+    import matplotlib
+    payload = json.dumps(
+        {'spec': spec, 'style': CHART_STYLE, 'matplotlib': matplotlib.__version__},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def render_bar_chart(spec):
+    """Render one chart spec to PNG bytes"""
+    plt = pyplot()
+    with plt.style.context(CHART_STYLE['style']):
+        fig, ax = plt.subplots(figsize=CHART_STYLE['figsize'], dpi=CHART_STYLE['dpi'])
+        values = spec['values']
+        bars = ax.barh(range(len(values)), values, color=spec['color'],
+                       edgecolor=CHART_STYLE['edgecolor'], linewidth=CHART_STYLE['linewidth'])
+        ax.set_yticks(range(len(values)))
+        ax.set_yticklabels(spec['labels'], fontsize=CHART_STYLE['tick_fontsize'])
+        ax.set_xlabel(spec['xlabel'], fontsize=CHART_STYLE['label_fontsize'], fontweight='bold')
+        ax.set_title(spec['title'], fontsize=CHART_STYLE['title_fontsize'], fontweight='bold', pad=8)
+        ax.invert_yaxis()
+        ax.grid(axis='x', alpha=0.2, linestyle='--')
+        ax.set_axisbelow(True)
+        for bar in bars:
+            width = bar.get_width()
+            ax.text(width, bar.get_y() + bar.get_height()/2, spec['value_format'].format(width),
+                    ha='left', va='center', fontsize=CHART_STYLE['value_fontsize'],
+                    fontweight='bold', color='#000000')
+        plt.tight_layout()
+
+        img_buffer = BytesIO()
+        plt.savefig(img_buffer, format='png', bbox_inches='tight', dpi=CHART_STYLE['dpi'],
+                    facecolor='white', edgecolor='none')
+        plt.close(fig)
+    return img_buffer.getvalue()
+
+
+def render_charts(specs, cache_dir=None, max_workers=None):
+    """
+    Render a list of chart specs, reusing cached PNGs where possible.
+
+    Charts missing from the cache are rendered in a process pool (or in this
+    process when only one chart needs drawing). Returns a list of PNG bytes in
+    the same order as specs, plus the number of charts that were redrawn.
+    """
+    keys = [chart_cache_key(spec) for spec in specs]
+    images = [None] * len(specs)
+
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        for i, key in enumerate(keys):
+            path = os.path.join(cache_dir, f"{key}.png")
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    images[i] = f.read()
+
+    missing = [i for i, image in enumerate(images) if image is None]
+    if max_workers is None:
+        max_workers = min(len(missing), os.cpu_count() or 1)
+
+    if len(missing) > 1 and max_workers > 1:
+        # spawn: the report may be built from a worker thread of master_workflow.py
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+            rendered = list(pool.map(render_bar_chart, [specs[i] for i in missing]))
+    else:
+        rendered = [render_bar_chart(specs[i]) for i in missing]
+
+    for i, image in zip(missing, rendered):
+        images[i] = image
+        if cache_dir:
+            # Write to a temp name first so a crashed run never leaves a partial PNG
+            path = os.path.join(cache_dir, f"{keys[i]}.png")
+            with open(path + '.tmp', 'wb') as f:
+                f.write(image)
+            os.replace(path + '.tmp', path)
+
+    return images, len(missing)
@@ -1,19 +1,14 @@
 import pandas as pd
 import os
-import json
-from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 
-# Load configuration
-with open('config.json', 'r') as f:
-    config = json.load(f)
+from workflow_config import load_config, get_output_dir
+from process_upload import read_upload_files
+from workbook_assembly import write_workbook
 
-month = config['month']
-output_dir = config['paths']['output_dir'].replace("{month}", month)
-
-# Load the CSV files
-upload = pd.read_csv(os.path.join(output_dir, f"{month} Product Spend Upload.csv"))
+from s4.parsing import parse_money
 
 # Define vendor category structure
 vendor_categories = {
@@ -37,46 +32,10 @@ vendor_categories = {
     'Apollo Forklift': ['AF - Electric Pallet Jacks', 'AF - Electric Stackers', 'AF - Manual Pallet Jacks', 'AF - Manual Stackers', 'AF - Order Pickers', 'AF - Scissor Lifts'],
 }
 
-# Main vendors list
-main_vendors_list = list(vendor_categories.keys())
-
-print("Building vendor category breakdown...")
-print(f"Main vendors: {len(main_vendors_list)}")
-
-# Define caster vendors early (must match exact vendor names in data)
-caster_vendors = ['Caster Depot', 'Dh International', 'Durable Superior Casters']
-
-# Calculate spend by vendor and category
-vendor_spend = {}
-category_spend = {}  # Will store {vendor: {category: spend}}
-
-for vendor in upload['Vendor'].unique():
-    vendor_data = upload[upload['Vendor'] == vendor]
-    spend = sum([float(x.replace('$','').replace(',','')) for x in vendor_data['Ad Spend']])
-    vendor_spend[vendor] = spend
-
-    # Calculate category spend for this vendor
-    category_spend[vendor] = {}
-    for category in vendor_data['Product Category'].unique():
-        if pd.notna(category) and category != '' and str(category).upper() != 'BLANK':
-            cat_data = vendor_data[vendor_data['Product Category'] == category]
-            cat_spend = sum([float(x.replace('$','').replace(',','')) for x in cat_data['Ad Spend']])
-            category_spend[vendor][category] = cat_spend
-
-# Identify "All Other Vendors" (excluding the caster component vendors)
-main_vendor_names = set(vendor_categories.keys())
-other_vendors = [v for v in vendor_spend.keys() if v not in main_vendor_names and v not in caster_vendors]
-# Sort by spend descending
-other_vendors = sorted(other_vendors, key=lambda v: vendor_spend[v], reverse=True)
-other_vendors_spend = sum([vendor_spend[v] for v in other_vendors])
 
-print(f"Other vendors: {len(other_vendors)}")
-print(f"Other vendors spend: ${other_vendors_spend:,.2f}")
-
-# Create Excel file
-output_file = os.path.join(output_dir, f"{month} Product Spend Report.xlsx")
-wb = Workbook()
-wb.remove(wb.active)  # Remove default sheet
+# Column widths are fixed up front so every sheet can be streamed row by row
+UPLOAD_COLUMN_WIDTH = 14
+BREAKDOWN_COLUMN_WIDTHS = {'A': 35, 'B': 12, 'C': 4, 'D': 14}
 
 # Styling
 header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
@@ -87,6 +46,9 @@ category_fill = PatternFill(start_color="E7E6E6", end_color="E7E6E6", fill_type=
 category_font = Font(size=10)
 other_fill = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
 other_font = Font(bold=True, color="C65911")
+total_fill = PatternFill(start_color="000000", end_color="000000", fill_type="solid")
+total_font = Font(bold=True, color="FFFFFF", size=12)
+column_header_font = Font(bold=True, size=10)
 center_align = Alignment(horizontal="center", vertical="center")
 currency_format = '$#,##0.00'
 
@@ -98,294 +60,182 @@ thin_border = Border(
     bottom=Side(style='thin')
 )
 
-# Sheet 1: Upload Sheet
-print("Creating Sheet 1: Product Spend Upload...")
-ws1 = wb.create_sheet("Product Spend Upload")
-upload_df = pd.read_csv("2025-10 Product Spend Upload.csv")
-
-# Add headers
-for c_idx, col in enumerate(upload_df.columns, 1):
-    cell = ws1.cell(row=1, column=c_idx, value=col)
-    cell.fill = header_fill
-    cell.font = header_font
-    cell.border = thin_border
-
-# Add data rows (no alternating colors)
-for r_idx, row in enumerate(upload_df.values, 1):
-    for c_idx, value in enumerate(row, 1):
-        cell = ws1.cell(row=r_idx+1, column=c_idx, value=value)
-        cell.border = thin_border
-
-# Set column widths (narrower)
-for i in range(1, len(upload_df.columns) + 1):
-    ws1.column_dimensions[get_column_letter(i)].width = 14
-
-# Sheet 2: Missing Categories
-print("Creating Sheet 2: Missing Categories...")
-ws2 = wb.create_sheet("Missing Categories")
-missing_cats = pd.read_csv(f"{month} Missing Product Categories.csv")
-
-# Add headers
-for c_idx, col in enumerate(missing_cats.columns, 1):
-    cell = ws2.cell(row=1, column=c_idx, value=col)
-    cell.fill = header_fill
-    cell.font = header_font
-    cell.border = thin_border
-
-# Add data rows
-for r_idx, row in enumerate(missing_cats.values, 1):
-    for c_idx, value in enumerate(row, 1):
-        cell = ws2.cell(row=r_idx+1, column=c_idx, value=value)
-        cell.border = thin_border
-
-# Set narrower column widths
-for i in range(1, len(missing_cats.columns) + 1):
-    ws2.column_dimensions[get_column_letter(i)].width = 14
-
-# Sheet 3: Vendor Category Breakdown
-print("Creating Sheet 3: Vendor Breakdown...")
-ws3 = wb.create_sheet("Vendor Breakdown")
-
-# Calculate total ad spend and revenue
-total_ad_spend = sum(vendor_spend.values())
-total_revenue = 0
-for vendor_data in [upload[upload['Vendor'] == v] for v in upload['Vendor'].unique()]:
-    revenue = sum([float(x.replace('$','').replace(',','')) if x and isinstance(x, str) and x.strip() else 0
-                   for x in vendor_data['Revenue']])
-    total_revenue += revenue
-
-# Handle Casters (sum of Caster Depot, DH International, Durable Superior Casters)
-# Check what the actual vendor names are
-caster_vendors = [v for v in vendor_spend.keys() if v in ['Caster Depot', 'Durable Superior Casters'] or 'international' in v.lower()]
-casters_total = sum([vendor_spend.get(v, 0) for v in caster_vendors])
-
-row = 1
-# Add summary row
-cell = ws3.cell(row=row, column=1, value="TOTAL")
-cell.fill = PatternFill(start_color="000000", end_color="000000", fill_type="solid")
-cell.font = Font(bold=True, color="FFFFFF", size=12)
-cell.border = thin_border
-
-cell = ws3.cell(row=row, column=2, value=f"${total_ad_spend:,.2f}")
-cell.fill = PatternFill(start_color="000000", end_color="000000", fill_type="solid")
-cell.font = Font(bold=True, color="FFFFFF", size=12)
-cell.border = thin_border
-cell.number_format = currency_format
-
-cell = ws3.cell(row=row, column=3, value="")
-cell.fill = PatternFill(start_color="000000", end_color="000000", fill_type="solid")
-cell.border = thin_border
-
-cell = ws3.cell(row=row, column=4, value=f"${total_revenue:,.2f}")
-cell.fill = PatternFill(start_color="000000", end_color="000000", fill_type="solid")
-cell.font = Font(bold=True, color="FFFFFF", size=12)
-cell.border = thin_border
-cell.number_format = currency_format
-
-row = 2
-# Add header row
-cell = ws3.cell(row=row, column=1, value="")
-cell.border = thin_border
-
-cell = ws3.cell(row=row, column=2, value="Ad Spend")
-cell.font = Font(bold=True, size=10)
-cell.border = thin_border
-
-cell = ws3.cell(row=row, column=3, value="")
-cell.border = thin_border
-
-cell = ws3.cell(row=row, column=4, value="Revenue")
-cell.font = Font(bold=True, size=10)
-cell.border = thin_border
-
-row = 3  # Start vendor data after header row
-
-for vendor_name in main_vendors_list:
-    categories = vendor_categories[vendor_name]
-
-    # Calculate vendor total
-    if vendor_name == 'Casters':
-        vendor_total = casters_total
-    else:
-        vendor_total = vendor_spend.get(vendor_name, 0)
-
-    # Calculate vendor revenue
-    if vendor_name == 'Casters':
-        vendor_revenue = 0
-        for cv in caster_vendors:
-            cv_data = upload[upload['Vendor'] == cv]
-            vendor_revenue += sum([float(x.replace('$','').replace(',','')) if x and isinstance(x, str) and x.strip() else 0
-                                   for x in cv_data['Revenue']])
-    else:
-        vendor_data = upload[upload['Vendor'] == vendor_name]
-        vendor_revenue = sum([float(x.replace('$','').replace(',','')) if x and isinstance(x, str) and x.strip() else 0
-                              for x in vendor_data['Revenue']])
-
-    # Vendor header
-    cell = ws3.cell(row=row, column=1, value=f"{vendor_name}")
-    cell.fill = vendor_fill
-    cell.font = vendor_font
-    cell.border = thin_border
-
-    cell = ws3.cell(row=row, column=2, value=f"${vendor_total:,.2f}")
-    cell.fill = vendor_fill
-    cell.font = vendor_font
-    cell.border = thin_border
-    cell.number_format = currency_format
-
-    # Empty column (C)
-    cell = ws3.cell(row=row, column=3, value="")
-    cell.fill = vendor_fill
-    cell.border = thin_border
-
-    # Revenue column
-    cell = ws3.cell(row=row, column=4, value=f"${vendor_revenue:,.2f}")
-    cell.fill = vendor_fill
-    cell.font = vendor_font
-    cell.border = thin_border
-    cell.number_format = currency_format
-
-    row += 1
-
-    # Categories
-    for category in categories:
-        cell = ws3.cell(row=row, column=1, value=f"  {category}")
-        cell.fill = category_fill
-        cell.font = category_font
-        cell.border = thin_border
-
-        # Category total from actual data (if available)
-        cat_total = 0.0
-        cat_revenue = 0.0
-
-        if vendor_name == 'Casters':
-            # For Casters, sum across all three caster vendors
-            for cv in caster_vendors:
-                if cv in category_spend and category in category_spend[cv]:
-                    cat_total += category_spend[cv][category]
-                # Also sum revenue for this category
-                cv_cat_data = upload[(upload['Vendor'] == cv) & (upload['Product Category'] == category)]
-                cat_revenue += sum([float(x.replace('$','').replace(',','')) if x and isinstance(x, str) and x.strip() else 0
-                                    for x in cv_cat_data['Revenue']])
-        else:
-            # For regular vendors, get from the vendor's category spend
-            if vendor_name in category_spend and category in category_spend[vendor_name]:
-                cat_total = category_spend[vendor_name][category]
-            # Get revenue for this category
-            cat_data = upload[(upload['Vendor'] == vendor_name) & (upload['Product Category'] == category)]
-            cat_revenue = sum([float(x.replace('$','').replace(',','')) if x and isinstance(x, str) and x.strip() else 0
-                               for x in cat_data['Revenue']])
-
-        cell = ws3.cell(row=row, column=2, value=f"${cat_total:,.2f}" if cat_total > 0 else "")
-        cell.border = thin_border
-        if cat_total > 0:
-            cell.number_format = currency_format
-
-        # Empty column (C)
-        cell = ws3.cell(row=row, column=3, value="")
-        cell.fill = category_fill
-        cell.border = thin_border
-
-        # Category revenue
-        cell = ws3.cell(row=row, column=4, value=f"${cat_revenue:,.2f}" if cat_revenue > 0 else "")
-        cell.fill = category_fill
-        cell.font = category_font
-        cell.border = thin_border
-        if cat_revenue > 0:
-            cell.number_format = currency_format
-
-        row += 1
-
-    row += 1
-
-# All Other Vendors section
-# Calculate total revenue for all other vendors
-all_other_vendors_revenue = 0
-for vendor in other_vendors:
-    vendor_data = upload[upload['Vendor'] == vendor]
-    revenue = sum([float(x.replace('$','').replace(',','')) if x and isinstance(x, str) and x.strip() else 0
-                   for x in vendor_data['Revenue']])
-    all_other_vendors_revenue += revenue
-
-cell = ws3.cell(row=row, column=1, value="All Other Vendors")
-cell.fill = other_fill
-cell.font = other_font
-cell.border = thin_border
-
-cell = ws3.cell(row=row, column=2, value=f"${other_vendors_spend:,.2f}")
-cell.fill = other_fill
-cell.font = other_font
-cell.border = thin_border
-cell.number_format = currency_format
-
-cell = ws3.cell(row=row, column=3, value="")
-cell.fill = other_fill
-cell.border = thin_border
-
-cell = ws3.cell(row=row, column=4, value=f"${all_other_vendors_revenue:,.2f}")
-cell.fill = other_fill
-cell.font = other_font
-cell.border = thin_border
-cell.number_format = currency_format
-
-row += 1
-
-for vendor in other_vendors:  # Already sorted by spend descending
-    spend = vendor_spend[vendor]
-
-    # Calculate revenue for this vendor
-    vendor_data = upload[upload['Vendor'] == vendor]
-    revenue = sum([float(x.replace('$','').replace(',','')) if x and isinstance(x, str) and x.strip() else 0
-                   for x in vendor_data['Revenue']])
-
-    cell = ws3.cell(row=row, column=1, value=f"  - {vendor}")
-    cell.fill = other_fill
-    cell.font = other_font
-    cell.border = thin_border
-
-    cell = ws3.cell(row=row, column=2, value=f"${spend:,.2f}")
-    cell.fill = other_fill
-    cell.font = other_font
-    cell.border = thin_border
-    cell.number_format = currency_format
-
-    # Empty column (C)
-    cell = ws3.cell(row=row, column=3, value="")
-    cell.fill = other_fill
-    cell.border = thin_border
 
-    cell = ws3.cell(row=row, column=4, value=f"${revenue:,.2f}")
-    cell.fill = other_fill
-    cell.font = other_font
+def aggregate_vendor_totals(upload):
+    """
+    Spend and revenue per (Vendor, Product Category) in one grouped pass.
+    Vendor totals are rolled up from that small table.
+
+    Returns:
+        Tuple of (vendor_totals, category_totals)
+        - vendor_totals: DataFrame indexed by Vendor (first-seen order)
+        - category_totals: DataFrame indexed by (Vendor, Product Category)
+    """
+    frame = pd.DataFrame({
+        'Vendor': upload['Vendor'],
+        'Product Category': upload['Product Category'],
+        'Spend': parse_money(upload['Ad Spend']),
+        'Revenue': parse_money(upload['Revenue']),
+    })
+    category_totals = frame.groupby(['Vendor', 'Product Category'], sort=False, dropna=False)[['Spend', 'Revenue']].sum()
+    vendor_totals = category_totals.groupby(level='Vendor', sort=False).sum()
+    return vendor_totals, category_totals
+
+
+def styled_cell(ws, value, fill=None, font=None, number_format=None):
+    """Write-only cell with the report's thin border and optional styling"""
+    cell = WriteOnlyCell(ws, value=None if isinstance(value, float) and pd.isna(value) else value)
     cell.border = thin_border
-    cell.number_format = currency_format
+    if fill is not None:
+        cell.fill = fill
+    if font is not None:
+        cell.font = font
+    if number_format is not None:
+        cell.number_format = number_format
+    return cell
+
+
+def table_sheet_builder(df):
+    """Sheet builder that streams a DataFrame: styled header row, bordered data rows"""
+    def build(ws):
+        for i in range(1, len(df.columns) + 1):
+            ws.column_dimensions[get_column_letter(i)].width = UPLOAD_COLUMN_WIDTH
+
+        ws.append([styled_cell(ws, col, fill=header_fill, font=header_font) for col in df.columns])
+        for values in df.itertuples(index=False, name=None):
+            ws.append([styled_cell(ws, value) for value in values])
+    return build
+
+
+def money(value):
+    return f"${value:,.2f}"
+
+
+def vendor_breakdown_builder(upload):
+    """Sheet builder for the Vendor Breakdown (totals are computed up front)"""
+    # Main vendors list
+    main_vendors_list = list(vendor_categories.keys())
+
+    print("Building vendor category breakdown...")
+    print(f"Main vendors: {len(main_vendors_list)}")
+
+    vendor_totals, category_totals = aggregate_vendor_totals(upload)
+    vendor_spend = vendor_totals['Spend'].to_dict()
+    vendor_revenue = vendor_totals['Revenue'].to_dict()
+    category_spend = category_totals['Spend'].to_dict()      # {(vendor, category): spend}
+    category_revenue = category_totals['Revenue'].to_dict()  # {(vendor, category): revenue}
+
+    # Identify "All Other Vendors" (excluding the caster component vendors)
+    caster_component_vendors = ['Caster Depot', 'Dh International', 'Durable Superior Casters']
+    main_vendor_names = set(vendor_categories.keys())
+    other_vendors = [v for v in vendor_spend.keys() if v not in main_vendor_names and v not in caster_component_vendors]
+    # Sort by spend descending
+    other_vendors = sorted(other_vendors, key=lambda v: vendor_spend[v], reverse=True)
+    other_vendors_spend = sum([vendor_spend[v] for v in other_vendors])
+    other_vendors_revenue = sum([vendor_revenue[v] for v in other_vendors])
+
+    # Casters = Caster Depot + DH International + Durable Superior Casters
+    caster_vendors = [v for v in vendor_spend.keys() if v in ['Caster Depot', 'Durable Superior Casters'] or 'international' in v.lower()]
+
+    print(f"Other vendors: {len(other_vendors)}")
+    print(f"Other vendors spend: ${other_vendors_spend:,.2f}")
+
+    total_ad_spend = sum(vendor_spend.values())
+    total_revenue = sum(vendor_revenue.values())
+
+    def build(ws3):
+        for column, width in BREAKDOWN_COLUMN_WIDTHS.items():
+            ws3.column_dimensions[column].width = width
+
+        def summary_row(label, spend, revenue, fill, font):
+            """Label | spend | spacer | revenue, all in the same fill and font"""
+            return [
+                styled_cell(ws3, label, fill=fill, font=font),
+                styled_cell(ws3, money(spend), fill=fill, font=font, number_format=currency_format),
+                styled_cell(ws3, "", fill=fill),
+                styled_cell(ws3, money(revenue), fill=fill, font=font, number_format=currency_format),
+            ]
+
+        # Summary row and column headers
+        ws3.append(summary_row("TOTAL", total_ad_spend, total_revenue, total_fill, total_font))
+        ws3.append([
+            styled_cell(ws3, ""),
+            styled_cell(ws3, "Ad Spend", font=column_header_font),
+            styled_cell(ws3, ""),
+            styled_cell(ws3, "Revenue", font=column_header_font),
+        ])
+
+        for vendor_name in main_vendors_list:
+            # Casters roll up three component vendors
+            components = caster_vendors if vendor_name == 'Casters' else [vendor_name]
+
+            vendor_total = sum([vendor_spend.get(v, 0) for v in components])
+            vendor_rev = sum([vendor_revenue.get(v, 0) for v in components])
+            ws3.append(summary_row(vendor_name, vendor_total, vendor_rev, vendor_fill, vendor_font))
+
+            for category in vendor_categories[vendor_name]:
+                cat_total = sum([category_spend.get((v, category), 0.0) for v in components])
+                cat_revenue = sum([category_revenue.get((v, category), 0.0) for v in components])
+                ws3.append([
+                    styled_cell(ws3, f"  {category}", fill=category_fill, font=category_font),
+                    styled_cell(ws3, money(cat_total) if cat_total > 0 else "",
+                                number_format=currency_format if cat_total > 0 else None),
+                    styled_cell(ws3, "", fill=category_fill),
+                    styled_cell(ws3, money(cat_revenue) if cat_revenue > 0 else "", fill=category_fill,
+                                font=category_font, number_format=currency_format if cat_revenue > 0 else None),
+                ])
+
+            ws3.append([])
+
+        # All Other Vendors section (already sorted by spend descending)
+        ws3.append(summary_row("All Other Vendors", other_vendors_spend, other_vendors_revenue, other_fill, other_font))
+        for vendor in other_vendors:
+            ws3.append(summary_row(f"  - {vendor}", vendor_spend[vendor], vendor_revenue[vendor], other_fill, other_font))
+
+    return build
+
+
+def report_sheet_builders(upload, missing_cats):
+    """Sheet builders for the upload, missing categories and vendor breakdown sheets"""
+    return {
+        "Product Spend Upload": table_sheet_builder(upload),
+        "Missing Categories": table_sheet_builder(missing_cats),
+        "Vendor Breakdown": vendor_breakdown_builder(upload),
+    }
+
+
+def create_excel_report(config, upload, missing_cats, metrics=None):
+    """
+    Write {month} Product Spend Report.xlsx in a single streaming pass: the
+    Summary Report (when metrics from report_metrics.compute_report_metrics
+    are given), upload sheet, missing categories and vendor breakdown.
+    Returns the path of the workbook.
+    """
+    from create_summary_report import summary_sheet_builders
+
+    month = config['month']
+    output_dir = get_output_dir(config)
+    output_file = os.path.join(output_dir, f"{month} Product Spend Report.xlsx")
+
+    builders = report_sheet_builders(upload, missing_cats)
+    if metrics is not None:
+        builders.update(summary_sheet_builders(month, metrics))
+
+    sheets = write_workbook(output_file, builders)
+
+    print(f"\nCreated: {output_file}")
+    print(f"Sheets: {len(sheets)} ({', '.join(sheets)})")
+
+    return output_file
+
+
+def main():
+    from report_metrics import compute_report_metrics
+
+    config = load_config()
+    upload, missing_cats = read_upload_files(config)
+    create_excel_report(config, upload, missing_cats, compute_report_metrics(upload))
 
-    row += 1
 
-ws3.column_dimensions['A'].width = 35
-ws3.column_dimensions['B'].width = 12
-ws3.column_dimensions['C'].width = 4
-ws3.column_dimensions['D'].width = 14
-
-# Save with temporary name first
-temp_file = os.path.join(output_dir, f"{month} Product Spend Report_TEMP.xlsx")
-wb.save(temp_file)
-
-# Try to replace the original file
-import os
-import shutil
-if os.path.exists(output_file):
-    try:
-        os.remove(output_file)
-    except:
-        try:
-            shutil.move(temp_file, output_file, copy_function=shutil.copy2)
-            temp_file = None
-        except:
-            pass
-
-if temp_file and os.path.exists(temp_file):
-    shutil.move(temp_file, output_file, copy_function=shutil.copy2)
-
-print(f"\nCreated: {output_file}")
-print(f"Sheets: 3 (Product Spend Upload, Missing Categories, Vendor Breakdown)")
+if __name__ == "__main__":
+    main()
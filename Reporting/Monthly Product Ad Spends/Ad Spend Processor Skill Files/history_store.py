@@ -0,0 +1,304 @@
+"""
+Ad spend history store - every month's upload sheet in one local dataset.
+
+The monthly upload CSVs hold formatted text ("$1,234.56", "7,145", "0.63%"),
+so any multi-month analysis used to glob and re-parse all of them. The
+history store keeps the same rows as typed columns in Parquet files,
+partitioned by month and platform:
+
+    Ad Spend History/
+        month=2025-09/platform=Bing/part-0.parquet
+        month=2025-09/platform=Google/part-0.parquet
+        month=2025-10/platform=Bing/part-0.parquet
+        month=2025-10/summary.parquet
+        ...
+
+Vendor, Product Category and SKU are stored dictionary-encoded (pandas
+categoricals), money and counts as numbers, and percents as fractions.
+Appending a month replaces that month's partitions, so re-running a month
+never duplicates rows. summary.parquet holds the month's per-product sums
+for multi-month leaderboards (leaderboards.py).
+
+query_history() picks partitions from the folder names before opening any
+file, so a year-over-year report reads only the months it asks for:
+
+    query_history(history_dir, months=['2024-10', '2025-10'], columns=['Vendor', 'Ad Spend'])
+
+Requires pyarrow (pip install pyarrow).
+
+Usage:
+    python history_store.py backfill [folder ...]   # import existing upload CSVs
+    python history_store.py list                    # show stored partitions
+"""
+
+import functools
+import glob
+import os
+import shutil
+import sys
+
+import pandas as pd
+
+from workflow_config import load_config, get_history_dir
+from leaderboards import SUMMARY_FILE, month_summary
+
+from s4.parsing import parse_money, parse_number, parse_integer, parse_percent
+
+# ============================================================================
+# SCHEMA
+# ============================================================================
+
+PARTITION_COLUMNS = ['Month', 'Platform']
+DICTIONARY_COLUMNS = ['Product Category', 'SKU', 'Vendor']
+TEXT_COLUMNS = ['Title']
+# Blank means 0 for these (the upload sheet leaves zeros blank)
+ZERO_COLUMNS = {
+    'Ad Spend': parse_money,
+    'Revenue': parse_money,
+    'Impressions': parse_integer,
+    'Clicks': parse_integer,
+    'Conversions': functools.partial(parse_number, missing=0.0),
+}
+# Blank means unknown for these
+NULLABLE_COLUMNS = {
+    'Price': parse_money,
+    'Avg. CPC': parse_money,
+    'CTR': parse_percent,
+    'Impression share': parse_percent,
+    'Impression share lost to rank': parse_percent,
+    'Absolute top impression share': parse_percent,
+}
+
+# Column order of the upload sheet
+HISTORY_COLUMNS = [
+    'Month', 'Platform', 'Product Category', 'SKU', 'Title', 'Vendor', 'Price', 'Ad Spend',
+    'Impressions', 'Clicks', 'CTR', 'Avg. CPC', 'Conversions', 'Revenue', 'Impression share',
+    'Impression share lost to rank', 'Absolute top impression share',
+]
+
+PART_FILE = 'part-0.parquet'
+
+
+def require_pyarrow():
+    """Import pyarrow or explain how to install it"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError("The ad spend history store needs pyarrow. Install it with: pip install pyarrow")
+
+
+def blank_to_na(series):
+    """'' and whitespace-only cells -> missing"""
+    text = series.astype('string').str.strip()
+    return text.where(text != '')
+
+
+def typed_upload(upload_df):
+    """
+    Upload sheet rows (formatted text or already parsed) -> typed history rows.
+    Percent columns become fractions (0.63% -> 0.0063).
+    """
+    typed = pd.DataFrame(index=upload_df.index)
+    for col in HISTORY_COLUMNS:
+        if col not in upload_df.columns:
+            continue
+        values = upload_df[col]
+        if col in PARTITION_COLUMNS or col in DICTIONARY_COLUMNS:
+            typed[col] = blank_to_na(values).astype('category')
+        elif col in TEXT_COLUMNS:
+            typed[col] = blank_to_na(values)
+        elif col in ZERO_COLUMNS:
+            typed[col] = ZERO_COLUMNS[col](values)
+        else:
+            typed[col] = NULLABLE_COLUMNS[col](values, missing=None)
+    return typed.reset_index(drop=True)
+
+
+# ============================================================================
+# WRITE
+# ============================================================================
+
+def partition_path(history_dir, month, platform):
+    return os.path.join(history_dir, f"month={month}", f"platform={platform}")
+
+
+def append_month(history_dir, upload_df):
+    """
+    Write upload rows into the store, one partition per (month, platform).
+
+    Every month present in upload_df is replaced as a whole, so re-running a
+    month (or re-importing its CSV) leaves exactly one copy of its rows.
+    Each month also gets its leaderboard summary (see leaderboards.py).
+
+    Returns:
+        List of partition files written
+    """
+    require_pyarrow()
+    typed = typed_upload(upload_df)
+    written = []
+
+    for month, month_rows in typed.groupby('Month', observed=True):
+        month_dir = os.path.join(history_dir, f"month={month}")
+        # Build the new month next to the old one, then swap, so a failed
+        # write never leaves a half-replaced month behind
+        staging_dir = month_dir + '.tmp'
+        old_dir = month_dir + '.old'
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+        for platform, rows in month_rows.groupby('Platform', observed=True):
+            part_dir = os.path.join(staging_dir, f"platform={platform}")
+            os.makedirs(part_dir, exist_ok=True)
+            data = rows.drop(columns=PARTITION_COLUMNS).reset_index(drop=True)
+            # Drop categories that belong to other partitions
+            for col in DICTIONARY_COLUMNS:
+                if col in data.columns:
+                    data[col] = data[col].cat.remove_unused_categories()
+            data.to_parquet(os.path.join(part_dir, PART_FILE), index=False)
+            written.append(os.path.join(partition_path(history_dir, month, platform), PART_FILE))
+
+        # The month's leaderboard summary is swapped in together with its rows
+        month_summary(month_rows).to_parquet(os.path.join(staging_dir, SUMMARY_FILE), index=False)
+
+        # Move the old month aside before moving the new one in; it is only
+        # deleted once the new month is in place
+        if os.path.exists(month_dir):
+            os.replace(month_dir, old_dir)
+        os.replace(staging_dir, month_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    return written
+
+
+def append_upload_to_history(config, combined):
+    """
+    Add this month's upload sheet to the history store (used by process_upload).
+    Prints a hint instead of failing when pyarrow is missing.
+    """
+    history_dir = get_history_dir(config)
+    try:
+        written = append_month(history_dir, combined)
+    except ImportError as e:
+        print(f"   Skipped history store: {e}")
+        return []
+    print(f"   History store: {len(written)} partition(s) written to {history_dir}")
+    return written
+
+
+# ============================================================================
+# READ
+# ============================================================================
+
+def list_partitions(history_dir):
+    """
+    Partitions in the store, from the folder names only (no file is opened).
+
+    Returns:
+        DataFrame with Month, Platform and path, sorted by month and platform
+    """
+    partitions = []
+    for path in glob.glob(os.path.join(history_dir, 'month=*', 'platform=*', PART_FILE)):
+        platform_dir = os.path.dirname(path)
+        month_dir = os.path.dirname(platform_dir)
+        if month_dir.endswith(('.tmp', '.old')):
+            continue
+        partitions.append({
+            'Month': os.path.basename(month_dir)[len('month='):],
+            'Platform': os.path.basename(platform_dir)[len('platform='):],
+            'path': path,
+        })
+    partitions = pd.DataFrame(partitions, columns=['Month', 'Platform', 'path'])
+    return partitions.sort_values(['Month', 'Platform']).reset_index(drop=True)
+
+
+def query_history(history_dir, months=None, start_month=None, end_month=None, platforms=None, columns=None):
+    """
+    Read history rows, opening only the partitions that can match.
+
+    Args:
+        history_dir: Store folder (see workflow_config.get_history_dir)
+        months: Exact months to read, e.g. ['2024-10', '2025-10']
+        start_month / end_month: Inclusive YYYY-MM range
+        platforms: e.g. ['Google'] (None = all)
+        columns: Columns to read besides Month and Platform (None = all)
+
+    Returns:
+        DataFrame with Month and Platform first; Month, Platform, Vendor,
+        Product Category and SKU as categoricals
+    """
+    require_pyarrow()
+    partitions = list_partitions(history_dir)
+
+    # Partition pruning: decided from the folder names alone
+    keep = pd.Series(True, index=partitions.index)
+    if months is not None:
+        keep &= partitions['Month'].isin(list(months))
+    if start_month is not None:
+        keep &= partitions['Month'] >= start_month
+    if end_month is not None:
+        keep &= partitions['Month'] <= end_month
+    if platforms is not None:
+        keep &= partitions['Platform'].isin(list(platforms))
+    partitions = partitions[keep]
+
+    read_columns = None if columns is None else [col for col in columns if col not in PARTITION_COLUMNS]
+    frames = []
+    for partition in partitions.itertuples(index=False):
+        frame = pd.read_parquet(partition.path, columns=read_columns)
+        frame.insert(0, 'Platform', partition.Platform)
+        frame.insert(0, 'Month', partition.Month)
+        frames.append(frame)
+
+    if not frames:
+        wanted = HISTORY_COLUMNS if columns is None else PARTITION_COLUMNS + read_columns
+        return pd.DataFrame(columns=wanted)
+
+    history = pd.concat(frames, ignore_index=True)
+    # Partitions have their own dictionaries; unify them after the concat
+    for col in PARTITION_COLUMNS + DICTIONARY_COLUMNS:
+        if col in history.columns:
+            history[col] = history[col].astype('category')
+    return history
+
+
+# ============================================================================
+# BACKFILL
+# ============================================================================
+
+def backfill(history_dir, folders):
+    """Import every '* Product Spend Upload.csv' below the given folders"""
+    paths = []
+    for folder in folders:
+        paths.extend(glob.glob(os.path.join(folder, '**', '* Product Spend Upload.csv'), recursive=True))
+
+    # Oldest files first, so the newest copy of a month wins
+    for path in sorted(paths, key=os.path.getmtime):
+        upload = pd.read_csv(path, dtype=str, keep_default_na=False)
+        written = append_month(history_dir, upload)
+        months = ', '.join(sorted(upload['Month'].unique()))
+        print(f"  {path}: {len(upload):,} rows ({months}) -> {len(written)} partition(s)")
+
+
+def main():
+    config = load_config()
+    history_dir = get_history_dir(config)
+    command = sys.argv[1] if len(sys.argv) > 1 else 'list'
+
+    if command == 'backfill':
+        folders = sys.argv[2:] or [os.path.dirname(history_dir) or '.']
+        print(f"Backfilling {history_dir} from: {', '.join(folders)}")
+        backfill(history_dir, folders)
+    elif command != 'list':
+        print(__doc__)
+        sys.exit(1)
+
+    partitions = list_partitions(history_dir)
+    print(f"\nHistory store: {history_dir}")
+    if partitions.empty:
+        print("  (empty)")
+    for month, platforms in partitions.groupby('Month')['Platform']:
+        print(f"  {month}: {', '.join(platforms)}")
+
+
+if __name__ == "__main__":
+    main()
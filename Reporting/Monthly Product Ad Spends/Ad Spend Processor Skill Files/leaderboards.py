@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Multi-month "Top 20" leaderboards from per-month summaries.
+
+The Summary Report and the PDF rank one month's upload rows (see
+report_metrics.py). Ranking a quarter, a year or all time the same way would
+mean loading every month's rows. Instead, every month in the history store
+(history_store.py) gets a small summary next to its partitions:
+
+    Ad Spend History/month=2025-10/summary.parquet
+
+with one row per product (Platform, SKU, Title, Vendor, Product Category)
+holding its partial sums: ad spend and revenue in whole cents, clicks and
+the number of upload rows. Summaries are mergeable: the summary of any month
+range is the per-product sum of its months' summaries, and because the sums
+are integers the result does not depend on the order months are added in.
+
+Keeping only each month's top 20 would not be enough: a product that is
+21st every month can still be first for the year. The summary keeps every
+product, but only these few numbers, so merging 36 months takes
+milliseconds.
+
+Ranking is exact and deterministic: by the value, highest first, then by
+the key columns in ascending order (blanks last), so a tie is always broken
+the same way whichever months were merged.
+
+range_metrics() returns the same dict as report_metrics.compute_report_metrics,
+so the Summary Report and PDF tables can be built for any month range.
+
+Usage:
+    python leaderboards.py START_MONTH [END_MONTH] [--top N]
+    python leaderboards.py rebuild      # write summaries missing from the store
+
+    python leaderboards.py 2025-07 2025-09    # Q3 2025
+    python leaderboards.py 2022-11 2025-10    # all time
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from workflow_config import load_config, get_history_dir
+from report_metrics import TOP_N, PRODUCT_COLUMNS, safe_divide
+
+SUMMARY_FILE = 'summary.parquet'
+
+# A product row of the upload sheet (one per platform)
+PRODUCT_KEY = ['Platform', 'SKU', 'Title', 'Vendor']
+SUMMARY_KEY = PRODUCT_KEY + ['Product Category']
+# Integer sums, so merging months is exact
+SUMMARY_VALUES = ['Spend Cents', 'Revenue Cents', 'Clicks', 'Rows']
+
+
+def summary_path(history_dir, month):
+    return os.path.join(history_dir, f"month={month}", SUMMARY_FILE)
+
+
+# ============================================================================
+# BUILD AND MERGE
+# ============================================================================
+
+def to_cents(amounts):
+    return np.round(pd.to_numeric(amounts).fillna(0).to_numpy(dtype=float) * 100).astype('int64')
+
+
+def month_summary(typed_rows):
+    """
+    Summary of one month's typed history rows (history_store.typed_upload).
+
+    Returns:
+        DataFrame with the SUMMARY_KEY columns and the SUMMARY_VALUES sums
+    """
+    rows = pd.DataFrame({col: typed_rows[col].astype('string') for col in SUMMARY_KEY})
+    rows['Spend Cents'] = to_cents(typed_rows['Ad Spend'])
+    rows['Revenue Cents'] = to_cents(typed_rows['Revenue'])
+    rows['Clicks'] = pd.to_numeric(typed_rows['Clicks']).fillna(0).astype('int64')
+    rows['Rows'] = 1
+    return merge_summaries([rows])
+
+
+def merge_summaries(summaries, key=SUMMARY_KEY):
+    """Per-key sums of several summaries (or of a finer summary, for a coarser key)"""
+    frames = [summary[key + SUMMARY_VALUES] for summary in summaries if len(summary)]
+    if not frames:
+        return pd.DataFrame({col: pd.Series(dtype='string') for col in key}
+                            | {col: pd.Series(dtype='int64') for col in SUMMARY_VALUES})
+    combined = pd.concat(frames, ignore_index=True)
+    return combined.groupby(key, dropna=False, sort=False)[SUMMARY_VALUES].sum().reset_index()
+
+
+def write_summary(history_dir, month, summary):
+    """Write a month's summary (through a temp file, so readers never see half a file)"""
+    path = summary_path(history_dir, month)
+    temp_path = path + '.tmp'
+    summary.to_parquet(temp_path, index=False)
+    os.replace(temp_path, path)
+    return path
+
+
+def read_summaries(history_dir, months):
+    """
+    Each month's summary, computed from its rows when the store has none
+    (months stored before summaries existed; `rebuild` writes them).
+    """
+    from history_store import query_history
+
+    summaries = []
+    for month in months:
+        path = summary_path(history_dir, month)
+        if os.path.exists(path):
+            summaries.append(pd.read_parquet(path))
+        else:
+            rows = query_history(history_dir, months=[month],
+                                 columns=SUMMARY_KEY + ['Ad Spend', 'Revenue', 'Clicks'])
+            summaries.append(month_summary(rows))
+    return summaries
+
+
+def stored_months(history_dir, start_month=None, end_month=None):
+    """Months in the store within the (inclusive) range"""
+    from history_store import list_partitions
+
+    months = sorted(set(list_partitions(history_dir)['Month']))
+    return [month for month in months
+            if (start_month is None or month >= start_month) and (end_month is None or month <= end_month)]
+
+
+# ============================================================================
+# RANKING
+# ============================================================================
+
+def top_k(frame, value, key, k=TOP_N):
+    """
+    The k rows with the highest `value`. Ties are broken by the key columns,
+    ascending with blanks last, so the result never depends on row order.
+    """
+    if len(frame) > k:
+        # Only rows reaching the k-th highest value (ties included) can make it
+        frame = frame[frame[value] >= frame[value].nlargest(k).iloc[-1]]
+    ranked = frame.sort_values([value] + key, ascending=[False] + [True] * len(key),
+                               na_position='last', kind='stable')
+    return ranked.head(k).reset_index(drop=True)
+
+
+def with_money(frame):
+    """Add the report columns (dollars and ROAS) to summed cents"""
+    frame = frame.copy()
+    frame['Ad Spend Numeric'] = frame['Spend Cents'] / 100
+    frame['Revenue Numeric'] = frame['Revenue Cents'] / 100
+    frame['ROAS'] = safe_divide(frame['Revenue Cents'], frame['Spend Cents'])
+    return frame
+
+
+def spend_table(summary, key, k):
+    """Spend, revenue and ROAS per key, top k by spend (like report_metrics.spend_by)"""
+    # Blank vendors / categories are left out, as in the monthly report
+    totals = with_money(merge_summaries([summary.dropna(subset=key)], key))
+    table = top_k(totals, 'Spend Cents', key, k)
+    table['ROAS'] = table['ROAS'].round(2)
+    return table[key + ['Ad Spend Numeric', 'Revenue Numeric', 'ROAS']]
+
+
+def summary_metrics(summary, k=TOP_N):
+    """
+    Leaderboards of one merged summary.
+
+    Returns:
+        Dict shaped like report_metrics.compute_report_metrics: top_20_spend,
+        top_20_revenue, top_20_cpc, vendor_spend, category_vendor and totals
+    """
+    products = with_money(merge_summaries([summary], PRODUCT_KEY))
+    products['CPC'] = safe_divide(products['Spend Cents'], products['Clicks']) / 100
+
+    top_spend = top_k(products, 'Spend Cents', PRODUCT_KEY, k)[PRODUCT_COLUMNS]
+    top_spend['ROAS'] = top_spend['ROAS'].round(2)
+    top_revenue = top_k(products, 'Revenue Cents', PRODUCT_KEY, k)[PRODUCT_COLUMNS]
+    top_revenue['ROAS'] = top_revenue['ROAS'].round(2)
+
+    priced = products[products['CPC'] > 0]
+    top_cpc = top_k(priced, 'CPC', PRODUCT_KEY, k)[['SKU', 'Title', 'Vendor', 'CPC', 'Clicks']]
+
+    total_spend = summary['Spend Cents'].sum() / 100
+    total_revenue = summary['Revenue Cents'].sum() / 100
+    return {
+        'top_20_spend': top_spend,
+        'top_20_revenue': top_revenue,
+        'top_20_cpc': top_cpc,
+        'vendor_spend': spend_table(summary, ['Vendor'], k),
+        'category_vendor': spend_table(summary, ['Product Category', 'Vendor'], k),
+        'totals': {
+            'total_spend': total_spend,
+            'total_revenue': total_revenue,
+            'overall_roas': float(safe_divide(total_revenue, total_spend)),
+            'total_products': int(summary['Rows'].sum()),
+            'total_vendors': summary['Vendor'].nunique(),
+        },
+    }
+
+
+def range_metrics(history_dir, start_month, end_month=None, k=TOP_N):
+    """
+    Leaderboards for a month range (end_month defaults to start_month).
+
+    Returns:
+        (metrics, months): metrics as from summary_metrics(), months the
+        stored months that were merged
+    """
+    months = stored_months(history_dir, start_month, end_month or start_month)
+    summary = merge_summaries(read_summaries(history_dir, months))
+    return summary_metrics(summary, k), months
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def print_table(title, table, value_columns):
+    print(f"\n{title}")
+    print("-" * 100)
+    if table.empty:
+        print("  (no data)")
+    for rank, row in enumerate(table.to_dict('records'), start=1):
+        label = ' | '.join(str(row[col]) for col in table.columns if col not in value_columns
+                           if pd.notna(row[col]))
+        values = '  '.join(fmt.format(row[col]) for col, fmt in value_columns.items())
+        print(f"  {rank:>3}. {label[:60]:<60} {values}")
+
+
+def rebuild(history_dir):
+    """Write the summary of every stored month that has none"""
+    for month in stored_months(history_dir):
+        if not os.path.exists(summary_path(history_dir, month)):
+            summary = read_summaries(history_dir, [month])[0]
+            write_summary(history_dir, month, summary)
+            print(f"  {month}: {len(summary):,} products")
+
+
+def main():
+    args = sys.argv[1:]
+    k = TOP_N
+    if '--top' in args:
+        i = args.index('--top')
+        k = int(args[i + 1])
+        del args[i:i + 2]
+
+    history_dir = get_history_dir(load_config())
+    if args == ['rebuild']:
+        print(f"Writing missing month summaries in {history_dir}")
+        rebuild(history_dir)
+        return
+    if len(args) not in (1, 2):
+        print(__doc__)
+        sys.exit(1)
+
+    start = time.perf_counter()
+    metrics, months = range_metrics(history_dir, args[0], args[-1], k)
+    elapsed = time.perf_counter() - start
+    if not months:
+        print(f"No months between {args[0]} and {args[-1]} in {history_dir}")
+        sys.exit(1)
+
+    totals = metrics['totals']
+    print("=" * 100)
+    print(f"LEADERBOARDS {months[0]} TO {months[-1]} ({len(months)} months, merged in {elapsed * 1000:.0f} ms)")
+    print(f"Spend ${totals['total_spend']:,.2f}, revenue ${totals['total_revenue']:,.2f}, "
+          f"ROAS {totals['overall_roas']:.2f}, {totals['total_vendors']:,} vendors")
+    print("=" * 100)
+
+    money = {'Ad Spend Numeric': "${:>12,.2f}", 'Revenue Numeric': "${:>12,.2f}", 'ROAS': "{:>6.2f}"}
+    print_table(f"Top {k} Products by Ad Spend", metrics['top_20_spend'], money)
+    print_table(f"Top {k} Products by Revenue", metrics['top_20_revenue'], money)
+    print_table(f"Top {k} Highest CPC", metrics['top_20_cpc'], {'CPC': "${:>8,.2f}", 'Clicks': "{:>8,}"})
+    print_table(f"Top {k} Vendors by Ad Spend", metrics['vendor_spend'], money)
+    print_table(f"Top {k} Product Categories by Ad Spend", metrics['category_vendor'], money)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,31 @@
 #!/usr/bin/env python3
 """
 Master Workflow Script - Monthly Ad Spend Processing
-This script runs all 4 processing scripts in sequence to generate complete monthly reports.
+Runs every processing stage in a single Python process to generate complete monthly reports.
+
+The stages form a small dependency graph:
+
+    upload ──┬── metrics ──┬── excel
+             │             └── pdf
+             └── history
+
+The upload stage runs first; its data is kept in memory and shared with the
+report stages and with the history stage, which adds the month to the
+history store (see history_store.py). The metrics stage computes the Top 20
+tables once for both reports, which then run concurrently. The excel stage writes the whole
+Product Spend Report workbook (Summary Report included) in one streaming
+pass, see workbook_assembly.py. Per-stage timings are printed at the end.
+
+Stages are cached (see build_cache.py): a stage whose input files, config
+keys, code and upstream outputs are unchanged since an earlier run is skipped
+and its outputs are restored from the cache. Each run prints why every stage
+was restored or re-run. The history stage is never cached: the store lives
+outside the output folder and can be deleted or moved (paths.history_dir), so
+it is rewritten on every run.
 
 Usage:
     python master_workflow.py
+    python master_workflow.py --no-cache    # run every stage (still refreshes the cache)
 
 Before running:
     1. Download Google and Bing CSV exports
@@ -13,105 +34,327 @@ Before running:
     4. Check outputs in current directory
 """
 
-import subprocess
 import sys
 import os
 import json
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
+from pathlib import Path
+
+from workflow_config import load_config, get_output_dir
+from build_cache import BuildCache, get_build_cache_dir, describe_miss
+
+
+# ============================================================================
+# STAGES
+# ============================================================================
+# Each stage receives (config, results) where results holds the return value
+# of every finished stage, keyed by stage name. Heavy modules are imported
+# inside the stage so the import cost is paid once, in this process.
+
+def run_upload_stage(config, results):
+    import process_upload
+    result = process_upload.run(config, update_history=False)
+    # Report stages read the upload sheet exactly as exported, once, and share it
+    result['upload'], result['missing_cats'] = process_upload.read_upload_files(config)
+    return result
+
+
+def run_history_stage(config, results):
+    from history_store import append_upload_to_history
+    return append_upload_to_history(config, results['upload']['combined'])
+
+
+def run_metrics_stage(config, results):
+    from report_metrics import compute_report_metrics
+    return compute_report_metrics(results['upload']['upload'])
 
-print("\n" + "=" * 120)
-print("MASTER WORKFLOW - MONTHLY AD SPEND PROCESSING")
-print("=" * 120)
-
-# Load configuration
-try:
-    with open('config.json', 'r') as f:
-        config = json.load(f)
-    month = config['month']
-    google_file = config['input_files']['google']
-    bing_file = config['input_files']['bing']
-    input_dir = config['paths']['input_dir']
-    output_dir = config['paths']['output_dir'].replace("{month}", month)
-
-    print(f"\nConfiguration loaded for: {month}")
-    print(f"  Google file: {google_file}")
-    print(f"  Bing file: {bing_file}")
-except FileNotFoundError:
-    print("\nERROR: config.json not found!")
-    print("Please create config.json with month and filenames before running.")
-    sys.exit(1)
-except json.JSONDecodeError as e:
-    print(f"\nERROR: Invalid config.json format: {e}")
-    sys.exit(1)
-
-# Create output directory if it doesn't exist
-if not os.path.exists(output_dir):
-    try:
-        os.makedirs(output_dir)
-        print(f"\nCreated output folder: {output_dir}")
-    except Exception as e:
-        print(f"\nERROR: Could not create output directory: {e}")
-        sys.exit(1)
 
-# Verify input files exist
-print(f"\nVerifying input files...")
-google_path = os.path.join(input_dir, google_file)
-bing_path = os.path.join(input_dir, bing_file)
-if not os.path.exists(google_path):
-    print(f"ERROR: Google file not found: {google_path}")
-    sys.exit(1)
-if not os.path.exists(bing_path):
-    print(f"ERROR: Bing file not found: {bing_path}")
-    sys.exit(1)
-print(f"  All input files found")
-
-# List of scripts to run in order
-scripts = [
-    ("process_upload.py", "Processing raw data and creating upload sheet..."),
-    ("create_excel_report.py", "Creating Excel report with vendor breakdown..."),
-    ("create_summary_report.py", "Adding summary analysis sheet..."),
-    ("create_pdf_report.py", "Generating PDF report with visualizations..."),
+def run_excel_stage(config, results):
+    from create_excel_report import create_excel_report
+    upload = results['upload']
+    return create_excel_report(config, upload['upload'], upload['missing_cats'], results['metrics'])
+
+
+def run_pdf_stage(config, results):
+    from create_pdf_report import create_pdf_report
+    return create_pdf_report(config, results['metrics'])
+
+
+# (name, depends on, function, description)
+STAGES = [
+    ("upload", [], run_upload_stage, "Processing raw data and creating upload sheet..."),
+    ("history", ["upload"], run_history_stage, "Adding the month to the history store..."),
+    ("metrics", ["upload"], run_metrics_stage, "Calculating report metrics (Top 20 tables)..."),
+    ("excel", ["upload", "metrics"], run_excel_stage, "Writing Excel report (summary, upload, vendor breakdown)..."),
+    ("pdf", ["metrics"], run_pdf_stage, "Generating PDF report with visualizations..."),
 ]
 
-# Run each script
-failed_scripts = []
-for script_name, description in scripts:
-    print(f"\n{'=' * 120}")
-    print(f"STEP: {description}")
-    print(f"Running: {script_name}")
+
+# ============================================================================
+# STAGE INPUTS (build cache keys)
+# ============================================================================
+# What each stage's outputs depend on besides its upstream stages. Anything
+# missing here would let the cache restore stale outputs, so when a stage
+# starts reading a new file, config key or script, add it. A stage whose
+# effects the cache cannot see (files outside the output folder) is marked
+# "cached": False and always runs.
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+S4_DIR = Path(__file__).resolve().parents[3] / 's4'
+
+
+def upload_input_files(config):
+    input_dir = config['paths']['input_dir']
+    sku_path = config['paths']['sku_documents']
+    return [
+        os.path.join(input_dir, config['input_files']['google']),
+        os.path.join(input_dir, config['input_files']['bing']),
+        os.path.join(sku_path, "Google Ads - Product Spend - ID to SKU (1).csv"),
+        os.path.join(sku_path, "Google Ads - Product Spend - MASTER SKU (1).csv"),
+    ]
+
+
+def output_files(*names):
+    """Output files of a stage, e.g. output_files("Product Spend Report.xlsx")"""
+    return lambda config: [os.path.join(get_output_dir(config), f"{config['month']} {name}") for name in names]
+
+
+STAGE_INPUTS = {
+    "upload": {
+        "files": upload_input_files,
+        "config": ["month", "input_files.google", "input_files.bing"],
+        "code": [SCRIPT_DIR / "process_upload.py", S4_DIR / "parsing.py", S4_DIR / "loading.py",
+                 S4_DIR / "master_sku.py"],
+        "outputs": output_files("Product Spend Upload.csv", "Missing Product Categories.csv", "Missing SKUs.csv"),
+    },
+    "history": {
+        "cached": False,
+    },
+    "metrics": {
+        "code": [SCRIPT_DIR / "report_metrics.py", S4_DIR / "parsing.py"],
+    },
+    "excel": {
+        "config": ["month"],
+        "code": [SCRIPT_DIR / "create_excel_report.py", SCRIPT_DIR / "create_summary_report.py",
+                 SCRIPT_DIR / "workbook_assembly.py", S4_DIR / "parsing.py"],
+        "outputs": output_files("Product Spend Report.xlsx"),
+    },
+    "pdf": {
+        "config": ["month", "pdf_charts"],
+        "code": [SCRIPT_DIR / "create_pdf_report.py", SCRIPT_DIR / "vector_charts.py",
+                 SCRIPT_DIR / "chart_rendering.py"],
+        "outputs": output_files("Ad Spend Performance Report.pdf"),
+    },
+}
+
+
+def run_stages(stages, config, max_workers=3, cache=None, stage_inputs=None, refresh=False):
+    """
+    Run stages as soon as all of their dependencies have finished.
+
+    Independent stages run concurrently in a thread pool. A stage whose
+    dependency failed is skipped. With a BuildCache, a stage whose inputs
+    (stage_inputs[name] plus its upstream outputs) are unchanged is restored
+    from the cache instead of being run; stages that do run are stored
+    (refresh=True runs and stores every stage without restoring any).
+    Stages marked "cached": False, and stages after them, always run.
+
+    Returns:
+        Tuple of (results, timings, failed, skipped, cached)
+        - results: {stage name: return value}
+        - timings: {stage name: seconds}
+        - cached: stages restored from the build cache
+    """
+    results = {}
+    timings = {}
+    failed = []
+    skipped = []
+    cached = []
+    pending = {name: (deps, func, description) for name, deps, func, description in stages}
+    running = {}
+    stage_inputs = stage_inputs or {}
+    output_dir = get_output_dir(config)
+    keys = {}          # stage -> (key, inputs) for stages that run
+    fingerprints = {}  # stage -> what downstream cache keys see of it
+
+    def timed(name, func):
+        start = time.perf_counter()
+        try:
+            return func(config, results)
+        finally:
+            timings[name] = time.perf_counter() - start
+
+    def try_restore(name, deps):
+        """Restore the stage from the cache if its inputs are unchanged; True if restored"""
+        spec = stage_inputs.get(name, {})
+        if not spec.get('cached', True):
+            print(f"\n- Running {name}: never cached")
+            return False
+        uncached = [dep for dep in deps if dep not in fingerprints]
+        if uncached:
+            print(f"\n- Running {name}: runs after {', '.join(uncached)}, which is never cached")
+            return False
+        inputs = cache.stage_inputs(config, spec, {dep: fingerprints[dep] for dep in deps})
+        key = cache.stage_key(inputs)
+        manifest = None if refresh else cache.read_manifest(name, key)
+        if manifest is None:
+            keys[name] = (key, inputs)
+            reason = "--no-cache" if refresh else describe_miss(cache.changed_inputs(name, inputs))
+            print(f"\n- Running {name}: {reason}")
+            return False
+
+        start = time.perf_counter()
+        results[name] = cache.restore(manifest, output_dir)
+        timings[name] = time.perf_counter() - start
+        fingerprints[name] = cache.output_fingerprint(key, manifest)
+        cached.append(name)
+        print(f"\n✓ {name} restored from cache (inputs unchanged, key {key[:12]}) in {timings[name]:.2f}s")
+        return True
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            # Skip anything that depends on a failed or skipped stage
+            for name, (deps, func, description) in list(pending.items()):
+                if any(dep in failed or dep in skipped for dep in deps):
+                    print(f"\n- Skipping {name}: depends on a failed stage")
+                    skipped.append(name)
+                    del pending[name]
+
+            # Start every stage whose dependencies are done
+            for name, (deps, func, description) in list(pending.items()):
+                if all(dep in results for dep in deps):
+                    if cache is not None and try_restore(name, deps):
+                        del pending[name]
+                        continue
+                    print(f"\n{'=' * 120}")
+                    print(f"STAGE {name}: {description}")
+                    print("=" * 120)
+                    running[pool.submit(timed, name, func)] = (name, time.time())
+                    del pending[name]
+
+            if not running:
+                # Stages restored from the cache may have unblocked others
+                if pending and any(all(dep in results for dep in deps) for deps, _, _ in pending.values()):
+                    continue
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, started = running.pop(future)
+                try:
+                    results[name] = future.result()
+                    print(f"\n✓ {name} completed in {timings[name]:.2f}s")
+                except Exception as e:
+                    print(f"\n✗ ERROR in {name}: {e}")
+                    traceback.print_exc()
+                    failed.append(name)
+                    continue
+                if cache is not None and name in keys:
+                    key, inputs = keys[name]
+                    outputs = stage_inputs.get(name, {}).get('outputs', lambda config: [])(config)
+                    manifest = cache.store(name, key, inputs, outputs, results[name], started)
+                    fingerprints[name] = cache.output_fingerprint(key, manifest)
+
+    return results, timings, failed, skipped, cached
+
+
+def print_timings(stages, timings, total, cached=()):
+    print(f"\nSTAGE TIMINGS:")
+    for name, _, _, _ in stages:
+        if name in timings:
+            note = "  (restored from cache)" if name in cached else ""
+            print(f"  {name:<14} {timings[name]:>7.2f}s{note}")
+        else:
+            print(f"  {name:<14} {'--':>8}")
+    print(f"  {'wall clock':<14} {total:>7.2f}s")
+
+
+def main():
+    print("\n" + "=" * 120)
+    print("MASTER WORKFLOW - MONTHLY AD SPEND PROCESSING")
     print("=" * 120)
 
+    # Load configuration
     try:
-        result = subprocess.run([sys.executable, script_name], check=True)
-        print(f"\n✓ {script_name} completed successfully")
-    except subprocess.CalledProcessError as e:
-        print(f"\n✗ ERROR in {script_name}: {e}")
-        failed_scripts.append(script_name)
+        config = load_config()
+        month = config['month']
+        google_file = config['input_files']['google']
+        bing_file = config['input_files']['bing']
+        input_dir = config['paths']['input_dir']
+        output_dir = get_output_dir(config)
+
+        print(f"\nConfiguration loaded for: {month}")
+        print(f"  Google file: {google_file}")
+        print(f"  Bing file: {bing_file}")
     except FileNotFoundError:
-        print(f"\n✗ ERROR: {script_name} not found")
-        failed_scripts.append(script_name)
-
-# Summary
-print(f"\n" + "=" * 120)
-print("WORKFLOW COMPLETE")
-print("=" * 120)
-
-if failed_scripts:
-    print(f"\nFAILED: {len(failed_scripts)} script(s) failed:")
-    for script in failed_scripts:
-        print(f"  - {script}")
-    print(f"\nPlease check the errors above and rerun.")
-    sys.exit(1)
-else:
-    print(f"\nSUCCESS: All processing scripts completed!")
-    print(f"\nGenerated files for {month} in: {output_dir}")
-    print(f"  CSV Files:")
-    print(f"    - {month} Product Spend Upload.csv")
-    print(f"    - {month} Missing Product Categories.csv")
-    print(f"    - {month} Missing SKUs.csv")
-    print(f"\n  Reports:")
-    print(f"    - {month} Product Spend Report.xlsx (4 sheets)")
-    print(f"    - {month} Ad Spend Performance Report.pdf (6 pages)")
-    print(f"\nWorkflow finished at {datetime.now().strftime('%I:%M %p on %B %d, %Y')}")
+        print("\nERROR: config.json not found!")
+        print("Please create config.json with month and filenames before running.")
+        sys.exit(1)
+    except json.JSONDecodeError as e:
+        print(f"\nERROR: Invalid config.json format: {e}")
+        sys.exit(1)
+
+    # Create output directory if it doesn't exist
+    if not os.path.exists(output_dir):
+        try:
+            os.makedirs(output_dir)
+            print(f"\nCreated output folder: {output_dir}")
+        except Exception as e:
+            print(f"\nERROR: Could not create output directory: {e}")
+            sys.exit(1)
+
+    # Verify input files exist
+    print(f"\nVerifying input files...")
+    google_path = os.path.join(input_dir, google_file)
+    bing_path = os.path.join(input_dir, bing_file)
+    if not os.path.exists(google_path):
+        print(f"ERROR: Google file not found: {google_path}")
+        sys.exit(1)
+    if not os.path.exists(bing_path):
+        print(f"ERROR: Bing file not found: {bing_path}")
+        sys.exit(1)
+    print(f"  All input files found")
+
+    # Run the stage graph
+    cache = BuildCache(get_build_cache_dir(config))
+    refresh = '--no-cache' in sys.argv[1:]
+    print(f"\nBuild cache: {cache.cache_dir}{' (--no-cache: running every stage)' if refresh else ''}")
+    start = time.perf_counter()
+    results, timings, failed, skipped, cached = run_stages(
+        STAGES, config, cache=cache, stage_inputs=STAGE_INPUTS, refresh=refresh)
+    total = time.perf_counter() - start
+
+    # Summary
+    print(f"\n" + "=" * 120)
+    print("WORKFLOW COMPLETE")
     print("=" * 120)
-    sys.exit(0)
+    print_timings(STAGES, timings, total, cached)
+
+    if failed or skipped:
+        print(f"\nFAILED: {len(failed)} stage(s) failed:")
+        for name in failed:
+            print(f"  - {name}")
+        if skipped:
+            print(f"SKIPPED: {', '.join(skipped)}")
+        print(f"\nPlease check the errors above and rerun.")
+        sys.exit(1)
+    else:
+        print(f"\nSUCCESS: All processing stages completed!")
+        print(f"\nGenerated files for {month} in: {output_dir}")
+        print(f"  CSV Files:")
+        print(f"    - {month} Product Spend Upload.csv")
+        print(f"    - {month} Missing Product Categories.csv")
+        print(f"    - {month} Missing SKUs.csv")
+        print(f"\n  Reports:")
+        print(f"    - {month} Product Spend Report.xlsx (4 sheets)")
+        print(f"    - {month} Ad Spend Performance Report.pdf (6 pages)")
+        print(f"\nWorkflow finished at {datetime.now().strftime('%I:%M %p on %B %d, %Y')}")
+        print("=" * 120)
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
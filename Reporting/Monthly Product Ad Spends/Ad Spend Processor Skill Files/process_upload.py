@@ -1,54 +1,16 @@
 import pandas as pd
 import os
-import json
 
-# Load configuration
-with open('config.json', 'r') as f:
-    config = json.load(f)
+from workflow_config import load_config, get_output_dir
+from history_store import append_upload_to_history
 
-month = config['month']
-bing_file = config['input_files']['bing']
-google_file = config['input_files']['google']
-sku_path = config['paths']['sku_documents']
-input_dir = config['paths']['input_dir']
-output_dir = config['paths']['output_dir'].replace("{month}", month)
-
-print("=" * 120)
-print(f"AD SPEND PROCESSOR - {month.upper()} UPLOAD SHEET WITH SKU LOOKUP")
-print("=" * 120)
-
-# ============================================================================
-# 1. LOAD ALL DATA
-# ============================================================================
-print("\n1. LOADING DATA FILES")
-
-print(f"   Loading Bing Ads ({bing_file})...")
-bing_raw = pd.read_csv(os.path.join(input_dir, bing_file), skiprows=6)
-# Remove summary rows: Title='Total', Title='-', or Custom label has 'TOTAL'
-bing_raw = bing_raw[
-    (bing_raw['Title'] != 'Total') &
-    (bing_raw['Title'] != '-') &
-    (bing_raw['Custom label 1 (Product)'].astype(str).str.upper() != 'TOTAL')
-].dropna(subset=['Title'])
-print(f"   Loaded {len(bing_raw)} rows (after removing summary rows)")
-
-print(f"   Loading Google Ads ({google_file})...")
-google_raw = pd.read_csv(os.path.join(input_dir, google_file), encoding='utf-16-le', sep='\t', skiprows=2)
-print(f"   Loaded {len(google_raw)} rows")
-
-# SKU Lookup Files
-print(f"\n   Loading ID to SKU mapping...")
-id_to_sku = pd.read_csv(os.path.join(sku_path, "Google Ads - Product Spend - ID to SKU (1).csv"))
-print(f"   Loaded {len(id_to_sku)} ID-to-SKU mappings")
-
-print(f"   Loading MASTER SKU...")
-master_sku = pd.read_csv(os.path.join(sku_path, "Google Ads - Product Spend - MASTER SKU (1).csv"))
-print(f"   Loaded {len(master_sku)} SKU records")
+from s4.parsing import parse_money, parse_number, parse_integer
+from s4.loading import load_files, print_load_timings
+from s4.master_sku import MASTER_SKU_FILE, load_sku_index
 
 # ============================================================================
-# 2. SETUP VENDOR LIST
+# VENDOR LIST
 # ============================================================================
-print("\n2. SETTING UP VENDOR CONFIGURATION")
 
 main_vendors = {
     'lincoln industrial': 'Lincoln Industrial',
@@ -72,41 +34,82 @@ main_vendors = {
     'colson': 'Caster Depot',
 }
 
-print(f"   Configured {len(main_vendors)} main vendors")
+# Upload sheet column -> export column for the metric columns
+BING_METRIC_COLUMNS = {
+    'Price': 'Price',
+    'Ad Spend': 'Spend',
+    'Impressions': 'Impressions',
+    'Clicks': 'Clicks',
+    'CTR': 'CTR',
+    'Avg. CPC': 'Avg. CPC',
+    'Conversions': 'Conversions',
+    'Revenue': 'Revenue',
+    'Impression share': 'Impression share',
+    'Impression share lost to rank': 'Impression share lost to rank',
+    'Absolute top impression share': 'Absolute top impression share',
+}
+
+GOOGLE_METRIC_COLUMNS = {
+    'Price': 'Price',
+    'Ad Spend': 'Cost',
+    'Impressions': 'Impr.',
+    'Clicks': 'Clicks',
+    'CTR': 'CTR',
+    'Avg. CPC': 'Avg. CPC',
+    'Conversions': 'Conversions',
+    'Revenue': 'Conv. value',
+    'Impression share': 'Search impr. share',
+    'Impression share lost to rank': 'Search lost IS (rank)',
+    'Absolute top impression share': 'Search abs. top IS',
+}
 
 # ============================================================================
-# 3. HELPER FUNCTIONS
+# HELPER FUNCTIONS
 # ============================================================================
 
-def clean_currency(val):
-    if pd.isna(val):
-        return 0.0
-    s = str(val).replace('$', '').replace(',', '')
-    try:
-        return float(s)
-    except:
-        return 0.0
-
-def clean_number(val):
-    if pd.isna(val):
-        return 0
-    s = str(val).replace(',', '')
-    try:
-        return int(float(s))
-    except:
-        return 0
-
-def clean_percent(val):
-    if pd.isna(val):
-        return ""
-    s = str(val).strip()
-    if s.endswith('%'):
-        return s
-    try:
-        pct = float(s)
-        return f"{pct:.2f}%" if pct != 0 else ""
-    except:
-        return ""
+def money_text(amounts, blank_zero=True, thousands=True):
+    """Dollar amounts as upload text: 1234.5 -> "$1,234.50" ("" for 0 when blank_zero)"""
+    spec = ',.2f' if thousands else '.2f'
+    return [f"${x:{spec}}" if x > 0 or not blank_zero else "" for x in amounts]
+
+def percent_text(values):
+    """
+    Percent cells as upload text: "12.34%" kept as written, 12.34 -> "12.34%",
+    and 0, blanks and "--" -> "".
+    """
+    text = values.astype(object).where(values.notna(), '').astype(str).str.strip()
+    formatted = [f"{pct:.2f}%" if pct != 0 else "" for pct in parse_number(values, missing=0.0)]
+    return text.where(text.str.endswith('%'), formatted).tolist()
+
+def upload_metrics(raw, columns):
+    """
+    Parse and format the numeric columns of an export, one column at a time.
+
+    columns maps upload sheet names to the export's column names. Returns one
+    dict per row (in raw's order) with the upload sheet text values.
+    """
+    price = parse_money(raw[columns['Price']])
+    spend = parse_money(raw[columns['Ad Spend']])
+    impressions = parse_integer(raw[columns['Impressions']])
+    clicks = parse_integer(raw[columns['Clicks']])
+    cpc = parse_money(raw[columns['Avg. CPC']])
+    conversions = parse_number(raw[columns['Conversions']], missing=0.0)
+    revenue = parse_money(raw[columns['Revenue']])
+
+    metrics = pd.DataFrame({
+        'Price': money_text(price),
+        'Ad Spend': money_text(spend, blank_zero=False, thousands=False),
+        'Impressions': [f"{x:,}" if x > 0 else "" for x in impressions],
+        'Clicks': [f"{x:,}" if x > 0 else "" for x in clicks],
+        'CTR': percent_text(raw[columns['CTR']]),
+        'Avg. CPC': money_text(cpc, thousands=False),
+        'Conversions': [f"{x:.2f}" if x > 0 else "" for x in conversions],
+        'Revenue': money_text(revenue, thousands=False),
+        'Impression share': percent_text(raw[columns['Impression share']]),
+        'Impression share lost to rank': percent_text(raw[columns['Impression share lost to rank']]),
+        'Absolute top impression share': percent_text(raw[columns['Absolute top impression share']]),
+    })
+    return metrics.to_dict('records')
 
 def normalize_vendor(vendor_str):
     """Normalize vendor name to proper format"""
@@ -141,222 +144,358 @@ def lookup_sku_from_id(item_id, id_to_sku_df):
             return str(sku).strip().upper()
     return ""
 
-def lookup_category_from_sku(sku_val, master_sku_df):
-    """Look up Product Category from SKU in Master SKU"""
-    if pd.isna(sku_val) or sku_val == '':
-        return ""
-
-    sku_str = str(sku_val).strip().upper()
-    matches = master_sku_df[master_sku_df['SKU'].astype(str).str.strip().str.upper() == sku_str]
-
-    if not matches.empty:
-        category = matches.iloc[0].get('PRODUCT CATEGORY', '')
-        if pd.notna(category) and str(category).strip():
-            return str(category).strip()
-    return ""
+def lookup_category_from_sku(sku_val, sku_index):
+    """Look up Product Category from SKU in the compiled Master SKU index"""
+    return sku_index.category(sku_val)
 
 # ============================================================================
-# 4. PROCESS BING ADS
+# 1. LOAD ALL DATA
 # ============================================================================
-print("\n3. PROCESSING BING ADS")
-
-bing_list = []
-bing_missing_skus = []
-
-for idx, row in bing_raw.iterrows():
-    # Get SKU
-    sku = str(row['Custom label 1 (Product)']).strip().upper() if pd.notna(row['Custom label 1 (Product)']) and str(row['Custom label 1 (Product)']).strip() else ""
-
-    # Fallback to Merchant product ID if blank
-    if not sku or sku == '-' or sku == '--':
-        sku = str(row['Merchant product ID']).strip().upper() if pd.notna(row['Merchant product ID']) else ""
-
-    vendor = normalize_vendor(row.get('Brand', ''))
-
-    # Track missing SKUs (but include in main sheet)
-    if not sku or sku == '-' or sku == '--':
-        title = str(row.get('Title', '')).strip()
-        bing_missing_skus.append({'Vendor': vendor, 'Product Name': title, 'Source': 'Bing'})
-        sku = ""  # Set to empty string for upload sheet
-
-    # Get category from Master SKU (only if we have a valid SKU)
-    category = lookup_category_from_sku(sku, master_sku) if sku else ""
-
-    bing_list.append({
-        'Month': month,
-        'Platform': 'Bing',
-        'Product Category': category,
-        'SKU': sku,
-        'Title': str(row['Title']).strip(),
-        'Vendor': vendor,
-        'Price': f"${clean_currency(row['Price']):,.2f}" if clean_currency(row['Price']) > 0 else "",
-        'Ad Spend': f"${clean_currency(row['Spend']):.2f}",
-        'Impressions': f"{clean_number(row['Impressions']):,}" if clean_number(row['Impressions']) > 0 else "",
-        'Clicks': f"{clean_number(row['Clicks']):,}" if clean_number(row['Clicks']) > 0 else "",
-        'CTR': clean_percent(row['CTR']),
-        'Avg. CPC': f"${clean_currency(row['Avg. CPC']):.2f}" if clean_currency(row['Avg. CPC']) > 0 else "",
-        'Conversions': f"{float(row['Conversions']):.2f}" if float(row['Conversions']) > 0 else "",
-        'Revenue': f"${clean_currency(row['Revenue']):.2f}" if clean_currency(row['Revenue']) > 0 else "",
-        'Impression share': clean_percent(row['Impression share']),
-        'Impression share lost to rank': clean_percent(row['Impression share lost to rank']),
-        'Absolute top impression share': clean_percent(row['Absolute top impression share'])
-    })
 
-bing_processed = pd.DataFrame(bing_list)
-print(f"   Processed {len(bing_processed)} Bing records")
-print(f"   Missing SKUs: {len(bing_missing_skus)}")
+def read_bing_export(path):
+    """Bing export without its 6 report rows and the summary rows"""
+    bing_raw = pd.read_csv(path, skiprows=6)
+    # Remove summary rows: Title='Total', Title='-', or Custom label has 'TOTAL'
+    return bing_raw[
+        (bing_raw['Title'] != 'Total') &
+        (bing_raw['Title'] != '-') &
+        (bing_raw['Custom label 1 (Product)'].astype(str).str.upper() != 'TOTAL')
+    ].dropna(subset=['Title'])
+
+def read_google_export(path):
+    """Google export: UTF-16, tab-separated, 2 title rows"""
+    return pd.read_csv(path, encoding='utf-16-le', sep='\t', skiprows=2)
+
+def reference_loaders(sku_path):
+    """Loaders for the SKU lookup files, which are the same for every month"""
+    return {
+        'ID to SKU': lambda: pd.read_csv(os.path.join(sku_path, "Google Ads - Product Spend - ID to SKU (1).csv")),
+        'MASTER SKU': lambda: pd.read_csv(os.path.join(sku_path, MASTER_SKU_FILE)),
+    }
+
+def build_reference(sku_path, loaded):
+    """ID-to-SKU, MASTER SKU and the SKU index built from them"""
+    print(f"   Loaded {len(loaded['ID to SKU'])} ID-to-SKU mappings")
+    print(f"   Loaded {len(loaded['MASTER SKU'])} SKU records")
+
+    # Saved SKU index is reused while the MASTER SKU file is unchanged
+    sku_index = load_sku_index(sku_path, loaded['MASTER SKU'])
+    print(f"   MASTER SKU index: {len(sku_index.products)} SKUs")
+
+    return {
+        'id_to_sku': loaded['ID to SKU'],
+        'master_sku': loaded['MASTER SKU'],
+        'sku_index': sku_index,
+    }
+
+def load_reference(config):
+    """
+    Load the SKU lookup files once, for runs that process several months
+    (see backfill.py). Pass the result to load_inputs() / run().
+    """
+    sku_path = config['paths']['sku_documents']
+    loaded, timings = load_files(reference_loaders(sku_path))
+    print_load_timings(timings)
+    return build_reference(sku_path, loaded)
+
+def load_inputs(config, reference=None):
+    """
+    Load the Bing/Google exports and the SKU lookup files (all four concurrently).
+    When `reference` (from load_reference) is given, only the exports are read.
+    """
+    bing_file = config['input_files']['bing']
+    google_file = config['input_files']['google']
+    sku_path = config['paths']['sku_documents']
+    input_dir = config['paths']['input_dir']
+
+    print("\n1. LOADING DATA FILES")
+    print(f"   Bing Ads: {bing_file}")
+    print(f"   Google Ads: {google_file}")
+    print(f"   SKU lookups: {sku_path}" + (" (already loaded)" if reference else ""))
+
+    # The files are independent; the load phase takes as long as the slowest one
+    loaders = {
+        'Bing Ads': lambda: read_bing_export(os.path.join(input_dir, bing_file)),
+        'Google Ads': lambda: read_google_export(os.path.join(input_dir, google_file)),
+    }
+    if reference is None:
+        loaders.update(reference_loaders(sku_path))
+    loaded, timings = load_files(loaders)
+
+    print(f"   Loaded {len(loaded['Bing Ads'])} Bing rows (after removing summary rows)")
+    print(f"   Loaded {len(loaded['Google Ads'])} Google rows")
+    if reference is None:
+        reference = build_reference(sku_path, loaded)
+    print_load_timings(timings)
+
+    return {
+        'bing_raw': loaded['Bing Ads'],
+        'google_raw': loaded['Google Ads'],
+        **reference,
+    }
 
 # ============================================================================
-# 5. PROCESS GOOGLE ADS
+# 2. PROCESS BING ADS
 # ============================================================================
-print("\n4. PROCESSING GOOGLE ADS")
-
-google_list = []
-google_missing_skus = []
-
-for idx, row in google_raw.iterrows():
-    # Get SKU from Custom label 1
-    sku = str(row['Custom label 1']).strip().upper() if pd.notna(row['Custom label 1']) and str(row['Custom label 1']).strip() else ""
-
-    # If blank, try to lookup from Item ID using ID to SKU
-    if not sku or sku == '-' or sku == '--':
-        item_id = row['Item ID'] if 'Item ID' in row else ''
-        sku = lookup_sku_from_id(item_id, id_to_sku)
-
-    # If still blank, try to lookup from Product Title in Master SKU
-    if not sku or sku == '-' or sku == '--':
-        title = str(row.get('Title', '')).strip()
-        if title:
-            # First try exact match
-            exact_match = master_sku[master_sku['PRODUCT NAME'].astype(str).str.lower() == title.lower()]
-            if not exact_match.empty:
-                sku = str(exact_match.iloc[0].get('SKU', '')).strip().upper()
-            else:
-                # Try matching multiple words from title for better relevance
-                words = title.split()[:3]  # Use first 3 words
-                for num_words in range(len(words), 0, -1):
-                    search_phrase = ' '.join(words[:num_words])
-                    title_matches = master_sku[master_sku['PRODUCT NAME'].astype(str).str.contains(
-                        search_phrase, case=False, na=False, regex=False)]
-                    if not title_matches.empty:
-                        # Pick the match with the longest product name (likely more specific)
-                        title_matches_len = title_matches['PRODUCT NAME'].str.len()
-                        best_idx = title_matches_len.idxmax()
-                        sku = str(master_sku.loc[best_idx, 'SKU']).strip().upper()
-                        break
-
-    vendor = normalize_vendor(row.get('Brand', ''))
-
-    # Track missing SKUs (but include in main sheet)
-    if not sku or sku == '-' or sku == '--':
-        title = str(row.get('Title', '')).strip()
-        google_missing_skus.append({'Vendor': vendor, 'Product Name': title, 'Source': 'Google'})
-        sku = ""  # Set to empty string for upload sheet
-
-    # Get category from Master SKU (only if we have a valid SKU)
-    category = lookup_category_from_sku(sku, master_sku) if sku else ""
-
-    google_list.append({
-        'Month': month,
-        'Platform': 'Google',
-        'Product Category': category,
-        'SKU': sku,
-        'Title': str(row['Title']).strip(),
-        'Vendor': vendor,
-        'Price': f"${clean_currency(row['Price']):,.2f}" if clean_currency(row['Price']) > 0 else "",
-        'Ad Spend': f"${clean_currency(row['Cost']):.2f}",
-        'Impressions': f"{clean_number(row['Impr.']):,}" if clean_number(row['Impr.']) > 0 else "",
-        'Clicks': f"{clean_number(row['Clicks']):,}" if clean_number(row['Clicks']) > 0 else "",
-        'CTR': clean_percent(row['CTR']),
-        'Avg. CPC': f"${clean_currency(row['Avg. CPC']):.2f}" if clean_currency(row['Avg. CPC']) > 0 else "",
-        'Conversions': f"{float(row['Conversions']):.2f}" if float(row['Conversions']) > 0 else "",
-        'Revenue': f"${clean_currency(row['Conv. value']):.2f}" if clean_currency(row['Conv. value']) > 0 else "",
-        'Impression share': clean_percent(row['Search impr. share']) if str(row['Search impr. share']).strip() != '--' else "",
-        'Impression share lost to rank': clean_percent(row['Search lost IS (rank)']) if str(row['Search lost IS (rank)']).strip() != '--' else "",
-        'Absolute top impression share': clean_percent(row['Search abs. top IS']) if str(row['Search abs. top IS']).strip() != '--' else ""
-    })
 
-google_processed = pd.DataFrame(google_list)
-print(f"   Processed {len(google_processed)} Google records")
-print(f"   Missing SKUs: {len(google_missing_skus)}")
+def process_bing(bing_raw, sku_index, month):
+    """Build Bing upload rows; returns (processed_df, missing_skus)"""
+    print("\n3. PROCESSING BING ADS")
 
-# ============================================================================
-# 6. COMBINE DATA
-# ============================================================================
-print("\n5. COMBINING DATA")
-combined = pd.concat([bing_processed, google_processed], ignore_index=True)
-print(f"   Combined total: {len(combined)} products")
+    bing_list = []
+    bing_missing_skus = []
+    metric_rows = upload_metrics(bing_raw, BING_METRIC_COLUMNS)
 
-# ============================================================================
-# 7. IDENTIFY MISSING CATEGORIES
-# ============================================================================
-print("\n6. IDENTIFYING MISSING PRODUCT CATEGORIES")
+    for i, (idx, row) in enumerate(bing_raw.iterrows()):
+        # Get SKU
+        sku = str(row['Custom label 1 (Product)']).strip().upper() if pd.notna(row['Custom label 1 (Product)']) and str(row['Custom label 1 (Product)']).strip() else ""
 
-# Filter to only main vendors and blank/missing categories
-missing_categories = combined[
-    (combined['Vendor'].isin(list(main_vendors.values()))) &
-    ((combined['Product Category'].isna()) |
-     (combined['Product Category'] == '') |
-     (combined['Product Category'].astype(str).str.strip().str.upper() == 'BLANK'))
-].copy()
-print(f"   Products with missing categories (main vendors only): {len(missing_categories)}")
+        # Fallback to Merchant product ID if blank
+        if not sku or sku == '-' or sku == '--':
+            sku = str(row['Merchant product ID']).strip().upper() if pd.notna(row['Merchant product ID']) else ""
 
-# ============================================================================
-# 8. COMBINE MISSING SKUs
-# ============================================================================
-print("\n7. COMPILING MISSING SKUs")
-all_missing_skus = pd.DataFrame(bing_missing_skus + google_missing_skus)
-if len(all_missing_skus) > 0:
-    print(f"   Total missing SKUs: {len(all_missing_skus)}")
-else:
-    print(f"   No missing SKUs found!")
+        vendor = normalize_vendor(row.get('Brand', ''))
+
+        # Track missing SKUs (but include in main sheet)
+        if not sku or sku == '-' or sku == '--':
+            title = str(row.get('Title', '')).strip()
+            bing_missing_skus.append({'Vendor': vendor, 'Product Name': title, 'Source': 'Bing'})
+            sku = ""  # Set to empty string for upload sheet
+
+        # Get category from Master SKU (only if we have a valid SKU)
+        category = lookup_category_from_sku(sku, sku_index) if sku else ""
+
+        bing_list.append({
+            'Month': month,
+            'Platform': 'Bing',
+            'Product Category': category,
+            'SKU': sku,
+            'Title': str(row['Title']).strip(),
+            'Vendor': vendor,
+            **metric_rows[i],
+        })
+
+    bing_processed = pd.DataFrame(bing_list)
+    print(f"   Processed {len(bing_processed)} Bing records")
+    print(f"   Missing SKUs: {len(bing_missing_skus)}")
+    return bing_processed, bing_missing_skus
 
 # ============================================================================
-# 9. EXPORT UPLOAD SHEET
+# 3. PROCESS GOOGLE ADS
 # ============================================================================
-print("\n8. EXPORTING FILES")
-
-# Main upload sheet
-output_file = os.path.join(output_dir, f"{month} Product Spend Upload.csv")
-combined.to_csv(output_file, index=False, encoding='utf-8')
-print(f"   Exported: {output_file} ({len(combined)} rows)")
-
-# Missing categories sheet
-missing_cat_file = os.path.join(output_dir, f"{month} Missing Product Categories.csv")
-missing_categories.to_csv(missing_cat_file, index=False, encoding='utf-8')
-print(f"   Exported: {missing_cat_file} ({len(missing_categories)} rows)")
-
-# Missing SKUs sheet
-if len(all_missing_skus) > 0:
-    missing_sku_file = os.path.join(output_dir, f"{month} Missing SKUs.csv")
-    all_missing_skus.to_csv(missing_sku_file, index=False, encoding='utf-8')
-    print(f"   Exported: {missing_sku_file} ({len(all_missing_skus)} rows)")
-else:
-    print(f"   No missing SKUs to export")
+
+def process_google(google_raw, id_to_sku, master_sku, sku_index, month):
+    """Build Google upload rows; returns (processed_df, missing_skus)"""
+    print("\n4. PROCESSING GOOGLE ADS")
+
+    google_list = []
+    google_missing_skus = []
+    metric_rows = upload_metrics(google_raw, GOOGLE_METRIC_COLUMNS)
+
+    for i, (idx, row) in enumerate(google_raw.iterrows()):
+        # Get SKU from Custom label 1
+        sku = str(row['Custom label 1']).strip().upper() if pd.notna(row['Custom label 1']) and str(row['Custom label 1']).strip() else ""
+
+        # If blank, try to lookup from Item ID using ID to SKU
+        if not sku or sku == '-' or sku == '--':
+            item_id = row['Item ID'] if 'Item ID' in row else ''
+            sku = lookup_sku_from_id(item_id, id_to_sku)
+
+        # If still blank, try to lookup from Product Title in Master SKU
+        if not sku or sku == '-' or sku == '--':
+            title = str(row.get('Title', '')).strip()
+            if title:
+                # First try exact match
+                sku = sku_index.sku_for_title(title)
+                if not sku:
+                    # Try matching multiple words from title for better relevance
+                    words = title.split()[:3]  # Use first 3 words
+                    for num_words in range(len(words), 0, -1):
+                        search_phrase = ' '.join(words[:num_words])
+                        title_matches = master_sku[master_sku['PRODUCT NAME'].astype(str).str.contains(
+                            search_phrase, case=False, na=False, regex=False)]
+                        if not title_matches.empty:
+                            # Pick the match with the longest product name (likely more specific)
+                            title_matches_len = title_matches['PRODUCT NAME'].str.len()
+                            best_idx = title_matches_len.idxmax()
+                            sku = str(master_sku.loc[best_idx, 'SKU']).strip().upper()
+                            break
+
+        vendor = normalize_vendor(row.get('Brand', ''))
+
+        # Track missing SKUs (but include in main sheet)
+        if not sku or sku == '-' or sku == '--':
+            title = str(row.get('Title', '')).strip()
+            google_missing_skus.append({'Vendor': vendor, 'Product Name': title, 'Source': 'Google'})
+            sku = ""  # Set to empty string for upload sheet
+
+        # Get category from Master SKU (only if we have a valid SKU)
+        category = lookup_category_from_sku(sku, sku_index) if sku else ""
+
+        google_list.append({
+            'Month': month,
+            'Platform': 'Google',
+            'Product Category': category,
+            'SKU': sku,
+            'Title': str(row['Title']).strip(),
+            'Vendor': vendor,
+            **metric_rows[i],
+        })
+
+    google_processed = pd.DataFrame(google_list)
+    print(f"   Processed {len(google_processed)} Google records")
+    print(f"   Missing SKUs: {len(google_missing_skus)}")
+    return google_processed, google_missing_skus
 
 # ============================================================================
-# 10. SUMMARY
+# 4. BUILD UPLOAD SHEET
 # ============================================================================
-print("\n" + "=" * 120)
-print("PROCESSING COMPLETE")
-print("=" * 120)
 
-print(f"\nUPLOAD SHEET SUMMARY:")
-print(f"  Total products: {len(combined):,}")
-print(f"  Bing products: {len(bing_processed):,}")
-print(f"  Google products: {len(google_processed):,}")
+def build_upload_sheet(config, inputs):
+    """
+    Combine both platforms and collect data issues.
+
+    Returns a dict with the upload sheet ('combined'), 'missing_categories',
+    'missing_skus' and the per-platform frames, so report stages running in
+    the same process can use them without re-reading the CSVs.
+    """
+    month = config['month']
+
+    print("\n2. SETTING UP VENDOR CONFIGURATION")
+    print(f"   Configured {len(main_vendors)} main vendors")
+
+    bing_processed, bing_missing_skus = process_bing(inputs['bing_raw'], inputs['sku_index'], month)
+    google_processed, google_missing_skus = process_google(
+        inputs['google_raw'], inputs['id_to_sku'], inputs['master_sku'], inputs['sku_index'], month)
+
+    print("\n5. COMBINING DATA")
+    combined = pd.concat([bing_processed, google_processed], ignore_index=True)
+    print(f"   Combined total: {len(combined)} products")
+
+    print("\n6. IDENTIFYING MISSING PRODUCT CATEGORIES")
+
+    # Filter to only main vendors and blank/missing categories
+    missing_categories = combined[
+        (combined['Vendor'].isin(list(main_vendors.values()))) &
+        ((combined['Product Category'].isna()) |
+         (combined['Product Category'] == '') |
+         (combined['Product Category'].astype(str).str.strip().str.upper() == 'BLANK'))
+    ].copy()
+    print(f"   Products with missing categories (main vendors only): {len(missing_categories)}")
+
+    print("\n7. COMPILING MISSING SKUs")
+    all_missing_skus = pd.DataFrame(bing_missing_skus + google_missing_skus)
+    if len(all_missing_skus) > 0:
+        print(f"   Total missing SKUs: {len(all_missing_skus)}")
+    else:
+        print(f"   No missing SKUs found!")
+
+    return {
+        'combined': combined,
+        'missing_categories': missing_categories,
+        'missing_skus': all_missing_skus,
+        'bing_processed': bing_processed,
+        'google_processed': google_processed,
+    }
 
-bing_spend = sum([float(x.replace('$','')) for x in bing_processed['Ad Spend']])
-google_spend = sum([float(x.replace('$','')) for x in google_processed['Ad Spend']])
-total_spend = bing_spend + google_spend
+# ============================================================================
+# 5. EXPORT FILES
+# ============================================================================
 
-print(f"\nAD SPEND:")
-print(f"  Bing: ${bing_spend:,.2f}")
-print(f"  Google: ${google_spend:,.2f}")
-print(f"  Total: ${total_spend:,.2f}")
+def export_upload_files(config, result):
+    """Write the upload, missing categories and missing SKUs CSVs"""
+    month = config['month']
+    output_dir = get_output_dir(config)
+    combined = result['combined']
+    missing_categories = result['missing_categories']
+    all_missing_skus = result['missing_skus']
+
+    print("\n8. EXPORTING FILES")
+
+    # Main upload sheet
+    output_file = os.path.join(output_dir, f"{month} Product Spend Upload.csv")
+    combined.to_csv(output_file, index=False, encoding='utf-8')
+    print(f"   Exported: {output_file} ({len(combined)} rows)")
+
+    # Missing categories sheet
+    missing_cat_file = os.path.join(output_dir, f"{month} Missing Product Categories.csv")
+    missing_categories.to_csv(missing_cat_file, index=False, encoding='utf-8')
+    print(f"   Exported: {missing_cat_file} ({len(missing_categories)} rows)")
+
+    # Missing SKUs sheet
+    if len(all_missing_skus) > 0:
+        missing_sku_file = os.path.join(output_dir, f"{month} Missing SKUs.csv")
+        all_missing_skus.to_csv(missing_sku_file, index=False, encoding='utf-8')
+        print(f"   Exported: {missing_sku_file} ({len(all_missing_skus)} rows)")
+    else:
+        print(f"   No missing SKUs to export")
+
+def read_upload_files(config):
+    """
+    Read the exported upload and missing categories CSVs back as the report
+    stages expect them (numeric columns parsed, blanks as NaN).
+    Returns (upload_df, missing_categories_df).
+    """
+    month = config['month']
+    output_dir = get_output_dir(config)
+    upload = pd.read_csv(os.path.join(output_dir, f"{month} Product Spend Upload.csv"))
+    missing_cats = pd.read_csv(os.path.join(output_dir, f"{month} Missing Product Categories.csv"))
+    return upload, missing_cats
 
-print(f"\nDATA ISSUES TO RESOLVE:")
-print(f"  Missing SKUs: {len(all_missing_skus)}")
-print(f"  Missing categories: {len(missing_categories)}")
+# ============================================================================
+# 6. SUMMARY
+# ============================================================================
 
-print("\n" + "=" * 120)
+def print_summary(result):
+    combined = result['combined']
+    bing_processed = result['bing_processed']
+    google_processed = result['google_processed']
+
+    print("\n" + "=" * 120)
+    print("PROCESSING COMPLETE")
+    print("=" * 120)
+
+    print(f"\nUPLOAD SHEET SUMMARY:")
+    print(f"  Total products: {len(combined):,}")
+    print(f"  Bing products: {len(bing_processed):,}")
+    print(f"  Google products: {len(google_processed):,}")
+
+    bing_spend = sum([float(x.replace('$','')) for x in bing_processed['Ad Spend']])
+    google_spend = sum([float(x.replace('$','')) for x in google_processed['Ad Spend']])
+    total_spend = bing_spend + google_spend
+
+    print(f"\nAD SPEND:")
+    print(f"  Bing: ${bing_spend:,.2f}")
+    print(f"  Google: ${google_spend:,.2f}")
+    print(f"  Total: ${total_spend:,.2f}")
+
+    print(f"\nDATA ISSUES TO RESOLVE:")
+    print(f"  Missing SKUs: {len(result['missing_skus'])}")
+    print(f"  Missing categories: {len(result['missing_categories'])}")
+
+    print("\n" + "=" * 120)
+
+
+def run(config, reference=None, update_history=True):
+    """
+    Full upload stage: load, process, export. Returns the in-memory result.
+    `reference` is the SKU lookup data from load_reference(), if already loaded.
+    With update_history=False the history store is left to the caller
+    (master_workflow.py updates it in its own, never cached, stage).
+    """
+    print("=" * 120)
+    print(f"AD SPEND PROCESSOR - {config['month'].upper()} UPLOAD SHEET WITH SKU LOOKUP")
+    print("=" * 120)
+
+    inputs = load_inputs(config, reference)
+    result = build_upload_sheet(config, inputs)
+    export_upload_files(config, result)
+    if update_history:
+        print("\n9. UPDATING HISTORY STORE")
+        append_upload_to_history(config, result['combined'])
+    print_summary(result)
+    return result
+
+
+if __name__ == "__main__":
+    run(load_config())
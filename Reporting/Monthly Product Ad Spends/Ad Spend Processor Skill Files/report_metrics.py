@@ -0,0 +1,112 @@
+"""
+Report metrics shared by the Summary Report sheet and the PDF report.
+
+Both reports show the same five Top 20 tables (the PDF adds overall totals).
+compute_report_metrics() builds them once from the upload sheet;
+master_workflow.py runs it as its own stage and hands the result to both
+renderers, so the two reports can never disagree.
+
+Rates use safe_divide(): one vectorized division that gives 0 wherever the
+denominator is not positive (no spend -> ROAS 0, no clicks -> CPC 0).
+"""
+
+
+import numpy as np
+import pandas as pd
+
+from s4.parsing import parse_money, parse_number
+
+TOP_N = 20
+PRODUCT_COLUMNS = ['SKU', 'Title', 'Vendor', 'Ad Spend Numeric', 'Revenue Numeric', 'ROAS']
+
+
+def safe_divide(numerator, denominator):
+    """numerator / denominator, 0 where the denominator is 0 or negative"""
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    result = np.zeros(np.broadcast(numerator, denominator).shape)
+    np.divide(numerator, denominator, out=result, where=denominator > 0)
+    return result
+
+
+def spend_by(metrics, by):
+    """Spend, revenue and ROAS per `by`, top TOP_N by spend"""
+    totals = metrics.groupby(by).agg({
+        'Ad Spend Numeric': 'sum',
+        'Revenue Numeric': 'sum'
+    }).reset_index()
+    totals['ROAS'] = safe_divide(totals['Revenue Numeric'], totals['Ad Spend Numeric']).round(2)
+    return totals.sort_values('Ad Spend Numeric', ascending=False).head(TOP_N).reset_index(drop=True)
+
+
+def compute_report_metrics(upload_df):
+    """
+    Top 20 tables and overall totals for the Summary Report and the PDF.
+
+    Returns:
+        Dict with DataFrames top_20_spend, top_20_revenue, top_20_cpc,
+        vendor_spend, category_vendor, and 'totals' (total_spend,
+        total_revenue, overall_roas, total_products, total_vendors)
+    """
+    # Only the columns the reports use; the shared upload frame is not modified
+    metrics = pd.DataFrame({
+        'SKU': upload_df['SKU'],
+        'Title': upload_df['Title'],
+        'Vendor': upload_df['Vendor'],
+        'Product Category': upload_df['Product Category'],
+        'Ad Spend Numeric': parse_money(upload_df['Ad Spend']),
+        'Revenue Numeric': parse_money(upload_df['Revenue']),
+        'Clicks Numeric': parse_number(upload_df['Clicks'], missing=0.0),
+    })
+    metrics['ROAS'] = safe_divide(metrics['Revenue Numeric'], metrics['Ad Spend Numeric'])
+    metrics['CPC'] = safe_divide(metrics['Ad Spend Numeric'], metrics['Clicks Numeric'])
+
+    print("Report Data Preparation")
+    print("=" * 80)
+
+    # 1. Top 20 products by ad spend
+    print("1. Top 20 Products by Ad Spend")
+    top_20_spend = metrics.nlargest(TOP_N, 'Ad Spend Numeric')[PRODUCT_COLUMNS].reset_index(drop=True)
+    top_20_spend['ROAS'] = top_20_spend['ROAS'].round(2)
+    print(f"   Found {len(top_20_spend)} products")
+
+    # 2. Top 20 products by revenue
+    print("2. Top 20 Products by Revenue")
+    top_20_revenue = metrics.nlargest(TOP_N, 'Revenue Numeric')[PRODUCT_COLUMNS].reset_index(drop=True)
+    top_20_revenue['ROAS'] = top_20_revenue['ROAS'].round(2)
+    print(f"   Found {len(top_20_revenue)} products")
+
+    # 3. Top 20 CPC costs by SKU
+    print("3. Top 20 Highest CPC by SKU")
+    top_20_cpc = metrics[metrics['CPC'] > 0].nlargest(TOP_N, 'CPC')[['SKU', 'Title', 'Vendor', 'CPC', 'Clicks Numeric']]
+    top_20_cpc = top_20_cpc.rename(columns={'Clicks Numeric': 'Clicks'}).reset_index(drop=True)
+    print(f"   Found {len(top_20_cpc)} products")
+
+    # 4. Top 20 vendors by ad spend
+    print("4. Top 20 Vendors by Ad Spend")
+    vendor_spend = spend_by(metrics, 'Vendor')
+    print(f"   Found {len(vendor_spend)} vendors")
+
+    # 5. Top 20 product categories with vendor, ad spend, revenue, ROAS
+    print("5. Top 20 Product Categories with Vendor Details")
+    category_vendor = spend_by(metrics, ['Product Category', 'Vendor'])
+    print(f"   Found {len(category_vendor)} category-vendor combinations")
+
+    total_spend = metrics['Ad Spend Numeric'].sum()
+    total_revenue = metrics['Revenue Numeric'].sum()
+    totals = {
+        'total_spend': total_spend,
+        'total_revenue': total_revenue,
+        'overall_roas': float(safe_divide(total_revenue, total_spend)),
+        'total_products': len(metrics),
+        'total_vendors': metrics['Vendor'].nunique(),
+    }
+
+    return {
+        'top_20_spend': top_20_spend,
+        'top_20_revenue': top_20_revenue,
+        'top_20_cpc': top_20_cpc,
+        'vendor_spend': vendor_spend,
+        'category_vendor': category_vendor,
+        'totals': totals,
+    }
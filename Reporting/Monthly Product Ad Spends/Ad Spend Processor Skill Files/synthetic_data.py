@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Synthetic month of ad spend data at any scale, for benchmarks.
+
+Writes the four files the upload stage reads, in the same formats as the
+real ones, plus a config.json pointing at them:
+
+    <out_dir>/
+        exports/Product report.csv      Google Ads: UTF-16, tab-separated, 2 title rows
+        exports/Bing export.csv         Bing Ads: 6 report rows, quoted, "Total" row and footer
+        SKU Documents/Google Ads - Product Spend - ID to SKU (1).csv
+        SKU Documents/Google Ads - Product Spend - MASTER SKU (1).csv
+        config.json                     output, history and cache folders inside out_dir
+
+Scale 1 is about one real month (October 2025): 440 Google rows, 400 Bing
+rows and a 15,000 SKU catalog. Scale 10 multiplies all of them by ten.
+
+The mix of rows follows the October exports so every lookup path is used:
+45% of Google rows have no custom label (and no SKU in the ID-to-SKU file)
+and have to be matched by title - most exactly, some only by their first
+words, a few not at all (missing SKUs). About 3% of catalog SKUs have no
+category, so the Missing Categories sheet and the categorizer get work.
+
+The same scale and seed always give the same files.
+
+Usage:
+    python synthetic_data.py <out_dir> [scale] [seed]
+"""
+
+import calendar
+import csv
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+import workflow_config  # noqa: F401  puts the repository root (s4 package) on sys.path
+from s4.master_sku import MASTER_SKU_FILE
+
+ID_TO_SKU_FILE = "Google Ads - Product Spend - ID to SKU (1).csv"
+GOOGLE_FILE = "Product report.csv"
+BING_FILE = "Bing export.csv"
+
+# Rows at scale 1 (one month as of October 2025)
+BASE_SIZES = {'google_rows': 440, 'bing_rows': 400, 'catalog_skus': 15_000}
+
+# Share of Google rows without a custom label, and how their titles match MASTER SKU
+UNLABELED_SHARE = 0.45
+TITLE_MATCH_SHARES = {'exact': 0.7, 'first_words': 0.2, 'none': 0.1}
+BLANK_CATEGORY_SHARE = 0.03
+DUPLICATE_SKU_SHARE = 0.01
+
+# Product families: (product noun, category, overall category, vendor)
+FAMILIES = [
+    ('Swivel Caster', 'General Casters', 'Casters', 'Durable Superior Casters'),
+    ('Rigid Caster', 'General Casters', 'Casters', 'Caster Depot'),
+    ('Forklift Wheel Stop', 'Wheel Stops', 'Dock Equipment', 'Handle-It'),
+    ('Grease Pump', 'Pumps', 'Lincoln', 'Lincoln Industrial'),
+    ('Divider Valve', 'Valves', 'Lincoln', 'Lincoln Industrial'),
+    ('Electric Forklift', 'Forklifts', 'Material Handling', 'Ekko Lifts'),
+    ('Pallet Jack', 'Pallet Jacks', 'Material Handling', 'Noblelift'),
+    ('Steel Bollard', 'Bollards', 'Safety', 'S4 Bollards'),
+    ('Drum Truck', 'Hand Trucks', 'Material Handling', 'Dutro'),
+    ('Stocking Cart', 'Carts', 'Material Handling', 'Dutro'),
+    ('Rack Safety Net', 'Rack Safety', 'Safety', "Adrian's Safety"),
+    ('Cantilever Rack', 'Cantilever', 'Storage', 'Meco-Omaha'),
+    ('Work Platform', 'Platforms', 'Material Handling', 'Little Giant'),
+    ('Slotted Dolly', 'Dollies', 'Material Handling', 'Merrick Machine'),
+    ('Storage Cabinet', 'Cabinets', 'Storage', 'Valley Craft'),
+    ('Dock Plate', 'Dock Plates', 'Dock Equipment', 'Bluff Manufacturing'),
+    ('Convertible Hand Truck', 'Hand Trucks', 'Material Handling', 'B&P Manufacturing'),
+    ('Post Protector', 'Guards', 'Safety', 'Sentry Protection'),
+    ('Decorative Bollard Cover', 'Bollard Covers', 'Safety', 'Reliance Foundry'),
+    ('Scissor Lift Table', 'Lifts', 'Material Handling', 'Apollo Forklift'),
+    ('Spill Containment Pallet', 'Spill Control', 'Safety', 'Vestil'),
+    ('Utility Cart', 'Carts', 'Material Handling', 'Luxor'),
+]
+ADJECTIVES = ['Heavy Duty', 'Standard', 'Stainless Steel', 'Galvanized', 'Ergonomic',
+              'Industrial', 'Compact', 'Low Profile']
+CAPACITIES = [250, 350, 500, 800, 1000, 1200, 2000, 3000, 4000, 5000]
+
+MASTER_COLUMNS = ['SKU', 'PRODUCT NAME', 'VENDOR', 'COST', 'PRICE', 'PROFIT', 'MARGIN',
+                  'PRODUCT CATEGORY', 'OVERALL PRODUCT CATEGORY', 'SKU - 2']
+GOOGLE_COLUMNS = ['Image', 'Title', 'Merchant ID', 'Item ID', 'Custom label 1', 'Brand', 'Price',
+                  'Currency code', 'Cost', 'Impr.', 'Clicks', 'CTR', 'Avg. CPC', 'Conversions',
+                  'Conv. value', 'Search impr. share', 'Search lost IS (rank)', 'Search abs. top IS']
+BING_COLUMNS = ['Merchant product ID', 'Custom label 1 (Product)', 'Title', 'Brand', 'Price', 'Spend',
+                'Impressions', 'Clicks', 'CTR', 'Avg. CPC', 'Conversions', 'Revenue', 'Impression share',
+                'Impression share lost to rank', 'Absolute top impression share']
+
+
+def scaled_sizes(scale):
+    return {name: max(1, int(round(rows * scale))) for name, rows in BASE_SIZES.items()}
+
+
+def money_cells(amounts):
+    """MASTER SKU money as typed in the sheet, e.g. '$1,925.46 '"""
+    return [f"${amount:,.2f} " for amount in amounts]
+
+
+def percent_cells(shares, blank_share, rng):
+    """Export percentages ('32.39%'), with ' --' where the platform has no value"""
+    blank = rng.random(len(shares)) < blank_share
+    return [' --' if is_blank else f"{share:.2%}" for share, is_blank in zip(shares, blank)]
+
+
+# ============================================================================
+# CATALOG (MASTER SKU)
+# ============================================================================
+
+def build_catalog(rng, skus):
+    """MASTER SKU rows: unique SKUs (plus a few duplicates), names, vendors, prices"""
+    family = rng.integers(len(FAMILIES), size=skus)
+    adjective = rng.integers(len(ADJECTIVES), size=skus)
+    capacity = rng.integers(len(CAPACITIES), size=skus)
+    cost = np.round(rng.gamma(2.0, 150.0, skus) + 5, 2)
+    price = np.round(cost * rng.uniform(1.2, 2.5, skus), 2)
+
+    sku = [f"{FAMILIES[f][0][:2].upper()}{FAMILIES[f][3][:2].upper()}-{i:07d}" for i, f in enumerate(family)]
+    name = [f"{ADJECTIVES[a]} {FAMILIES[f][0]} - {CAPACITIES[c]} lbs. Capacity - Model {i:07d}"
+            for i, (f, a, c) in enumerate(zip(family, adjective, capacity))]
+    # The real sheet repeats about 1% of its SKUs on a second row
+    for i in np.flatnonzero(rng.random(skus) < DUPLICATE_SKU_SHARE):
+        if i > 0:
+            sku[i] = sku[i - 1]
+    category = [FAMILIES[f][1] for f in family]
+    for i in np.flatnonzero(rng.random(skus) < BLANK_CATEGORY_SHARE):
+        category[i] = ''
+
+    catalog = pd.DataFrame({
+        'SKU': sku,
+        'PRODUCT NAME': name,
+        'VENDOR': [FAMILIES[f][3] for f in family],
+        'COST': money_cells(cost),
+        'PRICE': money_cells(price),
+        'PROFIT': money_cells(price - cost),
+        'MARGIN': [f"{margin:.2%}" for margin in (price - cost) / price],
+        'PRODUCT CATEGORY': category,
+        'OVERALL PRODUCT CATEGORY': [FAMILIES[f][2] for f in family],
+        'SKU - 2': sku,
+    }, columns=MASTER_COLUMNS)
+    return catalog, price
+
+
+def sample_products(rng, catalog_size, rows):
+    """Catalog positions of the advertised products (distinct while the catalog allows)"""
+    return rng.choice(catalog_size, size=rows, replace=rows > catalog_size)
+
+
+def ad_metrics(rng, rows, prices):
+    """Spend, impressions, clicks and conversions for `rows` advertised products"""
+    spend = np.round(rng.gamma(0.6, 8.0, rows), 2)
+    impressions = rng.integers(5, 8000, rows)
+    clicks = np.minimum(rng.poisson(spend / 1.5), impressions)
+    conversions = rng.binomial(clicks, 0.02)
+    return {
+        'spend': spend,
+        'impressions': impressions,
+        'clicks': clicks,
+        'ctr': clicks / impressions,
+        'cpc': np.divide(spend, clicks, out=np.zeros(rows), where=clicks > 0),
+        'conversions': conversions,
+        'revenue': conversions * prices,
+        'share': rng.uniform(0.1, 0.9, rows),
+    }
+
+
+# ============================================================================
+# GOOGLE ADS EXPORT + ID TO SKU
+# ============================================================================
+
+def google_rows(rng, catalog, prices, rows):
+    """Google export rows and the matching ID-to-SKU rows"""
+    products = sample_products(rng, len(catalog), rows)
+    skus = catalog['SKU'].to_numpy()[products]
+    names = catalog['PRODUCT NAME'].to_numpy()[products]
+    vendors = catalog['VENDOR'].to_numpy()[products]
+    prices = prices[products]
+    metrics = ad_metrics(rng, rows, prices)
+
+    item_ids = rng.choice(10**13, size=rows, replace=False) + 3 * 10**13
+    item_ids = [f"{item_id}/dup" if dup else str(item_id)
+                for item_id, dup in zip(item_ids, rng.random(rows) < 0.5)]
+
+    # Unlabeled rows are matched by title: exactly, by their first words, or not at all
+    unlabeled = rng.random(rows) < UNLABELED_SHARE
+    match = rng.choice(list(TITLE_MATCH_SHARES), size=rows, p=list(TITLE_MATCH_SHARES.values()))
+    titles, labels = [], []
+    for i in range(rows):
+        if not unlabeled[i]:
+            titles.append(names[i])
+            labels.append(skus[i].lower())
+        else:
+            labels.append(' --')
+            if match[i] == 'exact':
+                titles.append(names[i])
+            elif match[i] == 'first_words':
+                titles.append(f"{names[i]} - Special Order")
+            else:
+                titles.append(f"Replacement Part Kit #{i}")
+
+    ctr = metrics['ctr']
+    export = [[
+        f"http://t{i % 4}.gstatic.com/shopping?q=tbn:synthetic{i}",
+        titles[i],
+        '109444240',
+        item_ids[i],
+        labels[i],
+        vendors[i].lower(),
+        f"${prices[i]:,.2f}",
+        'USD',
+        f"{metrics['spend'][i]:.2f}",
+        f"{metrics['impressions'][i]:,}",
+        str(metrics['clicks'][i]),
+        f"{ctr[i]:.2%}",
+        f"{metrics['cpc'][i]:.2f}" if metrics['clicks'][i] else '0',
+        f"{metrics['conversions'][i]:.2f}",
+        f"{metrics['revenue'][i]:.2f}",
+    ] for i in range(rows)]
+    shares = zip(percent_cells(metrics['share'], 0.5, rng),
+                 percent_cells(1 - metrics['share'], 0.5, rng),
+                 ['< 10%' if share < 0.3 else ' --' for share in metrics['share']])
+    for row, share_cells in zip(export, shares):
+        row.extend(share_cells)
+
+    id_to_sku = pd.DataFrame({'id': item_ids, 'custom label 1': labels})
+    return export, id_to_sku
+
+
+def write_google_export(path, rows, month_label):
+    """UTF-16 LE with BOM, tab-separated, 'Product report' and date range on top"""
+    with open(path, 'w', encoding='utf-16-le', newline='') as f:
+        f.write('\ufeff')
+        f.write('Product report\r\n')
+        f.write(f'"{month_label}"\r\n')
+        writer = csv.writer(f, delimiter='\t')
+        writer.writerow(GOOGLE_COLUMNS)
+        writer.writerows(rows)
+
+
+# ============================================================================
+# BING ADS EXPORT
+# ============================================================================
+
+def bing_rows(rng, catalog, prices, rows):
+    """Bing export rows; a few have no custom label and carry the SKU as product ID"""
+    products = sample_products(rng, len(catalog), rows)
+    skus = catalog['SKU'].to_numpy()[products]
+    prices = prices[products]
+    metrics = ad_metrics(rng, rows, prices)
+    item_ids = rng.choice(10**13, size=rows, replace=False) + 4 * 10**13
+    no_label = rng.random(rows) < 0.02
+
+    export = []
+    for i, product in enumerate(products):
+        export.append([
+            skus[i] if no_label[i] else str(item_ids[i]),
+            '' if no_label[i] else skus[i],
+            catalog['PRODUCT NAME'].iat[product],
+            catalog['VENDOR'].iat[product],
+            f"{prices[i]:g}",
+            f"{metrics['spend'][i]:.2f}",
+            f"{metrics['impressions'][i]:,}",
+            str(metrics['clicks'][i]),
+            f"{metrics['ctr'][i]:.2%}",
+            f"{metrics['cpc'][i]:.2f}",
+            f"{metrics['conversions'][i]:.2f}",
+            f"{metrics['revenue'][i]:.2f}",
+            f"{metrics['share'][i]:.2%}",
+            f"{1 - metrics['share'][i]:.2%}",
+            f"{metrics['share'][i] * 20:.2f}",
+        ])
+
+    total_clicks = int(metrics['clicks'].sum())
+    total_impressions = int(metrics['impressions'].sum())
+    total = ['Total', '-', '-', '-', '-', '-', f"{total_impressions:,}", f"{total_clicks:,}",
+             f"{total_clicks / total_impressions:.2%}", '-', f"{metrics['conversions'].sum():.2f}",
+             '-', '-', '-', '-']
+    return export, total
+
+
+def write_bing_export(path, rows, total, report_time):
+    """Quoted UTF-8 CSV: 5 report lines and a blank line, rows, Total row, footer"""
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+        writer.writerow(["Report Name: TG Monthly Bing Ads Product Spend"])
+        writer.writerow([f"Report Time: {report_time}"])
+        writer.writerow(["Time Zone: (GMT-08:00) Pacific Time (US & Canada); Tijuana"])
+        writer.writerow([f"Last Completed Available Day: {report_time.split(',')[1]} 12:20:00 AM (GMT)"])
+        writer.writerow([f"Last Completed Available Hour: {report_time.split(',')[1]} 12:20:00 AM (GMT)"])
+        f.write('\r\n')
+        writer.writerow(BING_COLUMNS)
+        writer.writerows(rows)
+        writer.writerow(total)
+        f.write('\r\n')
+        writer.writerow(["©2025 Microsoft Corporation. All rights reserved. "])
+
+
+# ============================================================================
+# DATASET
+# ============================================================================
+
+def generate_dataset(out_dir, scale=1, seed=0, month='2025-10'):
+    """
+    Write a synthetic month (exports, SKU files, config.json) into out_dir.
+
+    Returns:
+        The config dict (also saved as out_dir/config.json), with the row
+        counts under 'synthetic'
+    """
+    out_dir = os.path.abspath(out_dir)
+    export_dir = os.path.join(out_dir, 'exports')
+    sku_dir = os.path.join(out_dir, 'SKU Documents')
+    os.makedirs(export_dir, exist_ok=True)
+    os.makedirs(sku_dir, exist_ok=True)
+
+    sizes = scaled_sizes(scale)
+    rng = np.random.default_rng(seed)
+    year, month_number = (int(part) for part in month.split('-'))
+    last_day = calendar.monthrange(year, month_number)[1]
+    month_name = calendar.month_name[month_number]
+    month_label = f"{month_name} 1, {year} - {month_name} {last_day}, {year}"
+    report_time = f"{month_number}/1/{year},{month_number}/{last_day}/{year}"
+
+    catalog, prices = build_catalog(rng, sizes['catalog_skus'])
+    catalog.to_csv(os.path.join(sku_dir, MASTER_SKU_FILE), index=False, encoding='utf-8')
+
+    google, id_to_sku = google_rows(rng, catalog, prices, sizes['google_rows'])
+    write_google_export(os.path.join(export_dir, GOOGLE_FILE), google, month_label)
+    id_to_sku.to_csv(os.path.join(sku_dir, ID_TO_SKU_FILE), index=False, encoding='utf-8')
+
+    bing, total = bing_rows(rng, catalog, prices, sizes['bing_rows'])
+    write_bing_export(os.path.join(export_dir, BING_FILE), bing, total, report_time)
+
+    config = {
+        'month': month,
+        'input_files': {'google': GOOGLE_FILE, 'bing': BING_FILE},
+        'paths': {
+            'sku_documents': sku_dir,
+            'input_dir': export_dir,
+            'output_dir': os.path.join(out_dir, '{month}'),
+            'history_dir': os.path.join(out_dir, 'Ad Spend History'),
+            'chart_cache': os.path.join(out_dir, '.chart_cache'),
+            'build_cache': os.path.join(out_dir, '.build_cache'),
+        },
+        'synthetic': {'scale': scale, 'seed': seed, **sizes},
+    }
+    os.makedirs(config['paths']['output_dir'].replace('{month}', month), exist_ok=True)
+    with open(os.path.join(out_dir, 'config.json'), 'w') as f:
+        json.dump(config, f, indent=2)
+    return config
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    out_dir = sys.argv[1]
+    scale = float(sys.argv[2]) if len(sys.argv) > 2 else 1
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+
+    config = generate_dataset(out_dir, scale, seed)
+    sizes = config['synthetic']
+    print(f"Synthetic {config['month']} at {scale:g}x in {os.path.abspath(out_dir)}")
+    print(f"  Google rows:  {sizes['google_rows']:,}")
+    print(f"  Bing rows:    {sizes['bing_rows']:,}")
+    print(f"  Catalog SKUs: {sizes['catalog_skus']:,}")
+
+
+if __name__ == "__main__":
+    main()
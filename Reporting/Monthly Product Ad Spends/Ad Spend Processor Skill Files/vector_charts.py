@@ -0,0 +1,127 @@
+"""
+Vector bar charts for the Ad Spend Performance Report PDF.
+
+Draws the same chart specs as chart_rendering.py (see bar_chart_spec) as
+reportlab Drawings. A Drawing is a flowable, so it goes straight into the
+PDF as lines, rectangles and text: no PNG, no matplotlib, no worker
+processes, and it stays sharp at any zoom.
+
+Sizes are in points and match the old PNG charts as placed on the page
+(5.8 x 1.95 inch).
+"""
+
+from reportlab.graphics.charts.barcharts import HorizontalBarChart
+from reportlab.graphics.shapes import Drawing, String
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+# Anything that changes how a chart looks lives here
+VECTOR_CHART_STYLE = {
+    'width': 5.8 * inch,
+    'height': 1.95 * inch,
+    'font': 'Helvetica',
+    'bold_font': 'Helvetica-Bold',
+    'tick_fontsize': 6.7,
+    'label_fontsize': 7,
+    'title_fontsize': 8,
+    'value_fontsize': 5.8,
+    'edgecolor': colors.black,
+    'linewidth': 0.5,
+    'grid_color': colors.HexColor('#D9D9D9'),
+    'grid_dash': (2, 2),
+    'max_label_share': 0.35,   # Longest bar label may take this much of the width
+    'value_room': 36,          # Space right of the longest bar for its value label
+}
+
+
+def value_axis_format(max_value):
+    """Tick label formatter: whole numbers, or cents for small values (CPC)"""
+    if max_value >= 10:
+        return lambda value: f"{value:,.0f}"
+    return lambda value: f"{value:.2f}"
+
+
+def fit_label(label, max_width, font, size):
+    """Shorten a bar label with '...' until it fits in max_width points"""
+    if stringWidth(label, font, size) <= max_width:
+        return label
+    while label and stringWidth(label + '...', font, size) > max_width:
+        label = label[:-1]
+    return label + '...'
+
+
+def bar_chart_drawing(spec, width=None, height=None):
+    """
+    Draw one chart spec as a horizontal bar chart, first item on top.
+
+    Returns:
+        reportlab Drawing, ready to append to the PDF's flowables
+    """
+    style = VECTOR_CHART_STYLE
+    width = width or style['width']
+    height = height or style['height']
+    drawing = Drawing(width, height)
+
+    drawing.add(String(width / 2, height - style['title_fontsize'], spec['title'],
+                       fontName=style['bold_font'], fontSize=style['title_fontsize'],
+                       textAnchor='middle'))
+    drawing.add(String(width / 2, 2, spec['xlabel'],
+                       fontName=style['bold_font'], fontSize=style['label_fontsize'],
+                       textAnchor='middle'))
+
+    values = spec['values']
+    if not values:
+        drawing.add(String(width / 2, height / 2, "No data",
+                           fontName=style['font'], fontSize=style['tick_fontsize'],
+                           textAnchor='middle'))
+        return drawing
+
+    # Room for the bar labels on the left, as wide as the longest one needs
+    font, size = style['font'], style['tick_fontsize']
+    max_label_width = width * style['max_label_share'] - 6
+    labels = [fit_label(label, max_label_width, font, size) for label in spec['labels']]
+    label_width = max(stringWidth(label, font, size) for label in labels) + 6
+
+    chart = HorizontalBarChart()
+    chart.x = label_width
+    chart.y = style['label_fontsize'] + style['tick_fontsize'] + 8
+    chart.width = width - label_width - style['value_room']
+    chart.height = height - chart.y - style['title_fontsize'] - 8
+
+    # HorizontalBarChart draws the first category at the bottom
+    chart.data = [list(reversed(values))]
+    chart.categoryAxis.categoryNames = list(reversed(labels))
+    chart.categoryAxis.labels.fontName = style['font']
+    chart.categoryAxis.labels.fontSize = style['tick_fontsize']
+    chart.categoryAxis.labels.boxAnchor = 'e'
+    chart.categoryAxis.labels.dx = -3
+    chart.categoryAxis.visibleTicks = 0
+    chart.categoryAxis.strokeWidth = style['linewidth']
+
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.labels.fontName = style['font']
+    chart.valueAxis.labels.fontSize = style['tick_fontsize']
+    chart.valueAxis.labelTextFormat = value_axis_format(max(values))
+    chart.valueAxis.strokeWidth = style['linewidth']
+    chart.valueAxis.visibleGrid = 1
+    chart.valueAxis.gridStrokeColor = style['grid_color']
+    chart.valueAxis.gridStrokeDashArray = style['grid_dash']
+    chart.valueAxis.gridStrokeWidth = style['linewidth']
+
+    chart.barSpacing = 0
+    chart.groupSpacing = 3
+    chart.bars[0].fillColor = colors.HexColor(spec['color'])
+    chart.bars[0].strokeColor = style['edgecolor']
+    chart.bars[0].strokeWidth = style['linewidth']
+
+    # Value printed just past the end of each bar
+    chart.barLabelFormat = spec['value_format'].format
+    chart.barLabels.boxAnchor = 'w'
+    chart.barLabels.dx = 2
+    chart.barLabels.fontName = style['bold_font']
+    chart.barLabels.fontSize = style['value_fontsize']
+
+    drawing.add(chart)
+    return drawing
+
@@ -0,0 +1,123 @@
+"""
+Assembly of the {month} Product Spend Report workbook.
+
+The workbook is written exactly once, in openpyxl's write-only (streaming)
+mode. Each report script contributes sheet builders instead of files:
+
+    builders = report_sheet_builders(upload, missing_cats)      # create_excel_report.py
+    builders.update(summary_sheet_builders(month, summary))      # create_summary_report.py
+    write_workbook(output_file, builders)
+
+A sheet builder is a function that receives an empty write-only worksheet
+and streams its rows into it (column widths and merged ranges first, then
+ws.append() row by row). write_workbook() creates the sheets in
+REPORT_SHEETS order, so no script ever reopens the file to insert a sheet,
+and rows are never held as cell objects for the whole workbook at once.
+
+Tables are styled through named styles: add_named_styles() registers each
+style with the workbook once, and append_table() writes whole rows with one
+named style per column. Setting a named style copies a ready-made style
+entry, where assigning Font, Fill and Border objects cell by cell hashes
+every one of them again.
+"""
+
+import os
+import shutil
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import NamedStyle
+from openpyxl.styles.borders import DEFAULT_BORDER
+from openpyxl.styles.fonts import DEFAULT_FONT
+
+# Sheet order of the Product Spend Report
+REPORT_SHEETS = ["Summary Report", "Product Spend Upload", "Missing Categories", "Vendor Breakdown"]
+
+
+def merge_row(ws, row, first_column, last_column):
+    """Merge a range on a write-only sheet (written with the sheet's tail)"""
+    ws.merged_cells.add(f"{first_column}{row}:{last_column}{row}")
+
+
+def named_style(name, font=None, fill=None, border=None, alignment=None, number_format=None):
+    """NamedStyle whose unset parts match an unstyled cell (Calibri 11, no border, General)"""
+    return NamedStyle(name=name, font=font or DEFAULT_FONT, fill=fill, border=border or DEFAULT_BORDER,
+                      alignment=alignment, number_format=number_format)
+
+
+def add_named_styles(wb, styles):
+    """Register named styles with the workbook; styles it already has are skipped"""
+    for style in styles:
+        if style.name not in wb.named_styles:
+            wb.add_named_style(style)
+
+
+def styled_row(ws, values, styles):
+    """One row of cells, styles[i] being the named style of column i (None: unstyled)"""
+    row = []
+    for value, style in zip(values, styles):
+        cell = WriteOnlyCell(ws, value=value)
+        if style is not None:
+            cell.style = style
+        row.append(cell)
+    return row
+
+
+def append_table(ws, columns, styles):
+    """
+    Append a table given column by column (e.g. DataFrame columns), each
+    column in its own named style.
+
+    Returns:
+        Number of rows appended
+    """
+    rows = 0
+    for values in zip(*columns):
+        ws.append(styled_row(ws, values, styles))
+        rows += 1
+    return rows
+
+
+def write_workbook(output_file, builders, sheet_order=REPORT_SHEETS):
+    """
+    Stream every sheet into a new workbook and save it once.
+
+    Args:
+        output_file: Path of the .xlsx to write
+        builders: {sheet title: build(ws)}; sheets without a builder are left out
+        sheet_order: Order of the sheets in the workbook
+
+    Returns:
+        List of the sheet titles written, in order
+    """
+    unknown = [title for title in builders if title not in sheet_order]
+    if unknown:
+        raise ValueError(f"No position for sheet(s) {unknown}; known sheets: {sheet_order}")
+
+    wb = Workbook(write_only=True)
+    written = []
+    for title in sheet_order:
+        if title in builders:
+            builders[title](wb.create_sheet(title))
+            written.append(title)
+
+    # Save with temporary name first
+    output_dir, name = os.path.split(output_file)
+    temp_file = os.path.join(output_dir, name.replace('.xlsx', '_TEMP.xlsx'))
+    wb.save(temp_file)
+
+    # Try to replace the original file (it may be open in Excel)
+    if os.path.exists(output_file):
+        try:
+            os.remove(output_file)
+        except:
+            try:
+                shutil.move(temp_file, output_file, copy_function=shutil.copy2)
+                temp_file = None
+            except:
+                pass
+
+    if temp_file and os.path.exists(temp_file):
+        shutil.move(temp_file, output_file, copy_function=shutil.copy2)
+
+    return written
@@ -0,0 +1,40 @@
+"""
+Shared configuration helpers for the monthly ad spend scripts.
+Every script can still be run on its own; these helpers just make sure they
+all read config.json and resolve the output folder the same way.
+
+Importing this module also puts the repository root on sys.path, so the
+shared s4 package (parsing, loading, MASTER SKU) imports in every script
+here that imports workflow_config first.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+def load_config(path='config.json'):
+    """Load config.json (month, input file names and folder paths)"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def get_output_dir(config):
+    """Output folder for the configured month, e.g. ../2025-10"""
+    return config['paths']['output_dir'].replace("{month}", config['month'])
+
+
+def get_history_dir(config):
+    """
+    Folder of the multi-month history store (see history_store.py).
+    Defaults to 'Ad Spend History' next to the monthly output folders.
+    """
+    history_dir = config['paths'].get('history_dir')
+    if history_dir:
+        return history_dir
+    return os.path.join(os.path.dirname(get_output_dir(config).rstrip('/\\')), 'Ad Spend History')
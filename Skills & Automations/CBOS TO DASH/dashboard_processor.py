@@ -11,26 +11,31 @@ Author: Claude Code
 
 import pandas as pd
 import numpy as np
-import openpyxl
-from openpyxl.utils import get_column_letter
 from pathlib import Path
 from datetime import datetime
 import logging
 import sys
 from typing import Optional
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('dashboard_processor.log'),
-        logging.StreamHandler()
-    ]
-)
+# Shared parsing helpers (s4 package) live at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from s4.parsing import parse_money
+
 logger = logging.getLogger(__name__)
 
 
+def setup_logging():
+    """Log to the console and dashboard_processor.log (set up by main, not on import)"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('dashboard_processor.log'),
+            logging.StreamHandler()
+        ]
+    )
+
+
 class DashboardProcessor:
     """Process CBOS data to Dashboard format (A-AD columns)"""
 
@@ -128,16 +133,9 @@ class DashboardProcessor:
 
         return s.upper()
 
-    def extract_currency(self, value) -> float:
-        """Extract numeric value from currency string"""
-        if pd.isna(value) or value == '':
-            return 0.0
-
-        try:
-            s = str(value).replace('$', '').replace(',', '').strip()
-            return float(s) if s else 0.0
-        except:
-            return 0.0
+    def extract_currency(self, values: pd.Series) -> pd.Series:
+        """Extract numeric values from a column of currency strings (blanks -> 0.0)"""
+        return parse_money(values, missing=0.0)
 
     def get_month_code(self, date_value) -> str:
         """Generate month code (ZH, ZI, ZJ...) based on date"""
@@ -388,12 +386,13 @@ class DashboardProcessor:
         output_df['J_SalesEach'] = merged.get('Unit Price', 0)
         output_df['K_SalesTotal'] = merged.get('Line Amt', 0)
         # Cost Each as numeric (not currency string)
-        output_df['L_CostEach'] = merged['COST'].apply(lambda x: self.extract_currency(x))
+        cost_each = self.extract_currency(merged['COST'])
+        output_df['L_CostEach'] = cost_each
 
         # Cost Total = Qty × Cost Each
         output_df['M_CostTotal'] = (
             pd.to_numeric(merged.get('Ordered Qty', 0), errors='coerce').fillna(0) *
-            merged['COST'].apply(lambda x: self.extract_currency(x))
+            cost_each
         )
 
         output_df['N_Vendor'] = merged['VENDOR']
@@ -452,7 +451,7 @@ class DashboardProcessor:
         # Profit Total = Sales Total - Cost Total - Discount + Refunds
         cost_total = (
             pd.to_numeric(merged.get('Ordered Qty', 0), errors='coerce').fillna(0) *
-            merged['COST'].apply(lambda x: self.extract_currency(x))
+            cost_each
         )
         output_df['T_ProfitTotal'] = (
             pd.to_numeric(merged.get('Line Amt', 0), errors='coerce').fillna(0) - cost_total - output_df['Q_Discount'] + 0
@@ -606,6 +605,7 @@ class DashboardProcessor:
 
 def main():
     """Main entry point"""
+    setup_logging()
     try:
         processor = DashboardProcessor()
         success = processor.process()
@@ -1,62 +1,43 @@
 #!/usr/bin/env python3
 """
 Run Ad Spend Processor on monthly data files
-Handles Google Ads (CSV) and Bing Ads (Excel) with automatic encoding detection
+Handles Google Ads (CSV) and Bing Ads (Excel) with automatic encoding, separator and header detection
 """
 
-import pandas as pd
 import os
 import sys
 from datetime import datetime
+from pathlib import Path
 from categorize_vendors_final import (
     categorize_blanks_for_review,
     find_blank_categories,
     assign_vendor_from_sku_or_title
 )
+from ad_exports import detect_export_format, read_export, describe_format
+
+# Shared helpers (s4 package) live at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from s4.loading import load_files, print_load_timings
 
 def load_google_ads(filepath):
-    """Load Google Ads CSV with proper encoding handling"""
+    """Load Google Ads CSV (encoding, separator and header row are detected, then parsed once)"""
     print(f"Loading Google Ads: {os.path.basename(filepath)}")
 
-    # Try different encodings and separators
-    configs = [
-        ('utf-16-le', '\t'),
-        ('utf-16', '\t'),
-        ('utf-16', ','),
-        ('utf-8-sig', ','),
-        ('latin1', ','),
-    ]
-
-    for encoding, sep in configs:
-        try:
-            df = pd.read_csv(filepath, encoding=encoding, sep=sep, on_bad_lines='skip')
-            if len(df.columns) > 5:  # Valid load should have many columns
-                print(f"  Loaded with {encoding} encoding and '{sep}' separator")
-                return df
-        except:
-            continue
-
-    raise ValueError(f"Could not load file with any encoding: {filepath}")
+    fmt = detect_export_format(filepath)
+    df = read_export(filepath, fmt)
+    if len(df.columns) <= 5:  # Valid load should have many columns
+        raise ValueError(f"Could not load file ({describe_format(fmt)}): {filepath}")
+
+    print(f"  Google Ads loaded: {describe_format(fmt)}")
+    return df
 
 def load_bing_ads(filepath):
-    """Load Bing Ads Excel file"""
+    """Load Bing Ads export (metadata rows above the header are detected and skipped)"""
     print(f"Loading Bing Ads: {os.path.basename(filepath)}")
 
-    # Read the Excel file, skipping the header mess
-    df = pd.read_excel(filepath, header=None)
-
-    # Find where the actual header row starts
-    # Usually Bing exports have a few rows of metadata before headers
-    header_row = 0
-    for i, row in df.iterrows():
-        row_str = ' '.join(str(x) for x in row.values if pd.notna(x))
-        if 'Impressions' in row_str or 'Report' not in row_str:
-            header_row = i
-            break
-
-    # Reload with proper header
-    df = pd.read_excel(filepath, header=header_row)
-    print(f"  Loaded with header at row {header_row}")
+    fmt = detect_export_format(filepath)
+    df = read_export(filepath, fmt)
+    print(f"  Bing Ads loaded with header at row {fmt['header_row']}")
     return df
 
 def standardize_columns(df_google, df_bing):
@@ -115,9 +96,13 @@ def main():
     print("=" * 80)
     print()
 
-    # Load files
-    df_google = load_google_ads(google_path)
-    df_bing = load_bing_ads(bing_path)
+    # Load both exports concurrently
+    loaded, timings = load_files({
+        'Google Ads': lambda: load_google_ads(google_path),
+        'Bing Ads': lambda: load_bing_ads(bing_path),
+    })
+    df_google, df_bing = loaded['Google Ads'], loaded['Bing Ads']
+    print_load_timings(timings, indent="  ")
 
     print(f"\nGoogle Ads: {len(df_google)} rows, {len(df_google.columns)} columns")
     print(f"Bing Ads: {len(df_bing)} rows, {len(df_bing.columns)} columns")
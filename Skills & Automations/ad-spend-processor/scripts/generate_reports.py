@@ -1,91 +1,110 @@
 #!/usr/bin/env python3
 """
 Generate spend reports by Vendor and Product Category for Source 4 Industries.
+
+The product rows are aggregated once into a small rollup cube at the
+(Vendor, Product Category, Platform, Month) grain; the vendor, category,
+matrix and main vendor reports are all roll-ups of that cube, with CTR and
+CPC recomputed from the summed clicks, impressions and spend.
 """
 
 import pandas as pd
 from typing import Dict, List
 
 
-def generate_vendor_spend_report(df: pd.DataFrame) -> pd.DataFrame:
+# ============================================================================
+# ROLLUP CUBE
+# ============================================================================
+
+# Additive columns; CTR and CPC are always recomputed from these sums
+MEASURES = ['Ad Spend', 'Impressions', 'Clicks', 'Conversions', 'Revenue']
+
+# Finest grain of the cube; every report is a roll-up of some of these
+CUBE_DIMENSIONS = ['Vendor', 'Product Category', 'Platform', 'Month']
+
+
+def build_rollup_cube(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Aggregate spending by Vendor.
-    
+    Aggregate the product rows once to (Vendor, Product Category, Platform, Month).
+
+    The cube has one row per combination that occurs, so its size depends on
+    the number of vendors, categories, platforms and months rather than the
+    number of products. Missing dimension columns are left out; rows with a
+    blank category or vendor are kept (as NaN) so vendor totals stay complete.
+
     Returns:
-        DataFrame with columns: Vendor, Ad Spend, Impressions, Clicks, CTR, Conversions, Revenue
+        DataFrame with the dimension columns plus the summed MEASURES
     """
-    # Group by vendor
-    agg_dict = {
-        'Ad Spend': 'sum',
-        'Impressions': 'sum',
-        'Clicks': 'sum',
-        'Conversions': 'sum',
-        'Revenue': 'sum',
-    }
-    
-    # Only include columns that exist
-    agg_dict = {k: v for k, v in agg_dict.items() if k in df.columns}
-    
-    vendor_report = df.groupby('Vendor', as_index=False).agg(agg_dict)
-    
-    # Calculate metrics
-    if 'Clicks' in vendor_report.columns and 'Impressions' in vendor_report.columns:
-        vendor_report['CTR'] = (vendor_report['Clicks'] / vendor_report['Impressions'] * 100).round(2)
-    
-    if 'Ad Spend' in vendor_report.columns and 'Clicks' in vendor_report.columns:
-        vendor_report['Avg. CPC'] = (vendor_report['Ad Spend'] / vendor_report['Clicks']).round(2)
-    
+    dimensions = [col for col in CUBE_DIMENSIONS if col in df.columns]
+    measures = [col for col in MEASURES if col in df.columns]
+    if not dimensions:
+        return df[measures].sum().to_frame().T
+    return df.groupby(dimensions, as_index=False, dropna=False)[measures].sum()
+
+
+def rollup(cube: pd.DataFrame, by: List[str]) -> pd.DataFrame:
+    """Sum the cube's measures up to the `by` columns (rows with a blank key are dropped)"""
+    measures = [col for col in MEASURES if col in cube.columns]
+    return cube.groupby(by, as_index=False)[measures].sum()
+
+
+def add_rate_metrics(report: pd.DataFrame) -> pd.DataFrame:
+    """CTR (%) and Avg. CPC from summed clicks, impressions and spend"""
+    if 'Clicks' in report.columns and 'Impressions' in report.columns:
+        report['CTR'] = (report['Clicks'] / report['Impressions'] * 100).round(2)
+
+    if 'Ad Spend' in report.columns and 'Clicks' in report.columns:
+        report['Avg. CPC'] = (report['Ad Spend'] / report['Clicks']).round(2)
+    return report
+
+
+def spend_report(cube: pd.DataFrame, by: str) -> pd.DataFrame:
+    """Measures and rate metrics per `by`, sorted by spend"""
+    report = add_rate_metrics(rollup(cube, [by]))
+
     # Sort by spend descending
-    if 'Ad Spend' in vendor_report.columns:
-        vendor_report = vendor_report.sort_values('Ad Spend', ascending=False)
-    
+    if 'Ad Spend' in report.columns:
+        report = report.sort_values('Ad Spend', ascending=False)
+
     # Format currency columns
     for col in ['Ad Spend', 'Revenue', 'Avg. CPC']:
-        if col in vendor_report.columns:
-            vendor_report[col] = vendor_report[col].round(2)
+        if col in report.columns:
+            report[col] = report[col].round(2)
+
+    return report
+
+
+# ============================================================================
+# REPORTS
+# ============================================================================
+
+def generate_vendor_spend_report(df: pd.DataFrame, cube: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Aggregate spending by Vendor.
+    Pass a cube from build_rollup_cube() to skip re-aggregating df.
     
-    return vendor_report
+    Returns:
+        DataFrame with columns: Vendor, Ad Spend, Impressions, Clicks, Conversions, Revenue, CTR, Avg. CPC
+    """
+    if cube is None:
+        cube = build_rollup_cube(df)
+    return spend_report(cube, 'Vendor')
 
 
-def generate_category_spend_report(df: pd.DataFrame) -> pd.DataFrame:
+def generate_category_spend_report(df: pd.DataFrame, cube: pd.DataFrame = None) -> pd.DataFrame:
     """
     Aggregate spending by Product Category.
+    Pass a cube from build_rollup_cube() to skip re-aggregating df.
     """
-    if 'Product Category' not in df.columns:
+    if cube is None:
+        cube = build_rollup_cube(df)
+    if 'Product Category' not in cube.columns:
         return pd.DataFrame()
-    
-    agg_dict = {
-        'Ad Spend': 'sum',
-        'Impressions': 'sum',
-        'Clicks': 'sum',
-        'Conversions': 'sum',
-        'Revenue': 'sum',
-    }
-    
-    agg_dict = {k: v for k, v in agg_dict.items() if k in df.columns}
-    
-    category_report = df.groupby('Product Category', as_index=False).agg(agg_dict)
-    
-    # Calculate metrics
-    if 'Clicks' in category_report.columns and 'Impressions' in category_report.columns:
-        category_report['CTR'] = (category_report['Clicks'] / category_report['Impressions'] * 100).round(2)
-    
-    if 'Ad Spend' in category_report.columns and 'Clicks' in category_report.columns:
-        category_report['Avg. CPC'] = (category_report['Ad Spend'] / category_report['Clicks']).round(2)
-    
-    # Sort by spend
-    if 'Ad Spend' in category_report.columns:
-        category_report = category_report.sort_values('Ad Spend', ascending=False)
-    
-    # Format currency columns
-    for col in ['Ad Spend', 'Revenue', 'Avg. CPC']:
-        if col in category_report.columns:
-            category_report[col] = category_report[col].round(2)
-    
-    return category_report
+    return spend_report(cube, 'Product Category')
 
 
-def generate_vendor_category_matrix(df: pd.DataFrame, main_vendors: List[str] = None) -> pd.DataFrame:
+def generate_vendor_category_matrix(df: pd.DataFrame, main_vendors: List[str] = None,
+                                    cube: pd.DataFrame = None) -> pd.DataFrame:
     """
     Generate a pivot table showing spend by Vendor x Product Category.
     Optionally filter to main vendors only.
@@ -93,15 +112,19 @@ def generate_vendor_category_matrix(df: pd.DataFrame, main_vendors: List[str] =
     Args:
         df: DataFrame with Vendor, Product Category, and Ad Spend columns
         main_vendors: List of main vendors to include (None = all vendors)
+        cube: Optional cube from build_rollup_cube() (used instead of df)
     """
-    if main_vendors:
-        df = df[df['Vendor'].isin(main_vendors)].copy()
-    
-    if 'Product Category' not in df.columns or 'Vendor' not in df.columns:
+    if cube is None:
+        cube = build_rollup_cube(df)
+
+    if 'Product Category' not in cube.columns or 'Vendor' not in cube.columns:
         return pd.DataFrame()
+
+    if main_vendors:
+        cube = cube[cube['Vendor'].isin(main_vendors)]
     
     # Create pivot table
-    matrix = df.pivot_table(
+    matrix = cube.pivot_table(
         index='Vendor',
         columns='Product Category',
         values='Ad Spend',
@@ -121,30 +144,36 @@ def generate_vendor_category_matrix(df: pd.DataFrame, main_vendors: List[str] =
     return matrix
 
 
-def generate_main_vendor_summary(df: pd.DataFrame, main_vendors: List[str]) -> pd.DataFrame:
+def generate_main_vendor_summary(df: pd.DataFrame, main_vendors: List[str],
+                                 cube: pd.DataFrame = None) -> pd.DataFrame:
     """
     Generate summary report for main vendors with category breakdowns.
+    Pass a cube from build_rollup_cube() to skip re-aggregating df.
     """
-    main_df = df[df['Vendor'].isin(main_vendors)].copy()
+    if cube is None:
+        cube = build_rollup_cube(df)
+    main_cube = cube[cube['Vendor'].isin(main_vendors)]
+
+    # Vendor totals and per-vendor category spend, each one grouped pass over the cube
+    totals = rollup(main_cube, ['Vendor']).set_index('Vendor')
+    if 'Product Category' in main_cube.columns:
+        category_spend = main_cube.groupby(['Vendor', 'Product Category'])['Ad Spend'].sum()
+        categories_by_vendor = {vendor: spend.droplevel(0).to_dict()
+                                for vendor, spend in category_spend.groupby(level=0)}
+    else:
+        categories_by_vendor = {}
     
     summary = []
     
     for vendor in main_vendors:
-        vendor_data = main_df[main_df['Vendor'] == vendor]
-        
-        if vendor_data.empty:
+        if vendor not in totals.index:
             continue
         
-        # Calculate vendor totals
-        total_spend = vendor_data['Ad Spend'].sum() if 'Ad Spend' in vendor_data.columns else 0
-        total_clicks = vendor_data['Clicks'].sum() if 'Clicks' in vendor_data.columns else 0
-        total_impressions = vendor_data['Impressions'].sum() if 'Impressions' in vendor_data.columns else 0
-        
-        # Get category breakdown
-        if 'Product Category' in vendor_data.columns:
-            categories = vendor_data.groupby('Product Category')['Ad Spend'].sum().to_dict()
-        else:
-            categories = {}
+        vendor_totals = totals.loc[vendor]
+        total_spend = vendor_totals['Ad Spend'] if 'Ad Spend' in totals.columns else 0
+        total_clicks = vendor_totals['Clicks'] if 'Clicks' in totals.columns else 0
+        total_impressions = vendor_totals['Impressions'] if 'Impressions' in totals.columns else 0
+        categories = categories_by_vendor.get(vendor, {})
         
         summary.append({
             'Vendor': vendor,
@@ -156,12 +185,33 @@ def generate_main_vendor_summary(df: pd.DataFrame, main_vendors: List[str]) -> p
             'Top_Category_Spend': round(max(categories.values(), default=0), 2),
         })
     
-    summary_df = pd.DataFrame(summary)
+    summary_df = pd.DataFrame(summary, columns=['Vendor', 'Total_Spend', 'Total_Clicks', 'Total_Impressions',
+                                                'Category_Count', 'Top_Category', 'Top_Category_Spend'])
     summary_df = summary_df.sort_values('Total_Spend', ascending=False)
     
     return summary_df
 
 
+def generate_monthly_reports(df: pd.DataFrame, main_vendors: List[str] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Build the cube once and derive every report from it.
+
+    Returns:
+        Dict with cube, vendor_report, category_report, vendor_category_matrix
+        and (when main_vendors is given) main_vendor_summary
+    """
+    cube = build_rollup_cube(df)
+    reports = {
+        'cube': cube,
+        'vendor_report': generate_vendor_spend_report(df, cube=cube),
+        'category_report': generate_category_spend_report(df, cube=cube),
+        'vendor_category_matrix': generate_vendor_category_matrix(df, main_vendors, cube=cube),
+    }
+    if main_vendors:
+        reports['main_vendor_summary'] = generate_main_vendor_summary(df, main_vendors, cube=cube)
+    return reports
+
+
 def export_monthly_report(
     vendor_report: pd.DataFrame,
     category_report: pd.DataFrame,
@@ -9,6 +9,9 @@ import re
 from datetime import datetime
 from typing import Optional, List
 
+# Copy of the repository's s4/parsing.py, shipped next to this script
+from s4.parsing import parse_money, parse_integer, parse_percent, to_nullable_objects
+
 
 def format_month(date_value=None) -> str:
     """Format month as YYYY-MM."""
@@ -84,23 +87,13 @@ def format_vendor_name(vendor) -> str:
 
 
 def clean_currency(series: pd.Series) -> pd.Series:
-    """Clean currency values: remove $, commas, convert to float."""
-    cleaned = (series
-               .astype(str)
-               .str.replace('$', '', regex=False)
-               .str.replace(',', '', regex=False)
-               .str.replace('%', '', regex=False)
-               .str.strip())
-    return pd.to_numeric(cleaned, errors='coerce').fillna(0.0)
+    """Clean currency values: remove $, commas, convert to float. Blanks and "--" -> 0."""
+    return parse_money(series, missing=0.0)
 
 
 def clean_integer(series: pd.Series) -> pd.Series:
     """Clean integer values: remove commas, convert to int. No decimal places."""
-    cleaned = (series
-               .astype(str)
-               .str.replace(',', '', regex=False)
-               .str.strip())
-    return pd.to_numeric(cleaned, errors='coerce').fillna(0).astype(int)
+    return parse_integer(series, missing=0)
 
 
 def clean_percentage(series: pd.Series) -> pd.Series:
@@ -109,47 +102,12 @@ def clean_percentage(series: pd.Series) -> pd.Series:
     Input: "0.46%" means 0.46% (not 46%)
     Output: Return as decimal (0.0046 for 0.46%)
     """
-    def parse_pct(val):
-        if pd.isna(val):
-            return 0.0
-        
-        val_str = str(val).strip()
-        if not val_str or val_str == '--':
-            return 0.0
-        
-        # Remove % if present
-        val_str = val_str.replace('%', '')
-        
-        try:
-            num = float(val_str)
-            # Already a percentage, divide by 100 to get decimal
-            return num / 100.0
-        except:
-            return 0.0
-    
-    return series.apply(parse_pct)
+    return parse_percent(series, missing=0.0)
 
 
 def clean_percentage_or_blank(series: pd.Series) -> pd.Series:
-    """Clean percentage values, leave blank if '--' or missing."""
-    def parse_pct_or_blank(val):
-        if pd.isna(val):
-            return None
-        
-        val_str = str(val).strip()
-        if not val_str or val_str == '--' or val_str == '<10%':
-            return None
-        
-        # Remove % if present
-        val_str = val_str.replace('%', '')
-        
-        try:
-            num = float(val_str)
-            return num / 100.0
-        except:
-            return None
-    
-    return series.apply(parse_pct_or_blank)
+    """Clean percentage values, leave blank (None) if '--', '<10%' or missing."""
+    return to_nullable_objects(parse_percent(series, missing=None))
 
 
 def clean_conversions(series: pd.Series) -> pd.Series:
@@ -6,70 +6,61 @@ Processes Google Ads and Bing Ads exports with user approval workflow
 
 import pandas as pd
 import os
-import re
+import sys
 from datetime import datetime
+from pathlib import Path
 from categorize_vendors_final import categorize_blanks_for_review, find_blank_categories
-
-def detect_month_from_files(data_dir):
-    """Extract month from file names or metadata"""
-    # Check Bing file for date range
-    bing_files = [f for f in os.listdir(data_dir) if 'bing' in f.lower()]
-    if bing_files:
-        bing_path = os.path.join(data_dir, bing_files[0])
-        try:
-            df = pd.read_excel(bing_path, header=None)
-            # Row 1 usually has date range like "10/1/2025,10/31/2025"
-            if len(df) > 1:
-                date_str = str(df.iloc[1, 0])
-                match = re.search(r'(\d+)/(\d+)/(\d+)', date_str)
-                if match:
-                    month, _, year = match.groups()
-                    return f"{year}-{month.zfill(2)}"
-        except:
-            pass
+from category_cache import CategoryCache
+from ad_exports import detect_export_format, read_export, describe_format, probe_exports
+
+# s4.loading is only in the repository's s4 package (scripts/s4 is the
+# parsing-only copy shipped with the skill), so the repository root goes first
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+from s4.loading import load_files, print_load_timings
+
+def detect_month_from_files(data_dir, probes=None):
+    """Extract month from the export headers (Bing report first, then Google)"""
+    # Only the first few rows of each export are read
+    if probes is None:
+        probes = probe_exports(data_dir)
+
+    for platform in ['Bing Ads', 'Google Ads']:
+        for probe in probes:
+            # Report period like "10/1/2025,10/31/2025" or "October 1, 2025 - October 31, 2025"
+            if probe['platform'] == platform and probe['month']:
+                return probe['month']
 
     return datetime.now().strftime("%Y-%m")
 
+def print_input_inventory(probes):
+    """One line per export found in the data folder"""
+    for probe in probes:
+        period = ""
+        if probe['period_start']:
+            period = f"{probe['period_start']:%m/%d/%Y} - {probe['period_end']:%m/%d/%Y}"
+        rows = f"{probe['rows']:,} rows" if probe['rows'] is not None else "? rows"
+        print(f"  {os.path.basename(probe['path'])}: {probe['platform'] or 'unknown platform'}, {period or 'no report period'}, {rows}")
+
 def load_google_ads(filepath):
-    """Load Google Ads CSV with proper encoding"""
+    """Load Google Ads CSV (encoding, separator and header row are detected, then parsed once)"""
     print(f"  Loading Google Ads CSV...")
 
-    configs = [
-        ('utf-16-le', '\t'),
-        ('utf-16', '\t'),
-        ('utf-16', ','),
-        ('utf-8-sig', ','),
-        ('latin1', ','),
-    ]
-
-    for encoding, sep in configs:
-        try:
-            df = pd.read_csv(filepath, encoding=encoding, sep=sep, on_bad_lines='skip')
-            if len(df.columns) > 5:
-                print(f"    Loaded: {len(df)} rows, {len(df.columns)} columns")
-                df['Platform'] = 'Google Ads'
-                return df
-        except Exception as e:
-            continue
-
-    raise ValueError(f"Could not load Google Ads file: {filepath}")
+    fmt = detect_export_format(filepath)
+    df = read_export(filepath, fmt)
+    if len(df.columns) <= 5:
+        raise ValueError(f"Could not load Google Ads file ({describe_format(fmt)}): {filepath}")
+
+    print(f"    Google Ads loaded: {len(df)} rows, {len(df.columns)} columns ({describe_format(fmt)})")
+    df['Platform'] = 'Google Ads'
+    return df
 
 def load_bing_ads(filepath):
-    """Load Bing Ads Excel file"""
+    """Load Bing Ads Excel file (metadata rows above the header are detected and skipped)"""
     print(f"  Loading Bing Ads Excel...")
 
-    df = pd.read_excel(filepath, header=None)
-
-    # Find actual header row (skip metadata)
-    header_row = 0
-    for i, row in df.iterrows():
-        row_str = ' '.join(str(x) for x in row.values if pd.notna(x))
-        if any(col in row_str for col in ['Impressions', 'Clicks', 'Spend', 'Product']):
-            header_row = i
-            break
-
-    df = pd.read_excel(filepath, header=header_row)
-    print(f"    Loaded: {len(df)} rows, {len(df.columns)} columns")
+    fmt = detect_export_format(filepath)
+    df = read_export(filepath, fmt)
+    print(f"    Bing Ads loaded: {len(df)} rows, {len(df.columns)} columns")
     df['Platform'] = 'Bing Ads'
     return df
 
@@ -139,9 +130,11 @@ def process_monthly_data(data_dir):
     print("AD SPEND PROCESSOR - MONTHLY DATA PROCESSING")
     print("=" * 80)
 
-    # Detect month
-    month = detect_month_from_files(data_dir)
+    # Detect month and list inputs from the export headers
+    probes = probe_exports(data_dir)
+    month = detect_month_from_files(data_dir, probes)
     print(f"\nProcessing Month: {month}")
+    print_input_inventory(probes)
 
     # Find files
     google_files = [f for f in os.listdir(data_dir) if 'google' in f.lower() and f.endswith('.csv')]
@@ -155,8 +148,12 @@ def process_monthly_data(data_dir):
     bing_path = os.path.join(data_dir, bing_files[0])
 
     print("\nLoading files:")
-    df_google = load_google_ads(google_path)
-    df_bing = load_bing_ads(bing_path)
+    loaded, timings = load_files({
+        'Google Ads': lambda: load_google_ads(google_path),
+        'Bing Ads': lambda: load_bing_ads(bing_path),
+    })
+    df_google, df_bing = loaded['Google Ads'], loaded['Bing Ads']
+    print_load_timings(timings, indent="    ")
 
     print("\nProcessing:")
     combined = combine_data(df_google, df_bing)
@@ -170,9 +167,12 @@ def process_monthly_data(data_dir):
     print(f"\n  Items needing categories: {len(items_blank)}")
 
     if len(items_blank) > 0:
-        # Generate suggestions
-        suggestions = categorize_blanks_for_review(items_blank)
+        # Generate suggestions; products seen or approved in earlier months come from the cache
+        cache = CategoryCache.load()
+        suggestions = categorize_blanks_for_review(items_blank, cache=cache)
+        cache.save()
         print(f"    • With suggestions: {len(suggestions)}")
+        print(f"    • From category cache: {cache.hits} (newly scored: {cache.misses})")
 
         # Save suggestions file
         output_dir = os.path.dirname(data_dir)
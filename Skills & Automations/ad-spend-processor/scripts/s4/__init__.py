@@ -0,0 +1,4 @@
+"""
+Copy of the parsing helpers of the repository's s4 package (s4/parsing.py),
+shipped with the skill so process_ad_data.py runs without the repository.
+"""
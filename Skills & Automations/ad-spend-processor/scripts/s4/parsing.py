@@ -0,0 +1,124 @@
+"""
+Vectorized parsing for money, percent and count columns.
+
+Every export and sheet we read spells numbers a little differently:
+"$1,234.56", "0.46%", "7,145", "--", "<10%", "#N/A", and accounting negatives
+like "(1,234.56)". These functions parse a whole column at once, with one
+factorize pass and one numeric conversion instead of a Python function per
+cell, so a value that repeats (0, "--", "$0.00") is only cleaned once.
+
+Null semantics are explicit and chosen per column with the `missing`
+argument. It is used for NaN/None, blanks, placeholders ("--", "#N/A", "N/A",
+"nan", ...), censored values ("<10%") and anything else that is not a number:
+
+    parse_money(df['Spend'])                    # blanks -> 0.0
+    parse_money(df['sales_total'], missing=None)  # blanks stay NaN (-> None for JSON)
+    parse_percent(df['Impression share'], missing=None)
+    parse_integer(df['Impressions'])            # blanks -> 0, int64
+
+With missing=None the result keeps NaN (floats) or <NA> (parse_integer,
+nullable Int64) so callers can tell "blank" apart from a real zero.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Characters that are formatting, not part of the number
+FORMATTING_CHARACTERS = ('$', ',', '"', '%')
+
+
+def _as_series(values) -> pd.Series:
+    return values if isinstance(values, pd.Series) else pd.Series(values)
+
+
+def _parse_distinct(values: np.ndarray) -> np.ndarray:
+    """Distinct non-null cells -> floats (NaN where the cell is not a number)"""
+    cleaned = []
+    for value in values:
+        text = str(value)
+        for char in FORMATTING_CHARACTERS:
+            text = text.replace(char, '')
+        cleaned.append(text.strip())
+
+    # One C-level conversion for everything that is a plain number after cleaning.
+    # Placeholders ("--", "#N/A", "nan") and censored values ("<10") fail here.
+    numbers = np.asarray(pd.to_numeric(np.array(cleaned, dtype=object), errors='coerce'), dtype=float)
+
+    # "(1,234.56)" and "$(5.00)" are negative; only cells that failed need a look
+    for i in np.flatnonzero(np.isnan(numbers)):
+        text = cleaned[i]
+        if text.startswith('(') and text.endswith(')'):
+            try:
+                numbers[i] = -float(text[1:-1])
+            except ValueError:
+                pass
+
+    numbers[~np.isfinite(numbers)] = np.nan
+    return numbers
+
+
+def parse_number(values, missing=np.nan) -> pd.Series:
+    """
+    Parse a column of numbers written with '$', ',', '%', quotes or accounting
+    parentheses into floats.
+
+    '%' is only stripped: "0.46%" -> 0.46 (see parse_percent for fractions).
+    Values that are not numbers become `missing` (None keeps NaN).
+    Each distinct cell value is cleaned once, however often it repeats.
+    """
+    series = _as_series(values)
+
+    # Already numeric: nothing to strip
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        numbers = series.astype(float).to_numpy(copy=True)
+        numbers[~np.isfinite(numbers)] = np.nan
+    else:
+        codes, distinct = pd.factorize(series, use_na_sentinel=True)
+        parsed = _parse_distinct(np.asarray(distinct, dtype=object))
+        numbers = np.full(len(codes), np.nan)
+        present = codes >= 0
+        numbers[present] = parsed[codes[present]]
+
+    numbers = pd.Series(numbers, index=series.index, name=series.name)
+    return numbers.fillna(missing) if missing is not None else numbers
+
+
+def parse_money(values, missing=0.0) -> pd.Series:
+    """Currency column ("$1,234.56", "(12.00)", "--") -> floats"""
+    return parse_number(values, missing=missing)
+
+
+def parse_percent(values, missing=0.0) -> pd.Series:
+    """
+    Percent column -> fractions: "0.46%" -> 0.0046, "39.32" -> 0.3932.
+
+    Values are always read as percents, with or without the '%' sign.
+    "<10%" and "--" become `missing`.
+    """
+    fractions = parse_number(values, missing=None) / 100.0
+    return fractions.fillna(missing) if missing is not None else fractions
+
+
+def parse_integer(values, missing=0) -> pd.Series:
+    """
+    Count column ("7,145", "12.0", "--") -> integers, truncating any decimals.
+
+    Returns int64, or nullable Int64 when missing is None.
+    """
+    numbers = np.trunc(parse_number(values, missing=None))
+    if missing is None:
+        return numbers.astype('Int64')
+    return numbers.fillna(missing).astype('int64')
+
+
+def to_nullable_objects(series: pd.Series) -> pd.Series:
+    """NaN -> None, for JSON/database payloads"""
+    return series.astype(object).where(series.notna(), None)
+
+
+def to_json_records(df: pd.DataFrame) -> list:
+    """
+    Rows as dicts for JSON/database payloads: NaN, <NA>, NaT and +/-inf -> None.
+    """
+    clean = df.replace([np.inf, -np.inf], np.nan)
+    return clean.astype(object).where(clean.notna(), None).to_dict('records')
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Vendor assignment rules for Source 4 Industries SKUs.
+
+The rules live in vendor_rules.json as an ordered list. The first rule that
+matches a row wins, just like the old if/elif chain, so a new vendor is added
+by adding a rule (or an alias) to the JSON file rather than editing code.
+
+Each rule has a vendor and one or more conditions. The rule matches if ANY of
+its conditions match:
+
+    sku_prefix     SKU starts with one of these
+    sku_contains   SKU contains one of these
+    title          Title contains one of these (case-sensitive)
+    title_all      Title contains ALL of these (case-sensitive)
+    title_nocase   Title contains one of these, ignoring case
+
+"aliases" maps vendor name variations (e.g. from MASTER SKU) to main names.
+
+All SKU prefixes go into one prefix trie and all title/SKU substrings into
+Aho-Corasick automatons, so each row is matched in one scan per field.
+"""
+
+import json
+import os
+from typing import Dict, Iterable, List
+
+from keyword_automaton import PatternAutomaton
+
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'vendor_rules.json')
+
+
+class VendorRules:
+    """Compiled vendor rules (see module docstring for the rule format)"""
+
+    def __init__(self, rules: List[Dict], aliases: Dict[str, str] = None):
+        self.rules = rules
+        self.vendors = [rule['vendor'] for rule in rules]
+        self.aliases = aliases or {}
+
+        # SKU prefix trie: node = (children, rule ids ending here)
+        self.prefix_root = ({}, [])
+        sku_patterns, sku_rules = [], []
+        title_patterns, title_rules = [], []
+        nocase_patterns, nocase_rules = [], []
+        self.title_all = []  # (rule id, [title pattern ids])
+
+        for rule_id, rule in enumerate(rules):
+            for prefix in rule.get('sku_prefix', []):
+                node = self.prefix_root
+                for char in prefix:
+                    node = node[0].setdefault(char, ({}, []))
+                node[1].append(rule_id)
+            for pattern in rule.get('sku_contains', []):
+                sku_patterns.append(pattern)
+                sku_rules.append(rule_id)
+            for pattern in rule.get('title', []):
+                title_patterns.append(pattern)
+                title_rules.append(rule_id)
+            for pattern in rule.get('title_nocase', []):
+                nocase_patterns.append(pattern)
+                nocase_rules.append(rule_id)
+            if rule.get('title_all'):
+                first = len(title_patterns)
+                for pattern in rule['title_all']:
+                    title_patterns.append(pattern)
+                    title_rules.append(None)  # only counts when every term is present
+                self.title_all.append((rule_id, list(range(first, len(title_patterns)))))
+
+        self.sku_matcher = PatternAutomaton(sku_patterns)
+        self.sku_rules = sku_rules
+        self.title_matcher = PatternAutomaton(title_patterns)
+        self.title_rules = title_rules
+        self.nocase_matcher = PatternAutomaton(nocase_patterns, ignore_case=True)
+        self.nocase_rules = nocase_rules
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_RULES_FILE) -> 'VendorRules':
+        """Load and compile rules from a JSON file"""
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Vendor rules file not found: {path} "
+                                    f"(vendor_rules.json ships next to vendor_rules.py in Skills & Automations)")
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['rules'], data.get('aliases', {}))
+
+    def normalize(self, vendor: str) -> str:
+        """Map a vendor name variation to its main vendor name"""
+        vendor_clean = vendor.strip()
+        return self.aliases.get(vendor_clean, vendor_clean)
+
+    def matching_rules(self, sku: str, title: str) -> set:
+        """Ids of every rule that matches this SKU and title"""
+        matched = set()
+
+        node = self.prefix_root
+        matched.update(node[1])
+        for char in sku:
+            node = node[0].get(char)
+            if node is None:
+                break
+            matched.update(node[1])
+
+        matched.update(self.sku_rules[i] for i in self.sku_matcher.find(sku))
+        matched.update(self.nocase_rules[i] for i in self.nocase_matcher.find(title))
+
+        title_found = self.title_matcher.find(title)
+        matched.update(self.title_rules[i] for i in title_found)
+        matched.discard(None)
+        for rule_id, pattern_ids in self.title_all:
+            if title_found.issuperset(pattern_ids):
+                matched.add(rule_id)
+
+        return matched
+
+    def assign(self, sku: str, title: str) -> str:
+        """Vendor from the highest-priority matching rule, or "" if none match"""
+        matched = self.matching_rules(sku, title)
+        return self.vendors[min(matched)] if matched else ""
+
+    def assign_many(self, skus: Iterable[str], titles: Iterable[str]) -> List[str]:
+        """assign() over paired SKUs and titles; each distinct pair is matched once"""
+        cache = {}
+        vendors = []
+        for key in zip(skus, titles):
+            vendor = cache.get(key)
+            if vendor is None:
+                vendor = cache[key] = self.assign(*key)
+            vendors.append(vendor)
+        return vendors
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Format detection for Google Ads and Bing Ads exports.
+
+Ad platform exports come in several shapes:
+- Google Ads CSV: UTF-16 with a BOM, tab-separated, 2 title rows before the header
+- Bing Ads CSV: UTF-8 with a BOM, comma-separated, ~6 "Report Name: ..." rows
+- Bing Ads Excel: metadata rows above the header on the first sheet
+
+Instead of trying encodings and separators until one parses, the detector
+looks at the BOM and the first few KB (or the first few rows of a workbook)
+to pick the encoding, delimiter and header row. read_export() then parses the
+file exactly once.
+
+probe_export() goes one step earlier: from the same few rows it reads the
+report period and platform (and counts data rows without parsing them), so a
+run knows its month and inputs before any heavy parsing starts.
+"""
+
+import codecs
+import csv
+import os
+import re
+from datetime import datetime
+from collections import Counter
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+SAMPLE_BYTES = 64 * 1024
+SAMPLE_ROWS = 30
+CANDIDATE_DELIMITERS = ['\t', ',', ';', '|']
+
+# Header rows have at least this many non-empty cells
+MIN_HEADER_COLUMNS = 5
+
+EXCEL_EXTENSIONS = ('.xlsx', '.xlsm')
+
+
+def detect_encoding(head: bytes) -> str:
+    """Encoding from the BOM, falling back to a look at the raw bytes"""
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if head.startswith(codecs.BOM_UTF16_LE) or head.startswith(codecs.BOM_UTF16_BE):
+        return 'utf-16'
+
+    # UTF-16 without a BOM: ASCII text leaves every other byte zero
+    sample = head[:4096]
+    if sample and sample.count(b'\x00') > len(sample) // 4:
+        zeros_at_odd = sample[1::2].count(b'\x00')
+        zeros_at_even = sample[0::2].count(b'\x00')
+        return 'utf-16-le' if zeros_at_odd >= zeros_at_even else 'utf-16-be'
+
+    try:
+        sample.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off at the end of the sample is still UTF-8
+        if e.start >= len(sample) - 3:
+            return 'utf-8'
+        return 'latin1'
+
+
+def sample_lines(head: bytes, encoding: str, truncated: bool) -> List[str]:
+    """Decoded lines from the start of the file (a partial last line is dropped)"""
+    text = codecs.getincrementaldecoder(encoding)(errors='replace').decode(head)
+    lines = text.splitlines()
+    if truncated and lines:
+        lines = lines[:-1]
+    return lines[:SAMPLE_ROWS]
+
+
+def find_header_row(rows: List[List]) -> int:
+    """
+    Index of the header row: the first row as wide as the table.
+
+    The table width is the most common count of non-empty cells among rows
+    with at least MIN_HEADER_COLUMNS cells. Title and metadata rows above the
+    header have only one or two cells, so they are skipped.
+    """
+    widths = [sum(1 for cell in row if cell is not None and str(cell).strip() != '') for row in rows]
+    wide = [width for width in widths if width >= MIN_HEADER_COLUMNS]
+    if not wide:
+        return 0
+    table_width = Counter(wide).most_common(1)[0][0]
+    for i, width in enumerate(widths):
+        if width >= table_width:
+            return i
+    return 0
+
+
+def detect_csv_format(path: str) -> Dict:
+    """Encoding, delimiter and header row of a CSV/TSV export"""
+    with open(path, 'rb') as f:
+        head = f.read(SAMPLE_BYTES)
+        truncated = len(f.read(1)) == 1
+
+    encoding = detect_encoding(head)
+    lines = sample_lines(head, encoding, truncated)
+
+    # The delimiter that splits the most lines into the same (largest) number of fields
+    best = None
+    for delimiter in CANDIDATE_DELIMITERS:
+        rows = list(csv.reader(lines, delimiter=delimiter))
+        widths = Counter(len(row) for row in rows if len(row) > 1)
+        if not widths:
+            continue
+        width, count = max(widths.items(), key=lambda item: (item[0] >= MIN_HEADER_COLUMNS, item[1], item[0]))
+        score = (width >= MIN_HEADER_COLUMNS, count, width)
+        if best is None or score > best[0]:
+            best = (score, delimiter, rows)
+
+    if best is None:
+        return {'kind': 'csv', 'encoding': encoding, 'sep': ',', 'header_row': 0}
+
+    _, delimiter, rows = best
+    return {'kind': 'csv', 'encoding': encoding, 'sep': delimiter, 'header_row': find_header_row(rows)}
+
+
+def read_excel_head(path: str, nrows: int = SAMPLE_ROWS) -> List[List]:
+    """First rows of the first sheet, streamed (the rest of the workbook is not read)"""
+    if path.lower().endswith(EXCEL_EXTENSIONS):
+        from openpyxl import load_workbook
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            ws = wb.worksheets[0]
+            return [list(row) for row in ws.iter_rows(max_row=nrows, values_only=True)]
+        finally:
+            wb.close()
+
+    # Older formats (.xls): let pandas read just the first rows
+    head = pd.read_excel(path, header=None, nrows=nrows)
+    return [[None if pd.isna(value) else value for value in row] for row in head.itertuples(index=False)]
+
+
+def detect_excel_format(path: str) -> Dict:
+    """Header row of an Excel export"""
+    return {'kind': 'excel', 'header_row': find_header_row(read_excel_head(path))}
+
+
+def detect_export_format(path: str) -> Dict:
+    """
+    Detect how to parse an ad platform export.
+
+    Returns:
+        Dict with kind ('csv' or 'excel'), header_row, and for CSVs the
+        encoding and sep
+    """
+    if path.lower().endswith(EXCEL_EXTENSIONS + ('.xls',)):
+        return detect_excel_format(path)
+    return detect_csv_format(path)
+
+
+def read_export(path: str, fmt: Dict = None) -> pd.DataFrame:
+    """Parse an export once, using detect_export_format() unless fmt is given"""
+    fmt = fmt or detect_export_format(path)
+    if fmt['kind'] == 'excel':
+        return pd.read_excel(path, header=fmt['header_row'])
+    return pd.read_csv(path, encoding=fmt['encoding'], sep=fmt['sep'],
+                       skiprows=fmt['header_row'], on_bad_lines='skip')
+
+
+def describe_format(fmt: Dict) -> str:
+    """One-line description for progress output"""
+    if fmt['kind'] == 'excel':
+        return f"Excel, header at row {fmt['header_row']}"
+    separator = {'\t': 'tab', ',': 'comma', ';': 'semicolon', '|': 'pipe'}.get(fmt['sep'], repr(fmt['sep']))
+    return f"{fmt['encoding']}, {separator}-separated, header at row {fmt['header_row']}"
+
+
+# ============================================================================
+# METADATA PROBE
+# ============================================================================
+
+# "10/20/2025" (Bing) or "October 20, 2025" (Google)
+NUMERIC_DATE = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})')
+LONG_DATE = re.compile(r'([A-Z][a-z]+) (\d{1,2}), (\d{4})')
+
+# Column names that only one platform uses
+PLATFORM_COLUMNS = {
+    'Google Ads': {'Impr.', 'Cost', 'Conv. value', 'Search impr. share'},
+    'Bing Ads': {'Spend', 'Merchant product ID', 'Custom label 1 (Product)'},
+}
+
+
+def parse_report_dates(text: str) -> List[datetime]:
+    """Every date in a preamble line, in order"""
+    found = []
+    for match in NUMERIC_DATE.finditer(text):
+        month, day, year = (int(part) for part in match.groups())
+        try:
+            found.append((match.start(), datetime(year, month, day)))
+        except ValueError:
+            pass
+    for match in LONG_DATE.finditer(text):
+        try:
+            found.append((match.start(), datetime.strptime(' '.join(match.groups()), '%B %d %Y')))
+        except ValueError:
+            pass
+    return [date for _, date in sorted(found, key=lambda item: item[0])]
+
+
+def detect_platform(path: str, preamble: List[str], header: List) -> Optional[str]:
+    """Platform from the preamble, then the header columns, then the file name"""
+    text = ' '.join(preamble).lower()
+    if 'bing' in text or 'microsoft' in text:
+        return 'Bing Ads'
+    if 'google' in text:
+        return 'Google Ads'
+
+    columns = {str(cell).strip() for cell in header if cell is not None}
+    for platform, platform_columns in PLATFORM_COLUMNS.items():
+        if columns & platform_columns:
+            return platform
+
+    name = os.path.basename(path).lower()
+    if 'bing' in name:
+        return 'Bing Ads'
+    if 'google' in name:
+        return 'Google Ads'
+    return None
+
+
+def count_csv_rows(path: str, fmt: Dict) -> int:
+    """
+    Data rows below the header, streamed with the csv module (no DataFrame).
+    Blank lines and trailing "Total" / copyright rows are not counted.
+    """
+    rows = 0
+    with open(path, 'r', encoding=fmt['encoding'], newline='') as f:
+        reader = csv.reader(f, delimiter=fmt['sep'])
+        for i, row in enumerate(reader):
+            if i <= fmt['header_row'] or len(row) < 2:
+                continue
+            if row[0].strip() == 'Total':
+                continue
+            rows += 1
+    return rows
+
+
+def probe_export(path: str) -> Dict:
+    """
+    Read just the top of an export and describe it.
+
+    Returns:
+        Dict with path, platform, period_start, period_end, month (YYYY-MM of
+        the period start, or None), rows, columns and format (as returned by
+        detect_export_format). For Excel files rows comes from the sheet
+        dimensions, so it may include a trailing totals row.
+    """
+    if path.lower().endswith(EXCEL_EXTENSIONS):
+        from openpyxl import load_workbook
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            ws = wb.worksheets[0]
+            head = [list(row) for row in ws.iter_rows(max_row=SAMPLE_ROWS, values_only=True)]
+            last_row = ws.max_row or 0
+        finally:
+            wb.close()
+        fmt = {'kind': 'excel', 'header_row': find_header_row(head)}
+        rows = max(last_row - fmt['header_row'] - 1, 0)
+    elif path.lower().endswith('.xls'):
+        head = read_excel_head(path)
+        fmt = {'kind': 'excel', 'header_row': find_header_row(head)}
+        rows = None
+    else:
+        fmt = detect_csv_format(path)
+        with open(path, 'rb') as f:
+            head = f.read(SAMPLE_BYTES)
+            truncated = len(f.read(1)) == 1
+        lines = list(csv.reader(sample_lines(head, fmt['encoding'], truncated), delimiter=fmt['sep']))
+        preamble = [' '.join(row) for row in lines[:fmt['header_row']]]
+        header = lines[fmt['header_row']] if lines else []
+        rows = count_csv_rows(path, fmt)
+
+    if fmt['kind'] == 'excel':
+        preamble = [' '.join(str(cell) for cell in row if cell is not None) for row in head[:fmt['header_row']]]
+        header = head[fmt['header_row']] if head else []
+
+    dates = [date for line in preamble for date in parse_report_dates(line)]
+    period_start = dates[0] if dates else None
+    period_end = dates[1] if len(dates) > 1 else period_start
+
+    return {
+        'path': path,
+        'platform': detect_platform(path, preamble, header),
+        'period_start': period_start,
+        'period_end': period_end,
+        'month': period_start.strftime('%Y-%m') if period_start else None,
+        'rows': rows,
+        'columns': len([cell for cell in header if cell is not None and str(cell).strip() != '']),
+        'format': fmt,
+    }
+
+
+def probe_exports(data_dir: str) -> List[Dict]:
+    """probe_export() for every CSV/Excel file in a folder, in name order"""
+    probes = []
+    for name in sorted(os.listdir(data_dir)):
+        if name.lower().endswith(('.csv', '.tsv') + EXCEL_EXTENSIONS + ('.xls',)):
+            try:
+                probes.append(probe_export(os.path.join(data_dir, name)))
+            except Exception as e:
+                print(f"  Could not probe {name}: {e}")
+    return probes
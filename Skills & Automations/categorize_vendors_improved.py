@@ -13,6 +13,11 @@ import pandas as pd
 from typing import Dict, List, Tuple
 import re
 
+from keyword_automaton import KeywordAutomaton
+from vendor_rules import VendorRules
+import category_suggestions
+from category_suggestions import column
+
 
 # Source 4 Industries vendor list (18 main vendors)
 VENDORS = [
@@ -192,6 +197,12 @@ CATEGORY_KEYWORDS = {
     "AF - Scissor Lifts": ["scissor lift"],
 }
 
+# Compiled once: scores every category in a single scan of the text
+CATEGORY_AUTOMATON = KeywordAutomaton(CATEGORY_KEYWORDS)
+
+# SKU/title vendor rules and name aliases, loaded from vendor_rules.json
+VENDOR_RULES = VendorRules.from_file()
+
 
 def assign_vendor_from_sku_or_title(row: pd.Series, master_sku_df: pd.DataFrame = None) -> str:
     """
@@ -211,105 +222,26 @@ def assign_vendor_from_sku_or_title(row: pd.Series, master_sku_df: pd.DataFrame
                 # Map variations to main names
                 return normalize_vendor_name(vendor)
 
-    # SKU pattern matching
-    if sku.startswith('1426') or 'Lincoln' in title:
-        return 'Lincoln Industrial'
-    elif sku.startswith('00-') or 'Luxor' in title:
-        return 'Luxor'  # Not main 18, but known vendor
-    elif 'ANNT' in sku or 'ANNT' in title:
-        return 'ANNT Bollards'  # Maps to S4 Bollards in some contexts
-    elif 'CoreFlex' in title or 'Coreflex' in title:
-        return 'ANNT Bollards'
-    elif 'BDB' in sku or 'BDBB' in sku:
-        return 'ANNT Bollards'
-    elif 'E50' in sku or 'Ekko' in title:
-        return 'Ekko Lifts'
-    elif sku.startswith('01HR') or sku.startswith('01PO') or sku.startswith('03MA') or sku.startswith('03PO') or sku.startswith('04MA'):
-        return 'Casters'  # Durable Superior → Casters main vendor
-    elif sku.startswith('02') or sku.startswith('03') or sku.startswith('04'):
-        return 'Ekko Lifts'
-    elif 'RAVAS' in title.upper():
-        return 'Ravas'
-    elif sku.startswith('0244') or sku.startswith('0845'):
-        return 'Electro Kinetic Technologies'
-    elif 'Handle' in title and 'It' in title:
-        return 'Handle-It'
-    elif 'Noblelift' in title or 'EDGE' in title:
-        return 'Noblelift'
-    elif 'B&P' in title or 'B & P' in title:
-        return 'B&P Manufacturing'
-    elif 'Dutro' in title:
-        return 'Dutro'
-    elif 'Reliance' in title:
-        return 'Reliance Foundry'
-    elif "Adrian" in title or "Adrian's" in title:
-        return "Adrian's Safety Solutions"
-    elif 'Sentry' in title:
-        return 'Sentry Protection Products'
-    elif 'Little Giant' in title:
-        return 'Little Giant'
-    elif 'Merrick' in title:
-        return 'Merrick Machine'
-    elif 'Wesco' in title:
-        return 'Wesco'
-    elif 'Valley Craft' in title:
-        return 'Valley Craft'
-    elif 'Bluff' in title:
-        return 'Bluff Manufacturing'
-    elif 'Meco' in title or 'Omaha' in title:
-        return 'Meco-Omaha'
-    elif 'Apollo' in title:
-        return 'Apollo Forklift'
-
-    # Check title for vendor names (more general matching)
-    title_lower = title.lower()
-
-    vendor_patterns = {
-        'S4 Bollards': ['s4 bollard', 'source 4 bollard'],
-        'Casters': ['caster depot', 'colson', 'dh international'],
-        'R&B Wire': ['r&b wire', 'r & b wire', 'utility cart'],
-    }
-
-    for vendor, patterns in vendor_patterns.items():
-        if any(pattern in title_lower for pattern in patterns):
-            return vendor
-
-    return ""
+    # SKU prefix / title keyword rules, in priority order
+    return VENDOR_RULES.assign(sku, title)
 
 
 def normalize_vendor_name(vendor: str) -> str:
     """
     Normalize vendor name variations to main 18 vendor names.
     """
-    vendor_clean = vendor.strip()
-
-    # Mapping of variations to main names
-    vendor_map = {
-        # Casters variations
-        'Durable Superior Casters': 'Casters',
-        'Caster Depot': 'Casters',
-        'Colson': 'Casters',
-        'DH International': 'Casters',
-
-        # Handle-It variations
-        'Handle It': 'Handle-It',
-        'HandleIt': 'Handle-It',
-
-        # Adrian's variations
-        'Adrian': "Adrian's Safety Solutions",
-        "Adrians": "Adrian's Safety Solutions",
-
-        # Sentry variations
-        'Sentry': 'Sentry Protection Products',
+    return VENDOR_RULES.normalize(vendor)
 
-        # Bluff variations
-        'Bluff': 'Bluff Manufacturing',
 
-        # Reliance variations
-        'Reliance': 'Reliance Foundry',
-    }
+def assign_vendors(df: pd.DataFrame, master_sku_df: pd.DataFrame = None) -> pd.Series:
+    """
+    Batch version of assign_vendor_from_sku_or_title for a whole DataFrame.
+    Gives the same vendor as calling it row by row.
 
-    return vendor_map.get(vendor_clean, vendor_clean)
+    Returns:
+        Series of vendor names aligned to df's index
+    """
+    return category_suggestions.assign_vendors(df, VENDOR_RULES, master_sku_df)
 
 
 def suggest_product_category(row: pd.Series, master_sku_df: pd.DataFrame = None) -> Tuple[str, float]:
@@ -332,32 +264,31 @@ def suggest_product_category(row: pd.Series, master_sku_df: pd.DataFrame = None)
             if pd.notna(category) and category.strip() and category.strip().upper() != 'BLANK':
                 return category, 1.0  # High confidence from existing data
 
-    # Combine title and product name for matching
+    # Combine title and product name and score every category in one pass
     text = f"{title} {product_name}"
+    return CATEGORY_AUTOMATON.best_category(text)
 
-    # Score each category based on keyword matches
-    scores = {}
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        score = 0
-        for keyword in keywords:
-            if keyword.lower() in text:
-                # Longer, more specific keywords get higher scores
-                score += len(keyword.split())
-        if score > 0:
-            scores[category] = score
 
-    if not scores:
-        return "BLANK", 0.0
+def suggest_product_categories(df: pd.DataFrame, master_sku_df: pd.DataFrame = None,
+                               engine: str = 'keywords', cache=None) -> pd.DataFrame:
+    """
+    Batch version of suggest_product_category for a whole DataFrame.
+    With the keyword engine it gives the same category and confidence as
+    calling suggest_product_category row by row.
 
-    # Get category with highest score
-    best_category = max(scores, key=scores.get)
-    max_score = scores[best_category]
+    engine:
+        'keywords' - CATEGORY_KEYWORDS scoring (default)
+        'model'    - classifier trained on master_sku_df (see category_model.py,
+                     needs scikit-learn; falls back to keywords without it)
 
-    # Calculate confidence (normalize based on keyword match strength)
-    # More specific matches = higher confidence
-    confidence = min(max_score / 3.0, 1.0)  # Cap at 1.0
+    cache:
+        Optional CategoryCache (see category_cache.py): products seen or
+        approved in an earlier run are not scored again.
 
-    return best_category, confidence
+    Returns:
+        DataFrame with Category and Confidence columns, aligned to df's index
+    """
+    return category_suggestions.suggest_product_categories(df, CATEGORY_AUTOMATON, master_sku_df, engine, cache)
 
 
 def find_blank_categories(df: pd.DataFrame, vendors: List[str] = None) -> pd.DataFrame:
@@ -388,44 +319,45 @@ def find_blank_categories(df: pd.DataFrame, vendors: List[str] = None) -> pd.Dat
     return blank_df
 
 
-def auto_categorize_blanks(df: pd.DataFrame, master_sku_df: pd.DataFrame = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+def auto_categorize_blanks(df: pd.DataFrame, master_sku_df: pd.DataFrame = None,
+                           engine: str = 'keywords', cache=None) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     IMPROVED: Automatically suggest categories for blank SKUs.
 
     Returns HIGH confidence suggestions applied to data, and MEDIUM/LOW confidence
     suggestions as a separate "Missing Product Categories" file.
 
+    Pass a CategoryCache (category_cache.py) to reuse earlier answers.
+
     Returns:
         Tuple of (high_confidence_df, low_confidence_suggestions_df)
         - high_confidence_df: Data with HIGH confidence (≥70%) categories auto-assigned
         - low_confidence_suggestions_df: All items with their suggestions + confidence scores
     """
-    results = []
-
-    for idx, row in df.iterrows():
-        suggested_cat, confidence = suggest_product_category(row, master_sku_df)
-        results.append({
-            'SKU': row.get('SKU', ''),
-            'Title': row.get('Title', ''),
-            'Vendor': row.get('Vendor', ''),
-            'Platform': row.get('Platform', ''),
-            'Price': row.get('Price', ''),
-            'Ad Spend': row.get('Ad Spend', ''),
-            'Impressions': row.get('Impressions', ''),
-            'Clicks': row.get('Clicks', ''),
-            'CTR': row.get('CTR', ''),
-            'Avg. CPC': row.get('Avg. CPC', ''),
-            'Conversions': row.get('Conversions', ''),
-            'Revenue': row.get('Revenue', ''),
-            'Impression share': row.get('Impression share', ''),
-            'Impression share lost to rank': row.get('Impression share lost to rank', ''),
-            'Absolute top impression share': row.get('Absolute top impression share', ''),
-            'Suggested_Category': suggested_cat,
-            'Confidence': f"{confidence:.0%}",
-            'Confidence_Score': confidence,
-        })
-
-    results_df = pd.DataFrame(results)
+    suggestions = suggest_product_categories(df, master_sku_df, engine, cache)
+    rows = df.reset_index(drop=True)
+    suggestions = suggestions.reset_index(drop=True)
+
+    results_df = pd.DataFrame({
+        'SKU': column(rows, 'SKU'),
+        'Title': column(rows, 'Title'),
+        'Vendor': column(rows, 'Vendor'),
+        'Platform': column(rows, 'Platform'),
+        'Price': column(rows, 'Price'),
+        'Ad Spend': column(rows, 'Ad Spend'),
+        'Impressions': column(rows, 'Impressions'),
+        'Clicks': column(rows, 'Clicks'),
+        'CTR': column(rows, 'CTR'),
+        'Avg. CPC': column(rows, 'Avg. CPC'),
+        'Conversions': column(rows, 'Conversions'),
+        'Revenue': column(rows, 'Revenue'),
+        'Impression share': column(rows, 'Impression share'),
+        'Impression share lost to rank': column(rows, 'Impression share lost to rank'),
+        'Absolute top impression share': column(rows, 'Absolute top impression share'),
+        'Suggested_Category': suggestions['Category'],
+        'Confidence': suggestions['Confidence'].map(lambda confidence: f"{confidence:.0%}"),
+        'Confidence_Score': suggestions['Confidence'],
+    })
 
     # Split into HIGH confidence (auto-assign) and LOW confidence (needs review)
     high_conf_mask = results_df['Confidence_Score'] >= 0.7
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Cross-month cache of product category suggestions and approvals.
+
+Most blank-category products come back every month. Instead of re-scoring
+them each time, suggestions are remembered per product, and categories a
+person approved in a review sheet are remembered too:
+
+- Products are keyed by normalized (SKU, title, vendor): trimmed, inner
+  whitespace collapsed, lowercased (SKU uppercased).
+- Suggestions are also keyed by the scorer version (KeywordAutomaton.version
+  for the keyword table, category_model.model_version() for the model), so
+  editing CATEGORY_KEYWORDS or retraining quietly invalidates old scores.
+- Approvals do not depend on the scorer. An approved product is answered
+  with its approved category at 100% confidence, like a MASTER SKU match.
+
+Only products missing from the cache go through the scorer. The cache is a
+CSV next to this file, so it can be inspected or edited in Excel.
+
+Usage:
+    python category_cache.py approve "2025-10 Missing Product Categories.csv" [...]
+    python category_cache.py stats
+"""
+
+import os
+import re
+import sys
+from datetime import datetime
+from typing import Iterable, List, Tuple
+
+import pandas as pd
+
+DEFAULT_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.category_cache.csv')
+
+CACHE_COLUMNS = ['sku', 'title', 'vendor', 'source', 'version', 'category', 'confidence', 'updated']
+
+APPROVED = 'approved'
+SUGGESTED = 'suggested'
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_text(value) -> str:
+    """Key form of a title or vendor: trimmed, single spaces, lowercase"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ''
+    return _WHITESPACE.sub(' ', str(value)).strip().lower()
+
+
+def cache_keys(skus: Iterable, titles: Iterable, vendors: Iterable) -> List[Tuple[str, str, str]]:
+    """Normalized (SKU, title, vendor) key for each row"""
+    return [(normalize_text(sku).upper(), normalize_text(title), normalize_text(vendor))
+            for sku, title, vendor in zip(skus, titles, vendors)]
+
+
+class CategoryCache:
+    """Suggestions keyed by (product key, scorer version) and approvals keyed by product"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_FILE):
+        self.path = path
+        self.suggestions = {}  # (key, version) -> (category, confidence, updated)
+        self.approvals = {}    # key -> (category, updated)
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_CACHE_FILE) -> 'CategoryCache':
+        """Cache from disk (empty if the file does not exist yet)"""
+        cache = cls(path)
+        if path and os.path.exists(path):
+            entries = pd.read_csv(path, dtype=str, keep_default_na=False)
+            for row in entries.itertuples(index=False):
+                key = (row.sku, row.title, row.vendor)
+                if row.source == APPROVED:
+                    cache.approvals[key] = (row.category, row.updated)
+                else:
+                    cache.suggestions[(key, row.version)] = (row.category, float(row.confidence), row.updated)
+        return cache
+
+    def save(self):
+        """Write the cache (via a temp file, so a crash never leaves half a cache)"""
+        rows = [(*key, APPROVED, '', category, '1.0', updated)
+                for key, (category, updated) in self.approvals.items()]
+        rows += [(*key, SUGGESTED, version, category, repr(confidence), updated)
+                 for (key, version), (category, confidence, updated) in self.suggestions.items()]
+        entries = pd.DataFrame(rows, columns=CACHE_COLUMNS).sort_values(['sku', 'title', 'vendor', 'source'])
+        entries.to_csv(self.path + '.tmp', index=False)
+        os.replace(self.path + '.tmp', self.path)
+
+    def lookup(self, keys: List[Tuple[str, str, str]], version: str) -> pd.DataFrame:
+        """
+        Cached answer for each key: the approval if there is one, else a
+        suggestion made by this scorer version.
+
+        Returns:
+            DataFrame with Category and Confidence (NaN where not cached)
+        """
+        categories, confidences = [], []
+        for key in keys:
+            approval = self.approvals.get(key)
+            if approval is not None:
+                categories.append(approval[0])
+                confidences.append(1.0)
+                continue
+            suggestion = self.suggestions.get((key, version))
+            if suggestion is not None:
+                categories.append(suggestion[0])
+                confidences.append(suggestion[1])
+            else:
+                categories.append(None)
+                confidences.append(float('nan'))
+
+        found = pd.DataFrame({'Category': pd.Series(categories, dtype=str),
+                              'Confidence': pd.Series(confidences, dtype=float)})
+        hits = int(found['Category'].notna().sum())
+        self.hits += hits
+        self.misses += len(keys) - hits
+        return found
+
+    def store_suggestions(self, keys: List[Tuple[str, str, str]], version: str,
+                          categories: Iterable, confidences: Iterable):
+        """Remember scorer output for these keys"""
+        today = datetime.now().strftime('%Y-%m-%d')
+        for key, category, confidence in zip(keys, categories, confidences):
+            self.suggestions[(key, version)] = (category, float(confidence), today)
+
+    def approve(self, keys: List[Tuple[str, str, str]], categories: Iterable) -> int:
+        """Record approved categories (blank and "BLANK" are ignored). Returns how many were recorded."""
+        today = datetime.now().strftime('%Y-%m-%d')
+        recorded = 0
+        for key, category in zip(keys, categories):
+            category = '' if pd.isna(category) else str(category).strip()
+            if category and category.upper() != 'BLANK':
+                self.approvals[key] = (category, today)
+                recorded += 1
+        return recorded
+
+    def import_approvals(self, review_df: pd.DataFrame) -> int:
+        """
+        Approvals from a reviewed sheet such as "2025-10 Missing Product
+        Categories.csv": every row whose category was filled in. The category
+        comes from 'Approved Category' if present, else 'Product Category';
+        the title from 'Title' or 'Product Name'.
+        """
+        def column(*names):
+            for name in names:
+                if name in review_df.columns:
+                    return review_df[name]
+            return pd.Series('', index=review_df.index)
+
+        keys = cache_keys(column('SKU'), column('Title', 'Product Name'), column('Vendor'))
+        return self.approve(keys, column('Approved Category', 'Product Category'))
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else 'stats'
+    cache = CategoryCache.load()
+
+    if command == 'approve':
+        for path in sys.argv[2:]:
+            recorded = cache.import_approvals(pd.read_csv(path, dtype=str))
+            print(f"  {os.path.basename(path)}: {recorded} approved categories")
+        cache.save()
+    elif command != 'stats':
+        print(__doc__)
+        sys.exit(1)
+
+    versions = pd.Series([version for _, version in cache.suggestions], dtype=object).value_counts()
+    print(f"Category cache: {cache.path}")
+    print(f"  Approved products: {len(cache.approvals):,}")
+    print(f"  Cached suggestions: {len(cache.suggestions):,}")
+    for version, count in versions.items():
+        print(f"    {version}: {count:,}")
+
+
+if __name__ == "__main__":
+    main()
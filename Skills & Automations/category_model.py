@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Product category classifier trained on the MASTER SKU file.
+
+An alternative to the CATEGORY_KEYWORDS heuristics: every labelled
+(PRODUCT NAME, VENDOR) -> PRODUCT CATEGORY row in MASTER SKU becomes training
+data for a TF-IDF (word + character n-grams) linear classifier. Scores are
+calibrated into class probabilities (sigmoid calibration with cross-validation),
+and the probability of the predicted class is the confidence. Predictions for
+a whole batch of rows are one sparse matrix product.
+
+The trained model is cached on disk next to this file and reused until the
+MASTER SKU labels (or the model settings) change.
+
+Requires scikit-learn (pip install scikit-learn). Runs on CPU, no network.
+"""
+
+import hashlib
+import os
+import pickle
+from typing import Iterable, List, Tuple
+
+import pandas as pd
+import sklearn
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.pipeline import make_pipeline, make_union
+from sklearn.svm import LinearSVC
+
+DEFAULT_MODEL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.category_model.pkl')
+
+# Anything that changes the trained model must be part of the cache key
+MODEL_SETTINGS = {
+    'word_ngrams': (1, 2),
+    'char_ngrams': (3, 5),
+    'char_min_df': 2,
+    'C': 0.5,
+    'calibration_folds': 3,
+    'model_version': 1,
+}
+
+# 1.0 is reserved for exact MASTER SKU matches
+MAX_MODEL_CONFIDENCE = 0.99
+
+
+def model_text(name, vendor) -> str:
+    """Text the model sees for one product: name plus vendor"""
+    name = '' if pd.isna(name) else str(name)
+    vendor = '' if pd.isna(vendor) else str(vendor)
+    return f"{name} {vendor}".strip()
+
+
+def training_data(master_sku_df: pd.DataFrame) -> Tuple[List[str], List[str]]:
+    """
+    (texts, labels) for every MASTER SKU row with a real category.
+    Blank, missing and "BLANK" categories are left out.
+    """
+    names = master_sku_df['PRODUCT NAME'] if 'PRODUCT NAME' in master_sku_df.columns else pd.Series('', index=master_sku_df.index)
+    vendors = master_sku_df['VENDOR'] if 'VENDOR' in master_sku_df.columns else pd.Series('', index=master_sku_df.index)
+
+    texts, labels = [], []
+    for name, vendor, category in zip(names, vendors, master_sku_df['PRODUCT CATEGORY']):
+        if pd.isna(category) or not str(category).strip() or str(category).strip().upper() == 'BLANK':
+            continue
+        text = model_text(name, vendor)
+        if text:
+            texts.append(text)
+            labels.append(str(category).strip())
+    return texts, labels
+
+
+def training_fingerprint(texts: List[str], labels: List[str]) -> str:
+    """Hash of the training rows, model settings and scikit-learn version"""
+    digest = hashlib.sha256()
+    digest.update(repr((MODEL_SETTINGS, sklearn.__version__)).encode('utf-8'))
+    for text, label in zip(texts, labels):
+        digest.update(f"{text}\t{label}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def model_version(master_sku_df: pd.DataFrame) -> str:
+    """Cache version of the model this MASTER SKU file trains (no training needed)"""
+    return 'model:' + training_fingerprint(*training_data(master_sku_df))[:16]
+
+
+class CategoryModel:
+    """TF-IDF + calibrated linear SVM category classifier"""
+
+    def __init__(self, pipeline, fingerprint: str):
+        self.pipeline = pipeline
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def train(cls, texts: List[str], labels: List[str]) -> 'CategoryModel':
+        if len(set(labels)) < 2:
+            raise ValueError("MASTER SKU needs at least two labelled product categories to train on")
+
+        # Calibration cross-validates, so every category needs one row per fold.
+        # Rare categories are repeated rather than dropped.
+        counts = pd.Series(labels).value_counts()
+        folds = MODEL_SETTINGS['calibration_folds']
+        fit_texts, fit_labels = list(texts), list(labels)
+        for text, label in zip(texts, labels):
+            if counts[label] < folds:
+                repeats = -(-folds // counts[label]) - 1
+                fit_texts.extend([text] * repeats)
+                fit_labels.extend([label] * repeats)
+
+        features = make_union(
+            TfidfVectorizer(analyzer='word', ngram_range=MODEL_SETTINGS['word_ngrams'],
+                            lowercase=True, sublinear_tf=True),
+            TfidfVectorizer(analyzer='char_wb', ngram_range=MODEL_SETTINGS['char_ngrams'],
+                            lowercase=True, sublinear_tf=True, min_df=MODEL_SETTINGS['char_min_df']),
+        )
+        classifier = CalibratedClassifierCV(LinearSVC(C=MODEL_SETTINGS['C']),
+                                            cv=folds, method='sigmoid')
+        pipeline = make_pipeline(features, classifier)
+        pipeline.fit(fit_texts, fit_labels)
+        return cls(pipeline, training_fingerprint(texts, labels))
+
+    def predict(self, names: Iterable, vendors: Iterable) -> pd.DataFrame:
+        """
+        Predict categories for paired product names and vendors.
+        Each distinct text is scored once.
+
+        Returns:
+            DataFrame with Category and Confidence columns (one row per input)
+        """
+        texts = pd.Series([model_text(name, vendor) for name, vendor in zip(names, vendors)], dtype=object)
+        unique_texts = texts.unique()
+        if len(unique_texts) == 0:
+            return pd.DataFrame({'Category': pd.Series(dtype=object), 'Confidence': pd.Series(dtype=float)})
+
+        probabilities = self.pipeline.predict_proba(list(unique_texts))
+        best = probabilities.argmax(axis=1)
+        classes = self.pipeline.classes_
+
+        positions = pd.Index(unique_texts).get_indexer(texts)
+        return pd.DataFrame({
+            'Category': classes[best][positions],
+            'Confidence': probabilities.max(axis=1).clip(max=MAX_MODEL_CONFIDENCE)[positions],
+        })
+
+
+def load_or_train_model(master_sku_df: pd.DataFrame, cache_path: str = DEFAULT_MODEL_FILE) -> CategoryModel:
+    """
+    Category model for this MASTER SKU file.
+
+    Reuses the cached model if it was trained on exactly the same labelled
+    rows; otherwise trains a new one and caches it.
+    """
+    texts, labels = training_data(master_sku_df)
+    fingerprint = training_fingerprint(texts, labels)
+
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                model = pickle.load(f)
+            if isinstance(model, CategoryModel) and model.fingerprint == fingerprint:
+                return model
+        except Exception as e:
+            print(f"  Ignoring unreadable category model cache ({e})")
+
+    print(f"  Training category model on {len(texts):,} MASTER SKU rows ({len(set(labels))} categories)...")
+    model = CategoryModel.train(texts, labels)
+
+    if cache_path:
+        # Write to a temp name first so a crashed run never leaves a partial model
+        with open(cache_path + '.tmp', 'wb') as f:
+            pickle.dump(model, f)
+        os.replace(cache_path + '.tmp', cache_path)
+
+    return model
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Batch vendor and product category suggestions, shared by the categorize_vendors
+scripts (categorize_vendors_final.py, categorize_vendors_improved.py and the
+ad-spend-processor skill's scripts/categorize_vendors.py).
+
+Each script keeps its own CATEGORY_KEYWORDS table and vendor rules and passes
+the compiled KeywordAutomaton / VendorRules in, so a change to how rows are
+scored, how the model engine is picked, how the category cache is used or
+how MASTER SKU wins is made here once. The skill ships a copy of this module
+(and of keyword_automaton.py, vendor_rules.py and vendor_rules.json) in
+ad-spend-processor/scripts/; tests/test_skill_bundle.py checks it is current.
+
+MASTER SKU rules are the same as the row-by-row functions in the scripts:
+the first MASTER SKU row per SKU is used, and its vendor or category wins
+over any suggestion (categories at 100% confidence; blank and "BLANK" do not
+count).
+"""
+
+import pandas as pd
+
+from keyword_automaton import KeywordAutomaton
+from vendor_rules import VendorRules
+
+
+def column(df: pd.DataFrame, name: str) -> pd.Series:
+    """df[name], or a column of '' aligned to df's index when it is missing"""
+    return df[name] if name in df.columns else pd.Series('', index=df.index)
+
+
+def assign_vendors(df: pd.DataFrame, vendor_rules: VendorRules, master_sku_df: pd.DataFrame = None) -> pd.Series:
+    """
+    Vendor for every row of df: MASTER SKU vendor when there is one, else the
+    first SKU/title rule that matches.
+
+    Returns:
+        Series of vendor names aligned to df's index
+    """
+    skus = column(df, 'SKU').map(str)
+    vendors = pd.Series(vendor_rules.assign_many(skus, column(df, 'Title').map(str)), index=df.index, dtype=object)
+
+    # MASTER SKU vendors win over the rules (first row per SKU)
+    if master_sku_df is not None and 'VENDOR' in master_sku_df.columns:
+        first_rows = master_sku_df.drop_duplicates('SKU')
+        known = {
+            sku: vendor_rules.normalize(vendor)
+            for sku, vendor in zip(first_rows['SKU'], first_rows['VENDOR'])
+            if sku != '' and pd.notna(vendor) and vendor.strip()
+        }
+        matched = skus.map(known)
+        found = matched.notna().to_numpy()
+        vendors.loc[found] = matched[found].to_numpy()
+
+    return vendors
+
+
+def category_engine(engine: str, master_sku_df: pd.DataFrame = None) -> str:
+    """
+    The engine that will actually score: 'model' falls back to 'keywords'
+    when scikit-learn is not installed.
+    """
+    if engine == 'model':
+        if master_sku_df is None:
+            raise ValueError("The 'model' category engine needs master_sku_df to train on")
+        try:
+            import category_model  # noqa: F401
+        except ImportError:
+            print("  scikit-learn not installed (pip install scikit-learn) - using keyword suggestions")
+            return 'keywords'
+    return engine
+
+
+def score_product_categories(df: pd.DataFrame, automaton: KeywordAutomaton, master_sku_df: pd.DataFrame = None,
+                             engine: str = 'keywords') -> pd.DataFrame:
+    """
+    Scorer output only (no MASTER SKU override, no cache) for each row of df.
+
+    Returns:
+        DataFrame with Category and Confidence columns, aligned to df's index
+    """
+    if engine == 'model':
+        from category_model import load_or_train_model
+        model = load_or_train_model(master_sku_df)
+        suggestions = model.predict(column(df, 'Title'), column(df, 'Vendor'))
+        suggestions.index = df.index
+        return suggestions
+
+    text = pd.Series(
+        [f"{str(title).lower()} {str(name).lower()}"
+         for title, name in zip(column(df, 'Title'), column(df, 'PRODUCT NAME'))],
+        index=df.index, dtype=object,
+    )
+    return automaton.best_categories(text)
+
+
+def apply_master_sku_categories(df: pd.DataFrame, suggestions: pd.DataFrame,
+                                master_sku_df: pd.DataFrame = None) -> pd.DataFrame:
+    """Overwrite suggestions (in place) with MASTER SKU categories at 100% confidence"""
+    if master_sku_df is not None and 'PRODUCT CATEGORY' in master_sku_df.columns:
+        first_rows = master_sku_df.drop_duplicates('SKU')
+        known = {
+            sku: category
+            for sku, category in zip(first_rows['SKU'], first_rows['PRODUCT CATEGORY'])
+            if sku != '' and pd.notna(category) and category.strip() and category.strip().upper() != 'BLANK'
+        }
+        matched = column(df, 'SKU').map(str).map(known)
+        found = matched.notna().to_numpy()
+        suggestions.loc[found, 'Category'] = matched[found].to_numpy()
+        suggestions.loc[found, 'Confidence'] = 1.0
+
+    return suggestions
+
+
+def suggest_product_categories(df: pd.DataFrame, automaton: KeywordAutomaton, master_sku_df: pd.DataFrame = None,
+                               engine: str = 'keywords', cache=None) -> pd.DataFrame:
+    """
+    Category suggestion for every row of df.
+
+    engine:
+        'keywords' - the automaton's keyword scoring (default)
+        'model'    - classifier trained on master_sku_df (see category_model.py,
+                     needs scikit-learn; falls back to keywords without it)
+
+    cache:
+        Optional CategoryCache (see category_cache.py). Products approved or
+        scored in an earlier run with the same engine version are answered
+        from it; only new products are scored, and their scores are added.
+
+    Returns:
+        DataFrame with Category and Confidence columns, aligned to df's index
+    """
+    engine = category_engine(engine, master_sku_df)
+
+    if cache is None:
+        suggestions = score_product_categories(df, automaton, master_sku_df, engine)
+    else:
+        from category_cache import cache_keys
+        if engine == 'model':
+            from category_model import model_version
+            version = model_version(master_sku_df)
+        else:
+            version = automaton.version
+        keys = cache_keys(column(df, 'SKU'), column(df, 'Title'), column(df, 'Vendor'))
+        suggestions = cache.lookup(keys, version)
+        suggestions.index = df.index
+
+        # Score only the products the cache has not seen
+        new = suggestions['Category'].isna().to_numpy()
+        if new.any():
+            scored = score_product_categories(df[new], automaton, master_sku_df, engine)
+            suggestions.loc[new, 'Category'] = scored['Category'].to_numpy()
+            suggestions.loc[new, 'Confidence'] = scored['Confidence'].to_numpy()
+            cache.store_suggestions([key for key, is_new in zip(keys, new) if is_new], version,
+                                    scored['Category'], scored['Confidence'])
+
+    # MASTER SKU categories win over suggestions (first row per SKU)
+    return apply_master_sku_categories(df, suggestions, master_sku_df)
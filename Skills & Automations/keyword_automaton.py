@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Multi-pattern keyword matching for product category and vendor assignment.
+
+The category keyword table is compiled once into an Aho-Corasick automaton, so
+every title is scanned a single time no matter how many keywords there are.
+Scores match the original per-keyword substring loop exactly:
+
+- a keyword counts once if it appears anywhere in the text (substring match)
+- each matched keyword adds len(keyword.split()) to its category's score
+- the best category is the highest score; ties go to the category listed
+  first in the keyword table
+- confidence = min(best_score / 3, 1.0)
+"""
+
+import hashlib
+import json
+import pandas as pd
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+
+class PatternAutomaton:
+    """
+    Aho-Corasick automaton over a list of literal patterns.
+
+    find(text) returns the indices of every pattern that occurs in text, in a
+    single left-to-right scan. With ignore_case=True both the patterns and the
+    text are lowercased.
+    """
+
+    def __init__(self, patterns: List[str], ignore_case: bool = False):
+        self.ignore_case = ignore_case
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for pattern_id, pattern in enumerate(patterns):
+            state = 0
+            for char in (pattern.lower() if ignore_case else pattern):
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = next_state
+            self.output[state].append(pattern_id)
+
+        # Breadth-first pass: failure links and inherited outputs
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def find(self, text: str) -> set:
+        """Indices of every pattern that occurs in text"""
+        found = set(self.output[0])  # an empty pattern is in every string
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        state = 0
+        for char in (text.lower() if self.ignore_case else text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+class KeywordAutomaton:
+    """
+    Category scorer over a {category: [keywords]} table.
+
+    Keywords are matched case-insensitively; callers pass text in any case.
+    """
+
+    def __init__(self, category_keywords: Dict[str, List[str]]):
+        self.categories = list(category_keywords.keys())
+
+        # Unique lowercased patterns -> [(category index, weight), ...]
+        # A keyword listed under several categories (or twice under one)
+        # contributes to each listing, just like the original loop.
+        pattern_ids = {}
+        self.pattern_weights = []
+        for cat_idx, keywords in enumerate(category_keywords.values()):
+            for keyword in keywords:
+                pattern = keyword.lower()
+                if pattern not in pattern_ids:
+                    pattern_ids[pattern] = len(self.pattern_weights)
+                    self.pattern_weights.append([])
+                self.pattern_weights[pattern_ids[pattern]].append((cat_idx, len(keyword.split())))
+        self.patterns = list(pattern_ids.keys())
+        self.matcher = PatternAutomaton(self.patterns, ignore_case=True)
+
+        # Changes whenever a category or keyword (or their order) changes, so
+        # cached suggestions from an older table are not reused
+        table = json.dumps(list(category_keywords.items()), ensure_ascii=False)
+        self.version = 'keywords:' + hashlib.sha256(table.encode('utf-8')).hexdigest()[:16]
+
+    def find_patterns(self, text: str) -> set:
+        """Ids of every keyword pattern that occurs in text"""
+        return self.matcher.find(text)
+
+    def score(self, text: str) -> Dict[str, int]:
+        """{category: score} for every category with at least one keyword match"""
+        totals = {}
+        for pattern_id in self.find_patterns(text):
+            for cat_idx, weight in self.pattern_weights[pattern_id]:
+                totals[cat_idx] = totals.get(cat_idx, 0) + weight
+        # Keep keyword-table order so ties resolve the same way as before
+        return {self.categories[i]: totals[i] for i in sorted(totals)}
+
+    def best_category(self, text: str) -> Tuple[str, float]:
+        """
+        Best category for text.
+
+        Returns:
+            Tuple of (category, confidence), or ("BLANK", 0.0) if nothing matched
+        """
+        scores = self.score(text)
+        if not scores:
+            return "BLANK", 0.0
+        best = max(scores, key=scores.get)
+        return best, min(scores[best] / 3.0, 1.0)
+
+    def best_categories(self, texts: Iterable[str]) -> pd.DataFrame:
+        """
+        Batch version of best_category over a Series (or any iterable) of texts.
+
+        Each distinct text is scanned once, so repeated titles cost nothing.
+
+        Returns:
+            DataFrame with Category and Confidence columns, aligned to the
+            Series index when a Series is passed
+        """
+        if not isinstance(texts, pd.Series):
+            texts = pd.Series(list(texts), dtype=object)
+        cache = {}
+        categories = []
+        confidences = []
+        for text in texts:
+            result = cache.get(text)
+            if result is None:
+                result = cache[text] = self.best_category(text)
+            categories.append(result[0])
+            confidences.append(result[1])
+        return pd.DataFrame({'Category': categories, 'Confidence': confidences}, index=texts.index)
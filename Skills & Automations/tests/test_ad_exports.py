@@ -0,0 +1,155 @@
+"""
+Regression tests for ad_exports: format detection and parsing of the export
+shapes the ad platforms produce. Each fixture writes a small export with the
+exact bytes of the real thing (BOM or not, delimiter, title/report rows).
+
+    python -m pytest "Skills & Automations/tests"
+"""
+
+import codecs
+import csv
+import io
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# ad_exports lives in Skills & Automations
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from ad_exports import detect_export_format, read_export
+
+GOOGLE_COLUMNS = ['Image', 'Title', 'Merchant ID', 'Item ID', 'Custom label 1', 'Brand', 'Price',
+                  'Currency code', 'Cost', 'Impr.', 'Clicks', 'CTR', 'Avg. CPC', 'Conversions',
+                  'Conv. value', 'Search impr. share', 'Search lost IS (rank)', 'Search abs. top IS']
+GOOGLE_ROWS = [
+    ['', 'Noblelift Manual Pallet Jack', '5551234', 'shopify_US_1', 'NL-PT20', 'Noblelift', '399.00',
+     'USD', '120.50', '4,210', '88', '2.09%', '1.37', '2.00', '798.00', '45.10%', '30.00%', '12.40%'],
+    ['', 'Handle-It Guard Rail 10 ft', '5551234', 'shopify_US_2', 'HI-GR10', 'Handle-It', '249.99',
+     'USD', '64.10', '2,004', '41', '2.05%', '1.56', '0.00', '0.00', '< 10%', '55.20%', '8.00%'],
+    ['', 'S4 Bollard Cover, Yellow', '5551234', 'shopify_US_3', 'S4B-CV6', 'S4 Bollards', '39.95',
+     'USD', '12.00', '980', '15', '1.53%', '0.80', '1.00', '39.95', '--', '--', '--'],
+]
+
+BING_COLUMNS = ['Merchant product ID', 'Custom label 1 (Product)', 'Title', 'Brand', 'Price', 'Spend',
+                'Impressions', 'Clicks', 'CTR', 'Avg. CPC', 'Conversions', 'Revenue', 'Impression share',
+                'Impression share lost to rank', 'Absolute top impression share']
+BING_ROWS = [
+    ['40000000000001', 'NL-PT20', 'Noblelift Manual Pallet Jack', 'Noblelift', '399', '55.20', '1,940',
+     '31', '1.60%', '1.78', '1.00', '399.00', '38.00%', '62.00%', '7.60'],
+    ['40000000000002', 'HI-GR10', 'Handle-It Guard Rail 10 ft', 'Handle-It', '249.99', '20.05', '711',
+     '12', '1.69%', '1.67', '0.00', '0.00', '21.00%', '79.00%', '4.20'],
+]
+BING_TOTAL = ['Total', '-', '-', '-', '-', '-', '2,651', '43', '1.62%', '-', '1.00', '-', '-', '-', '-']
+
+
+def google_export_text():
+    """Google Ads product report: 2 title rows, then a tab-separated table"""
+    out = io.StringIO(newline='')
+    out.write('Product report\r\n')
+    out.write('"October 1, 2025 - October 31, 2025"\r\n')
+    writer = csv.writer(out, delimiter='\t')
+    writer.writerow(GOOGLE_COLUMNS)
+    writer.writerows(GOOGLE_ROWS)
+    return out.getvalue()
+
+
+@pytest.fixture
+def google_utf16_bom(tmp_path):
+    """UTF-16 LE with a BOM, as Google Ads downloads it"""
+    path = tmp_path / 'Google 2025-10.csv'
+    path.write_bytes(codecs.BOM_UTF16_LE + google_export_text().encode('utf-16-le'))
+    return str(path)
+
+
+@pytest.fixture
+def google_utf16_no_bom(tmp_path):
+    """The same export after a tool re-saved it as UTF-16 LE without the BOM"""
+    path = tmp_path / 'Google 2025-10 no bom.csv'
+    path.write_bytes(google_export_text().encode('utf-16-le'))
+    return str(path)
+
+
+@pytest.fixture
+def bing_csv(tmp_path):
+    """Bing Ads CSV: UTF-8 BOM, quoted, report preamble, Total row and copyright footer"""
+    out = io.StringIO(newline='')
+    writer = csv.writer(out, quoting=csv.QUOTE_ALL)
+    writer.writerow(['Report Name: TG Monthly Bing Ads Product Spend'])
+    writer.writerow(['Report Time: 10/1/2025,10/31/2025'])
+    writer.writerow(['Time Zone: (GMT-08:00) Pacific Time (US & Canada); Tijuana'])
+    writer.writerow(['Last Completed Available Day: 10/31/2025 12:20:00 AM (GMT)'])
+    writer.writerow(['Last Completed Available Hour: 10/31/2025 12:20:00 AM (GMT)'])
+    out.write('\r\n')
+    writer.writerow(BING_COLUMNS)
+    writer.writerows(BING_ROWS)
+    writer.writerow(BING_TOTAL)
+    out.write('\r\n')
+    writer.writerow(['©2025 Microsoft Corporation. All rights reserved. '])
+
+    path = tmp_path / 'Bing 2025-10.csv'
+    path.write_bytes(codecs.BOM_UTF8 + out.getvalue().encode('utf-8'))
+    return str(path)
+
+
+@pytest.fixture
+def bing_xlsx(tmp_path):
+    """Bing Ads Excel download: report rows and a blank row above the table"""
+    from openpyxl import Workbook
+    wb = Workbook()
+    ws = wb.active
+    ws.append(['Report Name: TG Monthly Bing Ads Product Spend'])
+    ws.append(['Report Time: 10/1/2025,10/31/2025'])
+    ws.append(['Time Zone: (GMT-08:00) Pacific Time (US & Canada); Tijuana'])
+    ws.append([])
+    ws.append(BING_COLUMNS)
+    for row in BING_ROWS:
+        ws.append(row)
+
+    path = tmp_path / 'Bing 2025-10.xlsx'
+    wb.save(path)
+    return str(path)
+
+
+@pytest.mark.parametrize('fixture, encoding', [
+    ('google_utf16_bom', 'utf-16'),
+    ('google_utf16_no_bom', 'utf-16-le'),
+])
+def test_google_utf16_tab_separated(request, fixture, encoding):
+    path = request.getfixturevalue(fixture)
+
+    fmt = detect_export_format(path)
+    assert fmt == {'kind': 'csv', 'encoding': encoding, 'sep': '\t', 'header_row': 2}
+
+    df = read_export(path, fmt)
+    assert list(df.columns) == GOOGLE_COLUMNS
+    assert len(df) == len(GOOGLE_ROWS)
+    assert df['Custom label 1'].tolist() == ['NL-PT20', 'HI-GR10', 'S4B-CV6']
+    # No BOM or stray NULs left in the first header cell
+    assert df.columns[0] == 'Image'
+
+
+def test_bing_csv_preamble_and_footer(bing_csv):
+    fmt = detect_export_format(bing_csv)
+    # 5 report rows and a blank row above the header
+    assert fmt == {'kind': 'csv', 'encoding': 'utf-8-sig', 'sep': ',', 'header_row': 6}
+
+    df = read_export(bing_csv, fmt)
+    assert list(df.columns) == BING_COLUMNS
+    # The Total row and the copyright footer are parsed as rows;
+    # process_upload drops them (Title 'Total' / no Title)
+    assert len(df) == len(BING_ROWS) + 2
+    assert df['Custom label 1 (Product)'].tolist()[:len(BING_ROWS)] == ['NL-PT20', 'HI-GR10']
+    assert df['Merchant product ID'].iloc[len(BING_ROWS)] == 'Total'
+    assert df['Merchant product ID'].iloc[-1].startswith('©2025 Microsoft')
+    assert pd.isna(df['Title'].iloc[-1])
+
+
+def test_bing_xlsx(bing_xlsx):
+    fmt = detect_export_format(bing_xlsx)
+    assert fmt == {'kind': 'excel', 'header_row': 4}
+
+    df = read_export(bing_xlsx, fmt)
+    assert list(df.columns) == BING_COLUMNS
+    assert len(df) == len(BING_ROWS)
+    assert df['Custom label 1 (Product)'].tolist() == ['NL-PT20', 'HI-GR10']
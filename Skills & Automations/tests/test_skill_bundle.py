@@ -0,0 +1,74 @@
+"""
+The ad-spend-processor skill ships copies of the shared modules it imports,
+so the packaged s4-ad-spend-processor.skill runs without the rest of the
+repository. These tests fail when a copy or the package is out of date.
+
+To refresh them: copy the originals into ad-spend-processor/scripts/, then
+rebuild the package from the skill folder (without __pycache__).
+
+    python -m pytest "Skills & Automations/tests"
+"""
+
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+SHARED_DIR = Path(__file__).resolve().parents[1]
+SKILL_DIR = SHARED_DIR / 'ad-spend-processor'
+PACKAGE = SHARED_DIR / 's4-ad-spend-processor.skill'
+
+# Copy in the skill folder -> original
+BUNDLED = {
+    'scripts/keyword_automaton.py': SHARED_DIR / 'keyword_automaton.py',
+    'scripts/vendor_rules.py': SHARED_DIR / 'vendor_rules.py',
+    'scripts/vendor_rules.json': SHARED_DIR / 'vendor_rules.json',
+    'scripts/category_suggestions.py': SHARED_DIR / 'category_suggestions.py',
+    'scripts/s4/parsing.py': SHARED_DIR.parent / 's4' / 'parsing.py',
+}
+
+# Working scripts that need the rest of the repository, so are not packaged
+NOT_PACKAGED = {'run_processor.py', 'scripts/process_monthly_data.py'}
+
+# Scripts of the package that must import with nothing but the package
+PACKAGED_SCRIPTS = ['categorize_vendors', 'generate_reports', 'process_ad_data']
+
+
+def skill_files():
+    """Files of the skill folder that go into the package, by package path"""
+    files = {}
+    for path in sorted(SKILL_DIR.rglob('*')):
+        relative = path.relative_to(SKILL_DIR).as_posix()
+        if path.is_dir() or '__pycache__' in path.parts or relative in NOT_PACKAGED:
+            continue
+        files[f"ad-spend-processor/{relative}"] = path
+    return files
+
+
+@pytest.mark.parametrize('copy', sorted(BUNDLED))
+def test_bundled_copy_matches_original(copy):
+    assert (SKILL_DIR / copy).read_bytes() == BUNDLED[copy].read_bytes(), \
+        f"Copy {BUNDLED[copy].name} into ad-spend-processor/{copy}"
+
+
+def test_package_matches_skill_folder():
+    files = skill_files()
+    with zipfile.ZipFile(PACKAGE) as package:
+        packaged = {name for name in package.namelist() if not name.endswith('/')}
+        assert packaged == set(files)
+        for name, path in files.items():
+            assert package.read(name) == path.read_bytes(), f"{name} changed since the package was built"
+
+
+def test_package_runs_on_its_own(tmp_path):
+    with zipfile.ZipFile(PACKAGE) as package:
+        package.extractall(tmp_path)
+
+    # Run from the extracted scripts folder only, as the installed skill is
+    scripts_dir = tmp_path / 'ad-spend-processor' / 'scripts'
+    code = '; '.join(f"import {name}" for name in PACKAGED_SCRIPTS)
+    result = subprocess.run([sys.executable, '-I', '-c', f"import sys; sys.path.insert(0, '.'); {code}"],
+                            cwd=scripts_dir, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,11 @@
+"""
+Shared helpers for the Source 4 Industries scripts.
+
+The scripts in Reporting/, Skills & Automations/ and Document Storage/ are run
+from their own folders; the ones that use this package put the repository
+root on sys.path first (the monthly ad spend scripts do it once, in
+workflow_config.py).
+
+`python -m s4 <command>` (s4/cli.py) runs any of those scripts from the
+repository root: dashboard, adspend, report, sync and verify.
+"""
@@ -0,0 +1,5 @@
+import sys
+
+from s4.cli import main
+
+sys.exit(main())
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Benchmark s4.parsing against the per-cell helpers it replaced.
+
+The legacy helpers are copied here (they were deleted from the scripts) so
+the comparison keeps working; the report helper is wrapped in a try so a bad
+cell counts as 0 instead of stopping the benchmark.
+
+For each helper the script times the old per-cell .apply() against the
+vectorized parser on the same synthetic column and counts the cells where the
+two disagree. Disagreements are expected only for inputs the old helpers got
+wrong, mainly accounting negatives like "(1,234.56)".
+
+Usage:
+    python s4/bench_parsing.py [rows]
+"""
+
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from s4.parsing import parse_money, parse_percent, parse_integer, to_nullable_objects
+
+# ============================================================================
+# LEGACY HELPERS
+# ============================================================================
+
+# process_upload.py
+def upload_clean_currency(val):
+    if pd.isna(val):
+        return 0.0
+    s = str(val).replace('$', '').replace(',', '')
+    try:
+        return float(s)
+    except:
+        return 0.0
+
+def upload_clean_number(val):
+    if pd.isna(val):
+        return 0
+    s = str(val).replace(',', '')
+    try:
+        return int(float(s))
+    except:
+        return 0
+
+# create_summary_report.py / create_pdf_report.py
+def report_clean_currency(val):
+    if pd.isna(val) or val == '' or val == 'NaN':
+        return 0
+    if isinstance(val, str):
+        try:
+            return float(val.replace('$', '').replace(',', ''))
+        except ValueError:
+            return 0  # the original raised here and stopped the report
+    return float(val)
+
+# process_ad_data.py
+def ad_data_clean_percentage_or_blank(val):
+    if pd.isna(val):
+        return None
+    val_str = str(val).strip()
+    if not val_str or val_str == '--' or val_str == '<10%':
+        return None
+    val_str = val_str.replace('%', '')
+    try:
+        return float(val_str) / 100.0
+    except:
+        return None
+
+# dashboard_processor.py (DashboardProcessor.extract_currency)
+def dashboard_extract_currency(value):
+    if pd.isna(value) or value == '':
+        return 0.0
+    try:
+        s = str(value).replace('$', '').replace(',', '').strip()
+        return float(s) if s else 0.0
+    except:
+        return 0.0
+
+# sync_all_time_sales.py / sync_all_quotes.py
+def sync_clean_numeric(value):
+    if pd.isna(value) or value is None:
+        return None
+    if isinstance(value, str):
+        value = value.replace('$', '').replace(',', '').replace('"', '').strip()
+        if value == '' or value == '#N/A' or value.lower() == 'nan':
+            return None
+    try:
+        result = float(value)
+        if math.isnan(result) or math.isinf(result):
+            return None
+        return result
+    except:
+        return None
+
+# ============================================================================
+# SYNTHETIC COLUMNS
+# ============================================================================
+
+def synthetic_column(kind, rows, seed=0, distinct=None):
+    """
+    Strings the way the exports and sheets write them, with some placeholders.
+    With `distinct`, values are drawn from that many different numbers, like
+    real exports where the same spend, CTR and click counts repeat a lot.
+    """
+    rng = np.random.default_rng(seed)
+    numbers = rng.gamma(1.5, 400.0, rows)
+    if distinct:
+        numbers = rng.choice(numbers[:distinct], size=rows)
+    if kind == 'money':
+        cells = [f"${x:,.2f}" for x in numbers]
+    elif kind == 'count':
+        cells = [f"{int(x):,}" for x in numbers]
+    else:
+        cells = [f"{x / 40:.2f}%" for x in numbers]
+
+    specials = ['--', '', '#N/A', '<10%', '(1,234.56)', None]
+    positions = rng.choice(rows, size=rows // 20, replace=False)
+    for position in positions:
+        cells[position] = specials[position % len(specials)]
+    return pd.Series(cells, dtype=object)
+
+
+def disagreements(old, new):
+    """Cells where two parsed columns differ (NaN/None count as equal)"""
+    old = pd.to_numeric(pd.Series(old, dtype=object), errors='coerce').to_numpy(dtype=float)
+    new = pd.to_numeric(pd.Series(new, dtype=object), errors='coerce').to_numpy(dtype=float)
+    same = np.isclose(old, new, equal_nan=True)
+    return int((~same).sum())
+
+
+def timed(func, repeat=3):
+    """Best of `repeat` runs: (seconds, result)"""
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"Parsing benchmark ({rows:,} rows per column, best of 3)")
+    for label, distinct in [('all values different', None), ('1,000 distinct values, export-like', 1000)]:
+        print()
+        print(f"{label.upper()}")
+        print("=" * 100)
+        run_cases(rows, distinct)
+    print()
+    print("Differ: cells the old helper parsed differently, e.g. '(1,234.56)' (old: 0 or None, new: -1234.56)")
+
+
+def run_cases(rows, distinct):
+    money = synthetic_column('money', rows, seed=1, distinct=distinct)
+    counts = synthetic_column('count', rows, seed=2, distinct=distinct)
+    percents = synthetic_column('percent', rows, seed=3, distinct=distinct)
+
+    cases = [
+        ('process_upload clean_currency', lambda: money.apply(upload_clean_currency), lambda: parse_money(money)),
+        ('process_upload clean_number', lambda: counts.apply(upload_clean_number), lambda: parse_integer(counts)),
+        ('report clean_currency', lambda: money.apply(report_clean_currency), lambda: parse_money(money)),
+        ('process_ad_data clean_percentage_or_blank',
+         lambda: percents.apply(ad_data_clean_percentage_or_blank),
+         lambda: to_nullable_objects(parse_percent(percents, missing=None))),
+        ('dashboard extract_currency', lambda: money.apply(dashboard_extract_currency), lambda: parse_money(money)),
+        ('sync clean_numeric', lambda: money.apply(sync_clean_numeric), lambda: parse_money(money, missing=None)),
+    ]
+
+    print(f"{'Helper':<45} {'Per cell':>10} {'Vectorized':>11} {'Speedup':>8} {'Differ':>8}")
+    print("-" * 100)
+    for name, legacy, vectorized in cases:
+        legacy_time, old = timed(legacy)
+        vector_time, new = timed(vectorized)
+        print(f"{name:<45} {legacy_time:>9.3f}s {vector_time:>10.3f}s "
+              f"{legacy_time / vector_time:>7.1f}x {disagreements(old, new):>8,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Startup time of every `python -m s4` command, against its budget.
+
+Each command is started in a fresh interpreter with --startup, which loads
+the command's script (imports and module-level setup) without running it.
+The time is the wall time of that process, best of `repeat` runs, so it
+includes interpreter start-up. Budgets are s4.cli.STARTUP_BUDGETS; the
+`help` row is `python -m s4 --help`, i.e. the cost of the CLI itself.
+
+A command whose script cannot load (e.g. supabase not installed) is listed
+with the error and does not count against the budget. Exits with 1 when any
+command is over budget.
+
+Usage:
+    python s4/bench_startup.py [repeat]
+"""
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from s4.cli import COMMANDS, REPO_ROOT, startup_budget
+
+
+def command_lines():
+    """(budget, args) for the CLI help and every command/subcommand script"""
+    lines = [(startup_budget('help'), ['--help'])]
+    for command, spec in COMMANDS.items():
+        seen = set()
+        for subcommand, script in spec['scripts'].items():
+            if script in seen:
+                continue
+            seen.add(script)
+            lines.append((startup_budget(command, subcommand),
+                          ['--startup', command] + ([subcommand] if subcommand else [])))
+    return lines
+
+
+def time_startup(args, repeat):
+    """Best wall time of `python -m s4 args`: (seconds, error or None)"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-m', 's4'] + args, cwd=REPO_ROOT,
+                                capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+        if result.returncode != 0:
+            last_line = (result.stderr or result.stdout).strip().splitlines()[-1:]
+            return None, last_line[0] if last_line else f"exit code {result.returncode}"
+        best = elapsed if best is None else min(best, elapsed)
+    return best, None
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    print(f"s4 command startup, best of {repeat}")
+    print("=" * 80)
+    print(f"{'Command':<28} {'Startup':>10} {'Budget':>10}")
+    print("-" * 80)
+
+    over = []
+    for budget, args in command_lines():
+        label = ' '.join(arg for arg in args if arg != '--startup')
+        seconds, error = time_startup(args, repeat)
+        if error:
+            print(f"{label:<28} {'n/a':>10} {budget:>9.2f}s  could not load: {error}")
+            continue
+        status = ''
+        if seconds > budget:
+            status = '  OVER BUDGET'
+            over.append(label)
+        print(f"{label:<28} {seconds:>9.3f}s {budget:>9.2f}s{status}")
+
+    print("-" * 80)
+    if over:
+        print(f"Over budget: {', '.join(over)}")
+        sys.exit(1)
+    print("All commands within budget")
+
+
+if __name__ == "__main__":
+    main()
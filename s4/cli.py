@@ -0,0 +1,173 @@
+"""
+One command line for the S4 scripts.
+
+    python -m s4 <command> [subcommand] [args...]
+
+Commands:
+    dashboard                   CBOS Sales Order Detail export -> dashboard import workbook
+    adspend [workflow]          Monthly ad spend workflow: upload sheet, Excel and PDF reports
+    adspend backfill|leaderboards|history|upload
+                                Backfill months, multi-month Top 20 tables, history store,
+                                upload sheet only
+    report excel|summary|pdf    Rebuild one report for the month in config.json
+    sync sales|quotes|ad-spend  Upload new rows to Supabase
+    verify [summary|diff|values]
+                                Compare the dashboard import with the reference workbook
+
+Arguments after the (sub)command are passed to the script, e.g.
+    python -m s4 adspend --no-cache
+    python -m s4 adspend backfill 2022-11 2025-10
+
+Every command runs an existing script, from that script's own folder (so
+config.json and relative paths resolve as when running it directly). This
+module imports only the standard library; pandas, openpyxl, reportlab,
+supabase and friends are imported by the script a command runs, so each
+command pays only for what it uses.
+
+    python -m s4 --startup <command> [subcommand]
+
+loads the command's script (its imports and module-level setup) without
+running it, and prints how long that took. s4/bench_startup.py checks those
+times against STARTUP_BUDGETS.
+"""
+
+import os
+import runpy
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+AD_SPEND_DIR = 'Reporting/Monthly Product Ad Spends/Ad Spend Processor Skill Files'
+CBOS_DIR = 'Skills & Automations/CBOS TO DASH'
+SYNC_DIR = 'Document Storage/Scripts'
+
+# command -> folder and scripts; the None subcommand is the default
+COMMANDS = {
+    'dashboard': {
+        'folder': CBOS_DIR,
+        'scripts': {None: 'dashboard_processor.py'},
+    },
+    'adspend': {
+        'folder': AD_SPEND_DIR,
+        'scripts': {
+            None: 'master_workflow.py',
+            'workflow': 'master_workflow.py',
+            'backfill': 'backfill.py',
+            'leaderboards': 'leaderboards.py',
+            'history': 'history_store.py',
+            'upload': 'process_upload.py',
+        },
+    },
+    'report': {
+        'folder': AD_SPEND_DIR,
+        'scripts': {
+            'excel': 'create_excel_report.py',
+            'summary': 'create_summary_report.py',
+            'pdf': 'create_pdf_report.py',
+        },
+    },
+    'sync': {
+        'folder': SYNC_DIR,
+        'scripts': {
+            'sales': 'sync_all_time_sales.py',
+            'quotes': 'sync_all_quotes.py',
+            'ad-spend': 'import_ad_spend_to_supabase.py',
+        },
+    },
+    'verify': {
+        'folder': CBOS_DIR,
+        'scripts': {
+            None: 'final_comparison_summary.py',
+            'summary': 'final_comparison_summary.py',
+            'diff': 'full_diff_check.py',
+            'values': 'smart_comparison.py',
+        },
+    },
+}
+
+# Seconds from interpreter start until a command's script is loaded
+# (python -m s4 --startup ...), checked by s4/bench_startup.py. Looked up as
+# "command subcommand", then "command". Anything that needs pandas starts at
+# about half a second.
+STARTUP_BUDGETS = {
+    'help': 0.15,
+    'dashboard': 1.0,
+    'adspend': 0.3,     # master_workflow.py imports each stage when it runs
+    'adspend backfill': 1.0,
+    'adspend leaderboards': 1.0,
+    'adspend history': 1.0,
+    'adspend upload': 1.0,
+    'report': 1.2,
+    'sync': 1.0,
+    'verify': 1.0,
+}
+
+
+def startup_budget(command, subcommand=None):
+    """Startup budget in seconds for a command line"""
+    return STARTUP_BUDGETS.get(f"{command} {subcommand}", STARTUP_BUDGETS[command])
+
+
+def resolve(args):
+    """
+    Pick the script for a command line.
+
+    Returns:
+        (command, subcommand, script path, remaining args); script path is
+        None when the command or subcommand is unknown
+    """
+    command = args[0] if args else None
+    if command not in COMMANDS:
+        return command, None, None, args[1:]
+
+    spec = COMMANDS[command]
+    rest = args[1:]
+    subcommand = None
+    if rest and rest[0] in spec['scripts']:
+        subcommand, rest = rest[0], rest[1:]
+    script = spec['scripts'].get(subcommand)
+    if script is None:
+        return command, subcommand, None, rest
+    return command, subcommand, REPO_ROOT / spec['folder'] / script, rest
+
+
+def run_script(script, args, run_name='__main__'):
+    """Run a script as `python script args` would, from its own folder"""
+    folder = str(script.parent)
+    os.chdir(folder)
+    sys.path.insert(0, folder)
+    sys.argv = [str(script)] + list(args)
+    return runpy.run_path(str(script), run_name=run_name)
+
+
+def main(args=None):
+    args = sys.argv[1:] if args is None else list(args)
+    startup = '--startup' in args[:1]
+    if startup:
+        args = args[1:]
+
+    if not args or args[0] in ('-h', '--help', 'help'):
+        print(__doc__)
+        return 0
+
+    command, subcommand, script, rest = resolve(args)
+    if script is None:
+        if command in COMMANDS:
+            choices = ', '.join(name for name in COMMANDS[command]['scripts'] if name)
+            print(f"s4 {command}: choose one of {choices}")
+        else:
+            print(f"s4: unknown command '{command}'")
+            print(__doc__)
+        return 2
+
+    if startup:
+        # Load the module without running its __main__ block
+        start = time.perf_counter()
+        run_script(script, rest, run_name='s4_startup')
+        label = f"{command} {subcommand}" if subcommand else command
+        print(f"{label}: {script.name} loaded in {time.perf_counter() - start:.3f}s")
+        return 0
+
+    run_script(script, rest)
+    return 0
@@ -0,0 +1,66 @@
+"""
+Load independent input files concurrently.
+
+A monthly run reads several unrelated files (the Google and Bing exports, the
+ID-to-SKU and MASTER SKU sheets) before any processing can start. Reading
+them one after another makes the load phase the sum of every read;
+load_files() runs them in a thread pool so it takes as long as the slowest
+file. File I/O, decoding and pandas' C parser release the GIL for much of
+the work, and threads avoid pickling DataFrames back from worker processes.
+
+    results, timings = load_files({
+        'Google Ads': lambda: read_export(google_path),
+        'MASTER SKU': lambda: pd.read_csv(master_path),
+    })
+    print_load_timings(timings)
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Tuple
+
+
+def load_files(loaders: Dict[str, Callable], max_workers: int = None) -> Tuple[Dict, Dict]:
+    """
+    Run each loader (a zero-argument callable) in its own thread.
+
+    Every loader is allowed to finish; if any failed, the first failure (in
+    the order given) is raised afterwards with the file name attached.
+
+    Returns:
+        Tuple of (results, timings), both keyed like `loaders`
+        - timings: {name: seconds spent loading that file}
+        - timings also has 'total' (wall clock for the whole load phase)
+    """
+    timings = {}
+
+    def timed(name, loader):
+        start = time.perf_counter()
+        try:
+            return loader()
+        finally:
+            timings[name] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers or len(loaders) or 1) as pool:
+        futures = {name: pool.submit(timed, name, loader) for name, loader in loaders.items()}
+
+    results = {}
+    for name, future in futures.items():
+        error = future.exception()
+        if error is not None:
+            raise RuntimeError(f"Could not load {name}: {error}") from error
+        results[name] = future.result()
+
+    timings['total'] = time.perf_counter() - start
+    return results, timings
+
+
+def print_load_timings(timings: Dict[str, float], indent: str = "   "):
+    """Per-file load times, slowest first, then the wall clock"""
+    files = {name: seconds for name, seconds in timings.items() if name != 'total'}
+    for name, seconds in sorted(files.items(), key=lambda item: item[1], reverse=True):
+        print(f"{indent}{name:<28} {seconds:>6.2f}s")
+    if 'total' in timings:
+        serial = sum(files.values())
+        print(f"{indent}{'load phase (concurrent)':<28} {timings['total']:>6.2f}s  (sequential would be ~{serial:.2f}s)")
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+MASTER SKU lookups, change log and bulk approvals.
+
+Every tool that reads "Google Ads - Product Spend - MASTER SKU (1).csv" used
+to re-normalize all of its ~15.7k rows on every lookup. This module compiles
+the sheet once into a SkuIndex (normalized SKU -> category, vendor, name and
+cost of its first row; lowercased product name -> SKU) and keeps it next to
+the sheet, so the next run reuses it as long as the sheet is unchanged.
+
+Edits made through apply_approvals() never trigger a rebuild:
+
+- the review sheet is merged into the master in one vectorized pass
+  (category approvals, cost changes and new SKUs),
+- each change is appended to "MASTER SKU Change Log.csv" (never rewritten),
+- the same changes are patched into the saved index, entry by entry.
+
+Editing the master by hand still works; the index notices the file changed
+and is compiled again on its next use.
+
+Usage:
+    python s4/master_sku.py apply "2025-10 Missing Product Categories.csv" [...]
+    python s4/master_sku.py log [count]
+    python s4/master_sku.py index
+"""
+
+import os
+import pickle
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Tuple
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from s4.parsing import parse_money
+
+MASTER_SKU_FILE = "Google Ads - Product Spend - MASTER SKU (1).csv"
+CHANGE_LOG_FILE = "MASTER SKU Change Log.csv"
+INDEX_FILE = ".master_sku_index.pkl"
+# Bumped whenever compile() changes, so indexes saved by older code are rebuilt
+INDEX_VERSION = 2
+
+DEFAULT_SKU_DIR = str(Path(__file__).resolve().parents[1] / "Reporting" / "SKU Documents")
+
+# Change types recorded in the log
+NEW_SKU = 'new_sku'
+COST_CHANGE = 'cost_change'
+CATEGORY_APPROVAL = 'category_approval'
+
+CHANGE_LOG_COLUMNS = ['Timestamp', 'Change', 'SKU', 'Field', 'Old Value', 'New Value', 'Source']
+
+# MASTER SKU column -> SkuIndex entry field
+INDEXED_FIELDS = {
+    'PRODUCT CATEGORY': 'category',
+    'VENDOR': 'vendor',
+    'PRODUCT NAME': 'name',
+    'COST': 'cost',
+}
+
+
+def normalize_skus(values) -> pd.Series:
+    """SKU key form, the way every lookup compares them: trimmed, uppercase"""
+    return pd.Series(values).astype(str).str.strip().str.upper()
+
+
+def clean_text(values) -> pd.Series:
+    """Cell text with blanks and NaN as ''"""
+    return pd.Series(values).fillna('').astype(str).str.strip()
+
+
+def file_signature(path) -> Optional[Tuple[int, int]]:
+    """(size, mtime) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+# ============================================================================
+# COMPILED INDEX
+# ============================================================================
+
+class SkuIndex:
+    """MASTER SKU compiled for constant-time lookups (the first row of a SKU wins)"""
+
+    def __init__(self):
+        self.products = {}    # normalized SKU -> {'category', 'vendor', 'name', 'cost'}
+        self.titles = {}      # lowercased product name -> normalized SKU
+        self.signature = None  # file_signature() of the master it matches
+
+    @classmethod
+    def compile(cls, master_df: pd.DataFrame) -> 'SkuIndex':
+        """
+        Build the index from the whole sheet. The sheet may come from
+        read_master() (blanks are '') or a plain read_csv (blanks are NaN);
+        both give the same index, and blank SKUs and names are left out.
+        """
+        index = cls()
+        skus = normalize_skus(clean_text(master_df['SKU']))
+        first = (skus != '') & ~skus.duplicated()
+
+        fields = {field: clean_text(master_df[col])[first] if col in master_df.columns else ''
+                  for col, field in INDEXED_FIELDS.items()}
+        products = pd.DataFrame(fields, index=skus.index[first])
+        index.products = dict(zip(skus[first], products.to_dict('records')))
+
+        # Exact title matches compare the untrimmed name, lowercased
+        names = master_df['PRODUCT NAME'].fillna('').astype(str).str.lower()
+        named = names.str.strip() != ''
+        first_name = named & ~names.duplicated()
+        index.titles = dict(zip(names[first_name], skus[first_name]))
+        return index
+
+    def category(self, sku) -> str:
+        """Product Category of a SKU ('' if unknown or blank)"""
+        if pd.isna(sku) or sku == '':
+            return ""
+        product = self.products.get(str(sku).strip().upper())
+        return product['category'] if product else ""
+
+    def sku_for_title(self, title) -> str:
+        """SKU whose product name equals the title, ignoring case ('' if none)"""
+        if pd.isna(title):
+            return ""
+        return self.titles.get(str(title).lower(), "")
+
+    def patch(self, changes: pd.DataFrame) -> int:
+        """
+        Apply change log rows to the index in place, the way the same edit
+        changes the master: approvals and costs overwrite the entry, new SKUs
+        add one (an existing first row keeps winning).
+
+        Returns:
+            Number of change rows applied
+        """
+        rows = zip(changes['Change'], changes['SKU'], changes['Field'], changes['New Value'])
+        for kind, sku, column, value in rows:
+            field = INDEXED_FIELDS.get(column)
+            if field is None:
+                continue
+            product = self.products.get(sku)
+            if product is None:
+                if kind != NEW_SKU:
+                    continue
+                product = self.products[sku] = dict.fromkeys(INDEXED_FIELDS.values(), '')
+            product[field] = value
+            if field == 'name':
+                self.titles.setdefault(value.lower(), sku)
+        return len(changes)
+
+    def save(self, path):
+        """Write the index (via a temp file, so a crash never leaves half an index)"""
+        # Plain dicts, so the file does not depend on where this class was imported from
+        state = {'version': INDEX_VERSION, 'signature': self.signature,
+                 'products': self.products, 'titles': self.titles}
+        with open(path + '.tmp', 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + '.tmp', path)
+
+    @classmethod
+    def load(cls, path) -> 'SkuIndex':
+        """Index written by save()"""
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        if state.get('version') != INDEX_VERSION:
+            raise KeyError('version')
+        index = cls()
+        index.signature = state['signature']
+        index.products = state['products']
+        index.titles = state['titles']
+        return index
+
+
+def load_sku_index(sku_dir: str = DEFAULT_SKU_DIR, master_df: pd.DataFrame = None) -> SkuIndex:
+    """
+    The saved index if it still matches the MASTER SKU file, else a freshly
+    compiled one (from master_df if given, which saves re-reading the sheet).
+    """
+    master_path = os.path.join(sku_dir, MASTER_SKU_FILE)
+    index_path = os.path.join(sku_dir, INDEX_FILE)
+    signature = file_signature(master_path)
+
+    if signature is not None and os.path.exists(index_path):
+        try:
+            index = SkuIndex.load(index_path)
+            if index.signature == signature:
+                return index
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError, TypeError):
+            pass  # unreadable or old format: compile it again
+
+    if master_df is None:
+        master_df = read_master(sku_dir)
+    index = SkuIndex.compile(master_df)
+    index.signature = signature
+    if signature is not None:
+        try:
+            index.save(index_path)
+        except OSError:
+            pass  # read-only SKU folder: the index just isn't reused
+    return index
+
+
+# ============================================================================
+# CHANGE LOG
+# ============================================================================
+
+def read_master(sku_dir: str = DEFAULT_SKU_DIR) -> pd.DataFrame:
+    """MASTER SKU as text, exactly as stored (blanks stay '')"""
+    return pd.read_csv(os.path.join(sku_dir, MASTER_SKU_FILE), dtype=str, keep_default_na=False)
+
+
+def append_change_log(sku_dir: str, changes: pd.DataFrame):
+    """Append change rows to the log (the file is only ever appended to)"""
+    if changes.empty:
+        return
+    log_path = os.path.join(sku_dir, CHANGE_LOG_FILE)
+    changes[CHANGE_LOG_COLUMNS].to_csv(log_path, mode='a', index=False,
+                                       header=not os.path.exists(log_path), encoding='utf-8')
+
+
+def read_change_log(sku_dir: str = DEFAULT_SKU_DIR) -> pd.DataFrame:
+    """Every logged MASTER SKU change, oldest first"""
+    log_path = os.path.join(sku_dir, CHANGE_LOG_FILE)
+    if not os.path.exists(log_path):
+        return pd.DataFrame(columns=CHANGE_LOG_COLUMNS)
+    return pd.read_csv(log_path, dtype=str, keep_default_na=False)
+
+
+# ============================================================================
+# APPLY APPROVALS
+# ============================================================================
+
+def review_approvals(review_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Usable rows of a reviewed sheet such as "2025-10 Missing Product
+    Categories.csv", one per SKU (the last one wins).
+
+    The category comes from 'Approved Category' if present, else 'Product
+    Category' (blank and "BLANK" mean not reviewed); the name from 'Title' or
+    'Product Name'; an optional 'Cost' column carries new costs.
+
+    Returns:
+        DataFrame indexed by normalized SKU with category, name, vendor, cost
+        (cost as a number, NaN where not given)
+    """
+    def column(*names):
+        for name in names:
+            if name in review_df.columns:
+                return clean_text(review_df[name])
+        return pd.Series('', index=review_df.index)
+
+    approvals = pd.DataFrame({
+        'sku': normalize_skus(column('SKU')),
+        'category': column('Approved Category', 'Product Category'),
+        'name': column('Title', 'Product Name'),
+        'vendor': column('Vendor'),
+        'cost': parse_money(column('Cost', 'COST'), missing=None).to_numpy(),
+    })
+    approvals.loc[approvals['category'].str.upper() == 'BLANK', 'category'] = ''
+    useful = (approvals['sku'] != '') & ((approvals['category'] != '') | approvals['cost'].notna())
+    approvals = approvals[useful].drop_duplicates('sku', keep='last')
+    return approvals.set_index('sku')
+
+
+def money_cell(amount) -> str:
+    """Cost the way the master sheet writes it"""
+    return f"${amount:,.2f}"
+
+
+def apply_approvals(master_df: pd.DataFrame, review_df: pd.DataFrame,
+                    source: str = '') -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Merge reviewed categories, costs and new SKUs into the master sheet.
+
+    Known SKUs get the approved category and cost on every row that carries
+    them; unknown SKUs are appended as new rows. master_df is not modified.
+
+    Returns:
+        Tuple of (updated master, change log rows)
+    """
+    approvals = review_approvals(review_df)
+    master = master_df.copy()
+    keys = normalize_skus(master['SKU'])
+    first = ~keys.duplicated()
+    changes = []
+
+    # Category approvals: only where the category actually changes
+    approved = keys.map(approvals['category'])
+    current = clean_text(master['PRODUCT CATEGORY'])
+    changed = approved.notna() & (approved != '') & (approved != current)
+    changes.append(pd.DataFrame({
+        'Change': CATEGORY_APPROVAL, 'SKU': keys, 'Field': 'PRODUCT CATEGORY',
+        'Old Value': current, 'New Value': approved,
+    })[changed & first])
+    master.loc[changed, 'PRODUCT CATEGORY'] = approved[changed]
+
+    # Cost changes: compared as amounts, so "$9.72 " and "9.72" are the same cost
+    if 'COST' in master.columns:
+        new_cost = keys.map(approvals['cost'])
+        changed = new_cost.notna() & ~(new_cost == parse_money(master['COST'], missing=None))
+        new_text = new_cost[changed].map(money_cell)
+        changes.append(pd.DataFrame({
+            'Change': COST_CHANGE, 'SKU': keys[changed], 'Field': 'COST',
+            'Old Value': clean_text(master.loc[changed, 'COST']), 'New Value': new_text,
+        })[first[changed]])
+        master.loc[changed, 'COST'] = new_text
+
+    # New SKUs: one row each, with whatever the review filled in
+    new = approvals[~approvals.index.isin(keys)]
+    if len(new):
+        rows = pd.DataFrame('', index=range(len(new)), columns=master.columns)
+        rows['SKU'] = new.index
+        rows['PRODUCT NAME'] = new['name'].to_numpy()
+        rows['VENDOR'] = new['vendor'].to_numpy()
+        rows['PRODUCT CATEGORY'] = new['category'].to_numpy()
+        if 'COST' in rows.columns:
+            rows['COST'] = new['cost'].map(money_cell).where(new['cost'].notna(), '').to_numpy()
+        if 'SKU - 2' in rows.columns:
+            rows['SKU - 2'] = new.index
+        master = pd.concat([master, rows], ignore_index=True)
+
+        fields = rows.melt(id_vars='SKU', value_vars=[col for col in INDEXED_FIELDS if col in rows.columns],
+                           var_name='Field', value_name='New Value')
+        fields = fields[fields['New Value'] != ''].sort_values('SKU', kind='stable')
+        changes.append(fields.assign(Change=NEW_SKU, **{'Old Value': ''}))
+
+    changes = pd.concat(changes, ignore_index=True)
+    changes['Timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    changes['Source'] = source
+    return master, changes[CHANGE_LOG_COLUMNS]
+
+
+def apply_review_files(paths, sku_dir: str = DEFAULT_SKU_DIR) -> pd.DataFrame:
+    """
+    Apply reviewed sheets to the MASTER SKU file: write the master, append
+    the change log, then patch the saved index with the same changes.
+
+    Returns:
+        All change log rows written
+    """
+    master_path = os.path.join(sku_dir, MASTER_SKU_FILE)
+    index = load_sku_index(sku_dir)
+    master = read_master(sku_dir)
+    all_changes = []
+
+    for path in paths:
+        review = pd.read_csv(path, dtype=str, keep_default_na=False)
+        master, changes = apply_approvals(master, review, source=os.path.basename(path))
+        counts = changes.drop_duplicates(['Change', 'SKU'])['Change'].value_counts()
+        print(f"  {os.path.basename(path)}: {counts.get(CATEGORY_APPROVAL, 0)} category approvals, "
+              f"{counts.get(COST_CHANGE, 0)} cost changes, {counts.get(NEW_SKU, 0)} new SKUs")
+        all_changes.append(changes)
+
+    changes = pd.concat(all_changes, ignore_index=True) if all_changes else pd.DataFrame(columns=CHANGE_LOG_COLUMNS)
+    if changes.empty:
+        print("  Nothing to change")
+        return changes
+
+    # Master first: if writing it fails, neither the log nor the index moves
+    master.to_csv(master_path + '.tmp', index=False, encoding='utf-8')
+    os.replace(master_path + '.tmp', master_path)
+    append_change_log(sku_dir, changes)
+
+    index.patch(changes)
+    index.signature = file_signature(master_path)
+    index.save(os.path.join(sku_dir, INDEX_FILE))
+    print(f"  Logged {len(changes)} change(s) to {CHANGE_LOG_FILE}; index patched ({len(index.products):,} SKUs)")
+    return changes
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else 'log'
+
+    if command == 'apply' and len(sys.argv) > 2:
+        apply_review_files(sys.argv[2:])
+    elif command == 'log':
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+        log = read_change_log()
+        print(f"MASTER SKU change log: {len(log):,} entries")
+        if len(log):
+            print(log.tail(count).to_string(index=False))
+    elif command == 'index':
+        index_path = os.path.join(DEFAULT_SKU_DIR, INDEX_FILE)
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        index = load_sku_index()
+        print(f"MASTER SKU index rebuilt: {len(index.products):,} SKUs, {len(index.titles):,} product names")
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()